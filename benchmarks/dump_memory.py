@@ -0,0 +1,78 @@
+"""
+Measures the memory used by each OID of a walk dump, stored in the
+former ``str(oid) -> [None, None, None, [var_bind]]`` dict and in SnmpDump
+
+    python -m benchmarks.dump_memory [number of interfaces]
+"""
+
+import itertools
+import sys
+import tracemalloc
+
+from pysnmp.hlapi.v3arch.asyncio import ObjectIdentity, ObjectType
+from pysnmp.proto.rfc1902 import Counter32, Integer, ObjectName, OctetString, TimeTicks
+from pysnmp.smi.builder import MibBuilder
+from pysnmp.smi.view import MibViewController
+
+from netengine.backends.snmp import SnmpDump
+
+# ifTable columns: ifIndex, ifDescr, ifType, ifMtu, ifSpeed, ifPhysAddress,
+# ifAdminStatus, ifOperStatus, ifLastChange, ifInOctets, ifOutOctets
+COLUMNS = {
+    1: lambda index: Integer(index),
+    2: lambda index: OctetString(f"eth{index}"),
+    3: lambda index: Integer(6),
+    4: lambda index: Integer(1500),
+    5: lambda index: Counter32(1000000000),
+    6: lambda index: OctetString(index.to_bytes(6, "big")),
+    7: lambda index: Integer(1),
+    8: lambda index: Integer(1),
+    9: lambda index: TimeTicks(index * 100),
+    10: lambda index: Counter32(index * 1000003),
+    16: lambda index: Counter32(index * 2000003),
+}
+
+
+def var_binds(interfaces):
+    """builds the var binds of an ifTable walk, as returned by pysnmp"""
+    mib_view = MibViewController(MibBuilder())
+    for column, value in COLUMNS.items():
+        for index in range(1, interfaces + 1):
+            oid = ObjectName(f"1.3.6.1.2.1.2.2.1.{column}.{index}")
+            var_bind = ObjectType(ObjectIdentity(oid), value(index))
+            yield var_bind.resolve_with_mib(mib_view)
+
+
+def measure(build, interfaces):
+    """returns the bytes retained by each OID of the dump built by ``build``"""
+    rows = var_binds(interfaces)
+    # loads the MIBs before measuring
+    first = next(rows)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    # the var binds are built while measuring: the dict keeps them alive
+    dump = build(itertools.chain([first], rows))
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return size / len(dump)
+
+
+def build_dict(rows):
+    return {str(row[0]): [None, None, None, [row]] for row in rows}
+
+
+def build_snmpdump(rows):
+    dump = SnmpDump()
+    for row in rows:
+        dump.add(row[0], row[1])
+    return dump
+
+
+def main(interfaces=500):
+    for name, build in (("dict", build_dict), ("SnmpDump", build_snmpdump)):
+        size = measure(build, interfaces)
+        print(f"{name:>8}: {size:6.0f} bytes per OID")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
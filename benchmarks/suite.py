@@ -0,0 +1,312 @@
+"""
+Benchmarks the SNMP backends on synthetic dumps of 10 to 1000 interfaces
+and against local agents (netengine.backends.snmp.simulator), measuring
+the time, the memory peak and the requests of each operation; the results
+can be saved as a baseline and compared with it, failing on regressions
+
+    python -m benchmarks.suite [--quick] [-k NAME] [--save FILE]
+                               [--compare [FILE]] [--tolerance 0.25]
+
+Times depend on the machine: the comparison checks the requests and the
+memory peaks, which do not change across machines, and the times only
+with --tolerance, against a baseline recorded on the same machine.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import sys
+import time
+import timeit
+import tracemalloc
+from functools import partial
+
+from pysnmp.proto.rfc1902 import IpAddress, OctetString
+
+from netengine.backends.snmp import AirOS, OpenWRT, SnmpDump
+from netengine.backends.snmp.simulator import load_fixture, start_agents
+
+STATIC = os.path.join(os.path.dirname(os.path.dirname(__file__)), "tests", "static")
+FIXTURES = {
+    OpenWRT: os.path.join(STATIC, "test-openwrt-snmp-oid.json"),
+    AirOS: os.path.join(STATIC, "test-airos-snmp.json"),
+}
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+INTERFACES = (10, 100, 1000)
+OIDS = (1000, 10000, 100000)
+# the quick run skips the largest sizes
+QUICK_INTERFACES = (10, 100)
+QUICK_OIDS = (1000, 10000)
+
+# relative increase of the memory peaks reported as a regression, the
+# times are compared only with --tolerance
+MEMORY_TOLERANCE = 0.1
+
+# ifTable and ifXTable columns of each synthetic interface
+COLUMNS = {
+    "1.3.6.1.2.1.2.2.1.1": lambda index: index,
+    "1.3.6.1.2.1.2.2.1.2": lambda index: OctetString(f"eth{index}"),
+    "1.3.6.1.2.1.2.2.1.3": lambda index: 6,
+    "1.3.6.1.2.1.2.2.1.4": lambda index: 1500,
+    "1.3.6.1.2.1.2.2.1.5": lambda index: 1000000000,
+    "1.3.6.1.2.1.2.2.1.6": lambda index: OctetString(_mac(index)),
+    "1.3.6.1.2.1.2.2.1.7": lambda index: 1,
+    "1.3.6.1.2.1.2.2.1.8": lambda index: 1,
+    "1.3.6.1.2.1.2.2.1.10": lambda index: index * 1000003 % 2**32,
+    "1.3.6.1.2.1.2.2.1.11": lambda index: index * 1009,
+    "1.3.6.1.2.1.2.2.1.12": lambda index: index * 13,
+    "1.3.6.1.2.1.2.2.1.16": lambda index: index * 2000003 % 2**32,
+    "1.3.6.1.2.1.2.2.1.17": lambda index: index * 2003,
+    "1.3.6.1.2.1.2.2.1.18": lambda index: index * 17,
+    "1.3.6.1.2.1.31.1.1.1.1": lambda index: OctetString(f"eth{index}"),
+    "1.3.6.1.2.1.31.1.1.1.6": lambda index: 2**32 + index * 1000003,
+    "1.3.6.1.2.1.31.1.1.1.7": lambda index: index * 1009,
+    "1.3.6.1.2.1.31.1.1.1.8": lambda index: index * 7,
+    "1.3.6.1.2.1.31.1.1.1.9": lambda index: index * 6,
+    "1.3.6.1.2.1.31.1.1.1.10": lambda index: 2**32 + index * 2000003,
+    "1.3.6.1.2.1.31.1.1.1.11": lambda index: index * 2003,
+    "1.3.6.1.2.1.31.1.1.1.12": lambda index: index * 9,
+    "1.3.6.1.2.1.31.1.1.1.13": lambda index: index * 8,
+    "1.3.6.1.2.1.31.1.1.1.15": lambda index: 1000,
+}
+# vendor subtree of the OIDs which pad the dumps, never read by the backends
+PADDING = "1.3.6.1.4.1.99999.1"
+
+
+def _mac(index):
+    return b"\x02\x00" + index.to_bytes(4, "big")
+
+
+def _address(index):
+    return bytes((10, index >> 16 & 255, index >> 8 & 255, index & 255))
+
+
+def synthetic_dump(backend, interfaces, oids=0):
+    """
+    returns the fixture of ``backend`` with ``interfaces`` synthetic
+    interfaces, each with an IPv4 address and a neighbor, padded with
+    unrelated OIDs up to ``oids`` OIDs
+    """
+    snmpdump = load_fixture(FIXTURES[backend])
+    for oid, value in COLUMNS.items():
+        for index in range(1, interfaces + 1):
+            snmpdump.add(f"{oid}.{index}", value(index))
+    for index in range(1, interfaces + 1):
+        address = ".".join(str(byte) for byte in _address(index))
+        snmpdump.add(f"1.3.6.1.2.1.4.20.1.1.{address}", IpAddress(_address(index)))
+        snmpdump.add(f"1.3.6.1.2.1.4.20.1.2.{address}", index)
+        snmpdump.add(f"1.3.6.1.2.1.4.20.1.3.{address}", IpAddress(b"\xff" * 4))
+        neighbor = f"{index}.1.4.{address[:-1]}9"
+        snmpdump.add(f"1.3.6.1.2.1.4.35.1.4.{neighbor}", OctetString(_mac(index)))
+        snmpdump.add(f"1.3.6.1.2.1.4.35.1.7.{neighbor}", 1)
+    for index in range(1, oids - len(snmpdump) + 1):
+        snmpdump.add(f"{PADDING}.{index}", index)
+    return snmpdump
+
+
+def timed(function, repeat=5):
+    """
+    returns the best time of a call of ``function`` over ``repeat`` rounds,
+    each calling it as many times as needed to last at least 0.2 seconds
+    """
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def peak(function):
+    """returns the memory peak (bytes) allocated during a call of ``function``"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_to_dict(backend, interfaces):
+    snmpdump = synthetic_dump(backend, interfaces)
+
+    def to_dict():
+        # a new device for each call, the methods are memoized
+        return backend("127.0.0.1").to_dict(snmpdump=snmpdump)
+
+    return {"seconds": timed(to_dict), "peak_bytes": peak(to_dict)}
+
+
+def bench_to_json(backend, interfaces):
+    result = backend("127.0.0.1").to_dict(snmpdump=synthetic_dump(backend, interfaces))
+    return {"seconds": timed(lambda: json.dumps(result))}
+
+
+def bench_dump_build(oids):
+    interfaces = oids // 100
+    values = list(synthetic_dump(OpenWRT, interfaces, oids).items())
+
+    def build():
+        snmpdump = SnmpDump()
+        for oid, result in values:
+            snmpdump.add(oid, result[3][0][1])
+
+    return {"seconds": timed(build)}
+
+
+def bench_next(oids):
+    """scans the prefixes of an autowalk in a dump of ``oids`` OIDs"""
+    snmpdump = synthetic_dump(OpenWRT, oids // 100, oids)
+    device = OpenWRT("127.0.0.1")
+    prefixes = [prefix for plan in device._autowalk_plan() for prefix in plan]
+
+    def scan():
+        for prefix in prefixes:
+            device.next(prefix, snmpdump=snmpdump)
+
+    return {"seconds": timed(scan)}
+
+
+async def _agent_run(snmpdump, coroutine):
+    """returns the time of ``coroutine(port)`` and the requests it sent"""
+    (agent,) = await start_agents(snmpdump, 1)
+    try:
+        start = time.perf_counter()
+        await coroutine(agent.port)
+        return {
+            "seconds": time.perf_counter() - start,
+            "requests": agent.requests,
+        }
+    finally:
+        agent.close()
+
+
+def bench_walk(version, interfaces):
+    """walks ifDescr from a local agent"""
+    snmpdump = synthetic_dump(OpenWRT, interfaces)
+
+    async def walk(port):
+        device = OpenWRT("127.0.0.1", port=port, version=version)
+        await device.awalk("1.3.6.1.2.1.2.2.1.2")
+
+    return asyncio.run(_agent_run(snmpdump, walk))
+
+
+def bench_poll(backend, version, interfaces):
+    """polls a local agent with to_dict()"""
+    snmpdump = synthetic_dump(backend, interfaces)
+
+    async def poll(port):
+        device = backend("127.0.0.1", port=port, version=version)
+        await device.ato_dict()
+
+    return asyncio.run(_agent_run(snmpdump, poll))
+
+
+def benchmarks(quick=False):
+    """yields the name and the function of each benchmark"""
+    interfaces_sizes = QUICK_INTERFACES if quick else INTERFACES
+    for backend in (OpenWRT, AirOS):
+        for interfaces in interfaces_sizes:
+            name = f"{backend.__name__}-{interfaces}"
+            yield f"to_dict[{name}]", partial(bench_to_dict, backend, interfaces)
+            yield f"to_json[{name}]", partial(bench_to_json, backend, interfaces)
+    for oids in QUICK_OIDS if quick else OIDS:
+        yield f"dump_build[{oids}]", partial(bench_dump_build, oids)
+        yield f"next[{oids}]", partial(bench_next, oids)
+    # SNMPv1 walks send a request per OID, the largest size is left out
+    for version, sizes in ((1, QUICK_INTERFACES), (2, interfaces_sizes)):
+        for interfaces in sizes:
+            yield f"walk[v{version}-{interfaces}]", partial(
+                bench_walk, version, interfaces
+            )
+    for backend in (OpenWRT, AirOS):
+        for version in (1, 2):
+            for interfaces in QUICK_INTERFACES:
+                name = f"{backend.__name__}-v{version}-{interfaces}"
+                yield f"poll[{name}]", partial(bench_poll, backend, version, interfaces)
+
+
+def run(quick=False, select=None):
+    """runs the benchmarks whose name contains ``select`` and returns the results"""
+    results = {}
+    for name, bench in benchmarks(quick):
+        if select and select not in name:
+            continue
+        results[name] = bench()
+        metrics = ", ".join(
+            f"{metric}={value:.6g}" for metric, value in results[name].items()
+        )
+        print(f"{name}: {metrics}", file=sys.stderr)
+    return results
+
+
+def compare(baseline, results, tolerance=None):
+    """
+    returns the report lines of the comparison of ``results`` with
+    ``baseline`` and the number of regressions: memory peaks which grew more
+    than MEMORY_TOLERANCE, any request more and, unless ``tolerance`` is
+    None, times which grew more than ``tolerance``; benchmarks missing from
+    either side are not compared
+    """
+    limits = {"peak_bytes": MEMORY_TOLERANCE, "requests": 0}
+    if tolerance is not None:
+        limits["seconds"] = tolerance
+    lines = [f"{'benchmark':<30} {'metric':<10} {'baseline':>12} {'current':>12}"]
+    regressions = 0
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            expected = baseline.get(name, {}).get(metric)
+            if expected is None or metric not in limits:
+                continue
+            change = value / expected - 1 if expected else 0
+            regression = value > expected * (1 + limits[metric])
+            regressions += regression
+            lines.append(
+                f"{name:<30} {metric:<10} {expected:>12.6g} {value:>12.6g} "
+                f"{change:+8.1%}{'  REGRESSION' if regression else ''}"
+            )
+    return lines, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().split("\n\n")[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--quick", action="store_true", help="skip the largest sizes")
+    parser.add_argument("-k", dest="select", help="run the benchmarks matching")
+    parser.add_argument("--save", metavar="FILE", help="save the results as baseline")
+    parser.add_argument(
+        "--compare",
+        metavar="FILE",
+        nargs="?",
+        const=BASELINE,
+        help=f"compare the results with a baseline (default: {BASELINE})",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        help="compare the times too, reporting the relative increases above it "
+        "as regressions (eg: 0.25); only meaningful against a baseline "
+        "recorded on the same machine",
+    )
+    args = parser.parse_args()
+    results = run(args.quick, args.select)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        lines, regressions = compare(baseline, results, args.tolerance)
+        print("\n".join(lines))
+        if regressions:
+            print(f"{regressions} regressions")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from .base import BaseBackend
 from .dummy import Dummy
+from .memoize import memoize
 
-__all__ = ["BaseBackend", "Dummy"]
+__all__ = ["BaseBackend", "Dummy", "memoize"]
@@ -1,7 +1,9 @@
+import asyncio
 import json
 from collections import OrderedDict
 
-from netaddr import EUI, NotRegisteredError
+from . import oui
+from .memoize import Memo
 
 __all__ = ["BaseBackend"]
 
@@ -11,6 +13,17 @@ class BaseBackend(object):
 
     __netengine__ = True
     _dict = OrderedDict
+    _memo = None
+    # whether the methods decorated with @memoize cache the values
+    # retrieved with live requests, which may change at every call
+    _memoize_live_values = False
+
+    @property
+    def memo(self):
+        """values memoized by the methods decorated with @memoize"""
+        if self._memo is None:
+            self._memo = Memo()
+        return self._memo
 
     def __str__(self):
         raise NotImplementedError("Not implemented, must be extended")
@@ -29,6 +42,14 @@ class BaseBackend(object):
         dictionary = self.to_dict(autowalk=autowalk)
         return json.dumps(dictionary, **kwargs)
 
+    async def ato_dict(self, autowalk=True):
+        """awaitable counterpart of to_dict, runs it in a worker thread"""
+        return await asyncio.to_thread(self.to_dict, autowalk=autowalk)
+
+    async def ato_json(self, autowalk=True, **kwargs):
+        dictionary = await self.ato_dict(autowalk=autowalk)
+        return json.dumps(dictionary, **kwargs)
+
     @property
     def os(self):
         """Not Implemented
@@ -121,9 +142,8 @@ class BaseBackend(object):
 
     def get_manufacturer(self, mac_address):
         """returns the manufacturer of the network interface"""
-        if not mac_address:
-            return ""
-        try:
-            return EUI(mac_address).oui.registration().org
-        except NotRegisteredError:
-            return ""
+        return oui.manufacturer(mac_address)
+
+    def get_manufacturers(self, mac_addresses):
+        """returns a dict mapping each MAC address to its manufacturer"""
+        return oui.manufacturers(mac_addresses)
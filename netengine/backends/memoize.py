@@ -0,0 +1,104 @@
+"""NetEngine memoization of the values computed from a dump"""
+
+__all__ = ["Memo", "memoize"]
+
+
+import functools
+import inspect
+import weakref
+
+# source of the values computed with live requests
+_LIVE = object()
+
+
+class Memo(object):
+    """
+    Values computed by the memoized methods of a backend, keyed by method
+    and arguments; all the values come from the same dump, which is
+    referenced weakly when possible: calls with another dump, or the
+    garbage collection of the dump, invalidate them
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._source = None
+        self._values = {}
+
+    def __repr__(self):
+        return f"<Memo: {len(self._values)} values, {self.hits} hits, {self.misses} misses>"
+
+    def _bind(self, snmpdump):
+        """invalidates the values when they were computed from another dump"""
+        if snmpdump is None:
+            current = self._source is _LIVE
+        else:
+            current = self._source not in (None, _LIVE) and self._source() is snmpdump
+        if current:
+            return
+        self.invalidate()
+        if snmpdump is None:
+            self._source = _LIVE
+            return
+        try:
+            self._source = weakref.ref(snmpdump, self._expire)
+        except TypeError:
+            # eg: plain dicts, which are kept alive until the next dump
+            self._source = lambda: snmpdump
+
+    def _expire(self, ref):
+        if self._source is ref:
+            self.invalidate()
+
+    def get(self, snmpdump, key, compute):
+        """returns the value memoized for ``key``, computing it when missing"""
+        self._bind(snmpdump)
+        try:
+            value = self._values[key]
+        except KeyError:
+            self.misses += 1
+            value = self._values[key] = compute()
+        else:
+            self.hits += 1
+        return value
+
+    def invalidate(self):
+        """forgets all the memoized values"""
+        self._source = None
+        self._values = {}
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._values)}
+
+
+def memoize(method):
+    """
+    memoizes a backend method which accepts a ``snmpdump`` argument;
+    values computed with live requests (``snmpdump=None``) are memoized
+    only when the backend ``_memoize_live_values`` is true
+    """
+    signature = inspect.signature(method)
+    name = method.__qualname__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        arguments = signature.bind(self, *args, **kwargs)
+        arguments.apply_defaults()
+        snmpdump = arguments.arguments.get("snmpdump")
+        if snmpdump is None and not self._memoize_live_values:
+            return method(self, *args, **kwargs)
+        key = (
+            name,
+            tuple(
+                (argument, value)
+                for argument, value in list(arguments.arguments.items())[1:]
+                if argument != "snmpdump"
+            ),
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return method(self, *args, **kwargs)
+        return self.memo.get(snmpdump, key, lambda: method(self, *args, **kwargs))
+
+    return wrapper
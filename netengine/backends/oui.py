@@ -0,0 +1,60 @@
+"""NetEngine manufacturer lookup from the IEEE OUI registry shipped with netaddr"""
+
+__all__ = ["manufacturer", "manufacturers"]
+
+
+import functools
+import importlib.resources
+import threading
+
+from netaddr import EUI
+
+_lock = threading.Lock()
+# OUI (24 bit int) -> organization of its first registration, as netaddr
+_table = None
+
+
+def _load():
+    """parses the ``(hex)`` lines of the netaddr oui.txt registry"""
+    data = importlib.resources.files("netaddr.eui").joinpath("oui.txt").read_bytes()
+    table = {}
+    # organizations with many OUIs share the same string
+    organizations = {}
+    for line in data.splitlines():
+        if b"(hex)" not in line:
+            continue
+        fields = line.split(None, 2)
+        oui = int(fields[0].replace(b"-", b""), 16)
+        if oui in table:
+            continue
+        organization = fields[2].decode("utf-8").strip() if len(fields) > 2 else ""
+        table[oui] = organizations.setdefault(organization, organization)
+    return table
+
+
+def _oui_table():
+    """returns the OUI table, which is built once on first use"""
+    global _table
+    if _table is None:
+        with _lock:
+            if _table is None:
+                _table = _load()
+    return _table
+
+
+@functools.lru_cache(maxsize=4096)
+def manufacturer(mac_address):
+    """
+    returns the organization which registered the OUI of ``mac_address``,
+    an empty string when it is not registered; raises ``AddrFormatError``
+    when ``mac_address`` is not valid
+    """
+    if not mac_address:
+        return ""
+    eui = EUI(mac_address)
+    return _oui_table().get(eui.value >> (eui.version - 24), "")
+
+
+def manufacturers(mac_addresses):
+    """returns a dict mapping each of ``mac_addresses`` to its manufacturer"""
+    return {mac_address: manufacturer(mac_address) for mac_address in mac_addresses}
@@ -1,5 +1,19 @@
+from .accounting import RequestAccounting
 from .airos import AirOS
 from .base import SNMP
+from .cache import ResponseCache
+from .dump import SnmpDump
+from .filters import InterfaceFilter
+from .health import HealthTracker
 from .openwrt import OpenWRT
 
-__all__ = ["SNMP", "OpenWRT", "AirOS"]
+__all__ = [
+    "SNMP",
+    "OpenWRT",
+    "AirOS",
+    "HealthTracker",
+    "InterfaceFilter",
+    "RequestAccounting",
+    "ResponseCache",
+    "SnmpDump",
+]
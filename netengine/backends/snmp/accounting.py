@@ -0,0 +1,115 @@
+"""NetEngine accounting of the SNMP requests"""
+
+__all__ = ["RequestAccounting"]
+
+
+import collections
+import contextvars
+import threading
+
+# the backend method which sends the requests of the current context, set
+# by the backends around the requests which they send on behalf of a method
+# (eg: the sections of to_dict()) and inherited by the tasks they start
+request_method = contextvars.ContextVar("request_method", default=None)
+
+
+class _Totals(object):
+    __slots__ = ("requests", "errors", "varbinds", "bytes", "seconds")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.varbinds = 0
+        self.bytes = 0
+        self.seconds = 0.0
+
+    def add(self, error, varbinds, size, seconds):
+        self.requests += 1
+        self.errors += bool(error)
+        self.varbinds += varbinds
+        self.bytes += size
+        self.seconds += seconds
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class RequestAccounting(object):
+    """
+    Counts the SNMP requests (PDUs) sent by the backends which share it,
+    by type (``get``, ``getnext``, ``getbulk``), by the backend method which
+    sent them (eg: ``interfaces_to_dict``, ``autowalk``) and by OID subtree,
+    with the varbinds and the estimated bytes of their responses and their
+    latency, retries and timeouts included. The last ``history`` requests
+    are kept, eg: to find the slowest ones.
+    """
+
+    def __init__(self, history=1000):
+        self._lock = threading.Lock()
+        self.history = history
+        self.reset()
+
+    def __repr__(self):
+        return f"<RequestAccounting: {self.total.requests} requests>"
+
+    def reset(self):
+        """forgets the requests counted so far"""
+        with self._lock:
+            self.total = _Totals()
+            self._kinds = collections.defaultdict(_Totals)
+            self._methods = collections.defaultdict(_Totals)
+            self._subtrees = collections.defaultdict(_Totals)
+            self.requests = collections.deque(maxlen=self.history)
+
+    def record(self, host, kind, method, subtrees, varbinds, size, seconds, error=None):
+        """
+        counts a request of ``kind`` sent to ``host`` by ``method``, with the
+        subtree of each requested OID in ``subtrees``; ``varbinds`` and
+        ``size`` (bytes) are those of the response and ``error`` its error
+        indication or status. The varbinds, bytes and seconds of a request
+        which reads several subtrees are split among them in proportion to
+        their OIDs.
+        """
+        shares = collections.Counter(subtrees)
+        with self._lock:
+            self.total.add(error, varbinds, size, seconds)
+            self._kinds[kind].add(error, varbinds, size, seconds)
+            self._methods[method].add(error, varbinds, size, seconds)
+            for subtree, count in shares.items():
+                share = count / len(subtrees)
+                self._subtrees[subtree].add(
+                    error,
+                    round(varbinds * share),
+                    round(size * share),
+                    seconds * share,
+                )
+            self.requests.append(
+                {
+                    "host": host,
+                    "kind": kind,
+                    "method": method,
+                    "subtrees": tuple(shares),
+                    "varbinds": varbinds,
+                    "bytes": size,
+                    "seconds": seconds,
+                    "error": str(error) if error else None,
+                }
+            )
+
+    def stats(self):
+        """
+        returns the totals of the requests, each with ``requests``,
+        ``errors``, ``varbinds``, ``bytes`` and ``seconds``, overall and
+        by type, method and subtree
+        """
+        with self._lock:
+            return {
+                "total": self.total.as_dict(),
+                "kinds": self._as_dicts(self._kinds),
+                "methods": self._as_dicts(self._methods),
+                "subtrees": self._as_dicts(self._subtrees),
+            }
+
+    @staticmethod
+    def _as_dicts(totals):
+        return {name: total.as_dict() for name, total in sorted(totals.items())}
@@ -6,6 +6,7 @@ __all__ = ["AirOS"]
 import logging
 from datetime import datetime, timezone
 
+from netengine.backends import memoize
 from netengine.exceptions import NetEngineError
 
 from .base import SNMP
@@ -17,6 +18,113 @@ class AirOS(SNMP):
     """Ubiquiti AirOS SNMP backend"""
 
     _oid_to_retrieve = "1.3.6.1.2.1.2.2.1.1."
+    _autowalk_subtrees = (
+        # ifTable: ifIndex, ifDescr, ifType,
+        # ifPhysAddress, ifInOctets, ifOutOctets
+        "1.3.6.1.2.1.2.2.1.1",
+        "1.3.6.1.2.1.2.2.1.2",
+        "1.3.6.1.2.1.2.2.1.3",
+        "1.3.6.1.2.1.2.2.1.6",
+        "1.3.6.1.2.1.2.2.1.10",
+        "1.3.6.1.2.1.2.2.1.16",
+        # FROGFOOT-RESOURCES-MIB loadTable
+        "1.3.6.1.4.1.10002.1.1.1.4.2.1",
+    )
+    _optional_autowalk_subtrees = (
+        # IEEE 802.11 MIB dot11StationID, used to detect wireless interfaces
+        "1.2.840.10036.1.1.1.1",
+        # ifTable: ifInUcastPkts, ifInNUcastPkts, ifOutUcastPkts, ifOutNUcastPkts
+        "1.3.6.1.2.1.2.2.1.11",
+        "1.3.6.1.2.1.2.2.1.12",
+        "1.3.6.1.2.1.2.2.1.17",
+        "1.3.6.1.2.1.2.2.1.18",
+        # ifXTable: ifHCInOctets, ifHCInUcastPkts, ifHCInMulticastPkts,
+        # ifHCInBroadcastPkts and the same outbound counters
+        "1.3.6.1.2.1.31.1.1.1.6",
+        "1.3.6.1.2.1.31.1.1.1.7",
+        "1.3.6.1.2.1.31.1.1.1.8",
+        "1.3.6.1.2.1.31.1.1.1.9",
+        "1.3.6.1.2.1.31.1.1.1.10",
+        "1.3.6.1.2.1.31.1.1.1.11",
+        "1.3.6.1.2.1.31.1.1.1.12",
+        "1.3.6.1.2.1.31.1.1.1.13",
+    )
+    _autowalk_scalars = (
+        # sysDescr, sysUpTime, sysName
+        "1.3.6.1.2.1.1.1.0",
+        "1.3.6.1.2.1.1.3.0",
+        "1.3.6.1.2.1.1.5.0",
+        # IEEE 802.11 MIB product name and version
+        "1.2.840.10036.3.1.2.1.3.5",
+        "1.2.840.10036.3.1.2.1.3.8",
+        "1.2.840.10036.3.1.2.1.4.5",
+        "1.2.840.10036.3.1.2.1.4.8",
+        # FROGFOOT-RESOURCES-MIB memory, swap and load count
+        "1.3.6.1.4.1.10002.1.1.1.1.1.0",
+        "1.3.6.1.4.1.10002.1.1.1.1.2.0",
+        "1.3.6.1.4.1.10002.1.1.1.1.3.0",
+        "1.3.6.1.4.1.10002.1.1.1.1.4.0",
+        "1.3.6.1.4.1.10002.1.1.1.2.1.0",
+        "1.3.6.1.4.1.10002.1.1.1.2.2.0",
+        "1.3.6.1.4.1.10002.1.1.1.4.1.0",
+        # UBNT-AirMAX-MIB local time
+        "1.3.6.1.4.1.41112.1.4.8.1.0",
+    )
+    _field_oids = {
+        "general.uptime": ("1.3.6.1.2.1.1.3.0",),
+        "general.local_time": ("1.3.6.1.4.1.41112.1.4.8.1.0",),
+        "general.hostname": ("1.3.6.1.2.1.1.5.0",),
+        "hardware.model": ("1.2.840.10036.3.1.2.1.3.5", "1.2.840.10036.3.1.2.1.3.8"),
+        "operating_system.name": ("1.3.6.1.2.1.1.1.0",),
+        "operating_system.description": ("1.3.6.1.2.1.1.1.0",),
+        "operating_system.version": (
+            "1.2.840.10036.3.1.2.1.4.5",
+            "1.2.840.10036.3.1.2.1.4.8",
+        ),
+        "resources.load": ("1.3.6.1.4.1.10002.1.1.1.4.2.1",),
+        "resources.cpus": (
+            "1.3.6.1.4.1.10002.1.1.1.4.2.1",
+            "1.3.6.1.4.1.10002.1.1.1.4.1.0",
+        ),
+        "resources.memory": (
+            "1.3.6.1.4.1.10002.1.1.1.1.1.0",
+            "1.3.6.1.4.1.10002.1.1.1.1.2.0",
+            "1.3.6.1.4.1.10002.1.1.1.1.3.0",
+            "1.3.6.1.4.1.10002.1.1.1.1.4.0",
+        ),
+        "resources.swap": (
+            "1.3.6.1.4.1.10002.1.1.1.2.1.0",
+            "1.3.6.1.4.1.10002.1.1.1.2.2.0",
+        ),
+        "interfaces": ("1.3.6.1.2.1.2.2.1.1", "1.3.6.1.2.1.2.2.1.2"),
+        "interfaces.name": (),
+        "interfaces.mac": ("1.3.6.1.2.1.2.2.1.6",),
+        "interfaces.type": ("1.3.6.1.2.1.2.2.1.3", "1.2.840.10036.1.1.1.1"),
+        "interfaces.statistics": (
+            "1.3.6.1.2.1.2.2.1.10",
+            "1.3.6.1.2.1.2.2.1.11",
+            "1.3.6.1.2.1.2.2.1.12",
+            "1.3.6.1.2.1.2.2.1.16",
+            "1.3.6.1.2.1.2.2.1.17",
+            "1.3.6.1.2.1.2.2.1.18",
+            "1.3.6.1.2.1.31.1.1.1.6",
+            "1.3.6.1.2.1.31.1.1.1.7",
+            "1.3.6.1.2.1.31.1.1.1.8",
+            "1.3.6.1.2.1.31.1.1.1.9",
+            "1.3.6.1.2.1.31.1.1.1.10",
+            "1.3.6.1.2.1.31.1.1.1.11",
+            "1.3.6.1.2.1.31.1.1.1.12",
+            "1.3.6.1.2.1.31.1.1.1.13",
+        ),
+    }
+    _sections = {
+        "general": "general_to_dict",
+        "hardware": "hardware_to_dict",
+        "operating_system": "operating_system_to_dict",
+        "resources": "resources_to_dict",
+        "interfaces": "interfaces_to_dict",
+    }
+    _interface_keys = {"mac": ("mac",), "type": ("type",), "statistics": ()}
 
     def __str__(self, snmpdump=None):
         """print a human readable object description"""
@@ -61,6 +169,7 @@ class AirOS(SNMP):
                         return "AirOS " + ".".join(tmp[i:length])
                     i = i + 1
 
+    @memoize
     def manufacturer(self, snmpdump=None):
         return self.get_manufacturer(
             self.interfaces_MAC(snmpdump=snmpdump)[1]["mac_address"]
@@ -81,272 +190,128 @@ class AirOS(SNMP):
         """Returns the number of the network interfaces"""
         return int(self.get_value("1.3.6.1.2.1.2.1.0", snmpdump=snmpdump))
 
-    _interfaces = None
-
+    @memoize
     def get_interfaces(self, snmpdump=None):
         """returns the list of all the interfaces of the device"""
-        self._ensure_memoized_properties_source(snmpdump)
-        if self._interfaces is None:
-            interfaces = []
-            value_to_get = "1.3.6.1.2.1.2.2.1.2."
-
-            for i in self._value_to_retrieve(snmpdump=snmpdump):
-                value_to_get1 = value_to_get + str(i)
-                if value_to_get1:
-                    interfaces.append(self.get_value(value_to_get1, snmpdump=snmpdump))
-
-            self._interfaces = interfaces
-
-        return self._interfaces
-
-    _interfaces_mtu = None
+        columns = self._interface_columns(("descr",), snmpdump=snmpdump)
+        return list(columns["descr"].values())
 
+    @memoize
     def interfaces_mtu(self, snmpdump=None):
         """Returns an ordereed dict with the interface and its MTU"""
-        self._ensure_memoized_properties_source(snmpdump)
-        if self._interfaces_mtu is None:
-            results = []
-            starting = "1.3.6.1.2.1.2.2.1.2."
-            tmp = list(starting)
-            tmp[18] = str(4)
-            to = "".join(tmp)
-
-            for i in self._value_to_retrieve(snmpdump=snmpdump):
-                result = self._dict(
-                    {
-                        "name": self.get_value(starting + str(i), snmpdump=snmpdump),
-                        "mtu": int(self.get_value(to + str(i), snmpdump=snmpdump)),
-                    }
-                )
-                results.append(result)
-
-            self._interfaces_mtu = results
-
-        return self._interfaces_mtu
-
-    _interfaces_state = None
+        columns = self._interface_columns(("descr", "mtu"), snmpdump=snmpdump)
+        return [
+            self._dict({"name": name, "mtu": int(columns["mtu"][index])})
+            for index, name in columns["descr"].items()
+        ]
 
+    @memoize
     def interfaces_state(self, snmpdump=None):
         """Returns an ordereed dict with the interfaces and their state (up, down)"""
-        self._ensure_memoized_properties_source(snmpdump)
-        if self._interfaces_state is None:
-            results = []
-            starting = "1.3.6.1.2.1.2.2.1.2."
-            operative = "1.3.6.1.2.1.2.2.1.8."
-            tmp = list(starting)
-            tmp[18] = str(4)
-            for i in self._value_to_retrieve(snmpdump=snmpdump):
-                if self.get_value(starting + str(i), snmpdump=snmpdump) != "":
-                    if int(self.get_value(operative + str(i), snmpdump=snmpdump)) == 1:
-                        result = self._dict(
-                            {
-                                "name": self.get_value(
-                                    starting + str(i), snmpdump=snmpdump
-                                ),
-                                "state": "up",
-                            }
-                        )
-                    else:
-                        result = self._dict(
-                            {
-                                "name": self.get_value(
-                                    starting + str(i), snmpdump=snmpdump
-                                ),
-                                "state": "down",
-                            }
-                        )
-                elif self.get_value(starting + str(i), snmpdump=snmpdump) == "":
-                    result = self._dict({"name": "", "state": ""})
-                # append result to list
-                results.append(result)
-
-            self._interfaces_state = results
-
-        return self._interfaces_state
-
-    _interfaces_speed = None
+        columns = self._interface_columns(("descr", "oper_status"), snmpdump=snmpdump)
+        results = []
+        for index, name in columns["descr"].items():
+            if name != "":
+                if int(columns["oper_status"][index]) == 1:
+                    result = self._dict({"name": name, "state": "up"})
+                else:
+                    result = self._dict({"name": name, "state": "down"})
+            else:
+                result = self._dict({"name": "", "state": ""})
+            results.append(result)
+        return results
 
+    @memoize
     def interfaces_speed(self, snmpdump=None):
         """Returns an ordered dict with the interface and ist speed in bps"""
-        self._ensure_memoized_properties_source(snmpdump)
-        if self._interfaces_speed is None:
-            results = []
-            starting = "1.3.6.1.2.1.2.2.1.2."
-            starting_speed = "1.3.6.1.2.1.2.2.1.5."
-
-            for i in self._value_to_retrieve(snmpdump=snmpdump):
-                result = self._dict(
-                    {
-                        "name": self.get_value(starting + str(i), snmpdump=snmpdump),
-                        "speed": int(
-                            self.get_value(starting_speed + str(i), snmpdump=snmpdump)
-                        ),
-                    }
-                )
-                results.append(result)
-
-            self._interfaces_speed = results
-
-        return self._interfaces_speed
-
-    _interfaces_bytes = None
+        columns = self._interface_columns(
+            ("descr", "speed", "high_speed"), snmpdump=snmpdump
+        )
+        return [
+            self._dict(
+                {
+                    "name": name,
+                    "speed": self._interface_speed(
+                        columns["speed"][index], columns["high_speed"][index]
+                    ),
+                }
+            )
+            for index, name in columns["descr"].items()
+        ]
 
+    @memoize
     def interfaces_bytes(self, snmpdump=None):
         """Returns an ordereed dict with the interface and its tx and rx octets (1 octet = 1 byte = 8 bits)"""
-        self._ensure_memoized_properties_source(snmpdump)
-        if self._interfaces_bytes is None:
-            results = []
-            starting = "1.3.6.1.2.1.2.2.1.2."
-            starting_rx = "1.3.6.1.2.1.2.2.1.10."
-            starting_tx = "1.3.6.1.2.1.2.2.1.16."
-
-            for i in self._value_to_retrieve(snmpdump=snmpdump):
-                result = self._dict(
-                    {
-                        "name": self.get_value(starting + str(i), snmpdump=snmpdump),
-                        "tx": int(
-                            self.get_value(starting_tx + str(i), snmpdump=snmpdump)
-                        ),
-                        "rx": int(
-                            self.get_value(starting_rx + str(i), snmpdump=snmpdump)
-                        ),
-                    }
-                )
-                results.append(result)
-            self._interfaces_bytes = results
-
-        return self._interfaces_bytes
-
-    _interfaces_MAC = None
+        columns = self._interface_columns(("descr",), snmpdump=snmpdump)
+        counters = self._interface_counters(("tx_bytes", "rx_bytes"), snmpdump=snmpdump)
+        return [
+            self._dict(
+                {
+                    "name": name,
+                    "tx": counters[index].get("tx_bytes", 0),
+                    "rx": counters[index].get("rx_bytes", 0),
+                }
+            )
+            for index, name in columns["descr"].items()
+        ]
 
+    @memoize
     def interfaces_MAC(self, snmpdump=None):
         """Returns an ordered dict with the hardware address of every interface"""
-        self._ensure_memoized_properties_source(snmpdump)
-        if self._interfaces_MAC is None:
-            results = []
-            starting = "1.3.6.1.2.1.2.2.1.2."
-            starting_mac = "1.3.6.1.2.1.2.2.1.6."
-
-            for i in self._value_to_retrieve(snmpdump=snmpdump):
-                result = self._dict(
-                    {
-                        "name": self.get_value(starting + str(i), snmpdump=snmpdump),
-                        "mac_address": self._octet_to_mac(
-                            self.get_value(starting_mac + str(i), snmpdump=snmpdump)
-                        ),
-                    }
-                )
-                results.append(result)
-
-            self._interfaces_MAC = results
-
-        return self._interfaces_MAC
-
-    _interfaces_type = None
-    _wireless_interfaces = None
+        columns = self._interface_columns(("descr", "mac"), snmpdump=snmpdump)
+        return [
+            self._dict(
+                {
+                    "name": name,
+                    "mac_address": self._octet_to_mac(columns["mac"][index]),
+                }
+            )
+            for index, name in columns["descr"].items()
+        ]
 
+    @memoize
     def interfaces_type(self, snmpdump=None):
         """Returns an ordered dict with the interface type (e.g Ethernet, loopback)"""
-        self._ensure_memoized_properties_source(snmpdump)
-        if self._interfaces_type is None:
-            types = {
-                "6": "ethernet",
-                "24": "loopback",
-                "157": "wireless",
-                "209": "bridge",
-            }
-            results = []
-            starting = "1.3.6.1.2.1.2.2.1.2."
-            types_oid = "1.3.6.1.2.1.2.2.1.3."
-
-            for i in self._value_to_retrieve(snmpdump=snmpdump):
-                result = self._dict(
-                    {
-                        "name": self.get_value(starting + str(i), snmpdump=snmpdump),
-                        "type": types.get(
-                            self.get_value(types_oid + str(i), snmpdump=snmpdump),
-                            "unknown",
-                        ),
-                    }
-                )
-                results.append(result)
-
-            self._interfaces_type = results
-
-        return self._interfaces_type
-
-    def get_wireless_interfaces(self, snmpdump=None):
-        """returns the list of all the wireless interfaces of the device"""
-        self._ensure_memoized_properties_source(snmpdump)
-        if self._wireless_interfaces is None:
-            interfaces = []
-            wireless_if_oid = "1.2.840.10036.1.1.1.1."
-            interfaces_oid = "1.3.6.1.2.1.2.2.1.2."
-
-            for i in self._value_to_retrieve(snmpdump=snmpdump):
-                try:
-                    value_to_get1 = self.get_value(
-                        wireless_if_oid + str(i), snmpdump=snmpdump
-                    )
-
-                    if value_to_get1:
-                        interfaces.append(
-                            self.get_value(interfaces_oid + str(i), snmpdump=snmpdump)
-                        )
-                except (NetEngineError, KeyError):
-                    pass
-
-            self._wireless_interfaces = [_f for _f in interfaces if _f]
-
-        return self._wireless_interfaces
-
-    _interfaces_MAC = None
-
-    def interfaces_to_dict(self, snmpdump=None):
-        """Returns an ordered dict with all the information available about the interface"""
-        results = []
-        wireless_if = self.get_wireless_interfaces(snmpdump=snmpdump)
-        for i in range(0, len(self.get_interfaces(snmpdump=snmpdump))):
-            logger.info(f"===== {i} =====")
-            logger.info("... name ...")
-            name = self.interfaces_MAC(snmpdump=snmpdump)[i]["name"]
-            if not name:
-                continue
-            logger.info("... if_type ...")
-            if_type = self.interfaces_type(snmpdump=snmpdump)[i]["type"]
-            logger.info("... rx_bytes ...")
-            rx_bytes = int(self.interfaces_bytes(snmpdump=snmpdump)[i]["rx"])
-            logger.info("... tx_bytes ...")
-            tx_bytes = int(self.interfaces_bytes(snmpdump=snmpdump)[i]["tx"])
-
-            if name in wireless_if:
-                if_type = "wireless"
-
-            result = self._dict(
+        columns = self._interface_columns(("descr", "type"), snmpdump=snmpdump)
+        return [
+            self._dict(
                 {
                     "name": name,
-                    "mac": self.interfaces_MAC(snmpdump=snmpdump)[i]["mac_address"],
-                    "type": if_type,
-                    "statistics": {"rx_bytes": rx_bytes, "tx_bytes": tx_bytes},
+                    "type": self._interface_types.get(
+                        columns["type"][index], "unknown"
+                    ),
                 }
             )
-            results.append(result)
-        return results
+            for index, name in columns["descr"].items()
+        ]
+
+    @memoize
+    def get_wireless_interfaces(self, snmpdump=None):
+        """returns the list of all the wireless interfaces of the device"""
+        try:
+            columns = self._interface_columns(("descr", "wireless"), snmpdump=snmpdump)
+        except NetEngineError:
+            return []
+        return [
+            name
+            for index, name in columns["descr"].items()
+            if name and columns["wireless"][index]
+        ]
 
     def wireless_dbm(self, snmpdump=None):
         """returns a list with the wireless signal (dbm) of the link/s"""
-        res = self.next("1.3.6.1.4.1.14988.1.1.1.2.1.3.0.", snmpdump=snmpdump)
+        rows = self._next_rows("1.3.6.1.4.1.14988.1.1.1.2.1.3.0.", snmpdump=snmpdump)
         dbm = []
-        for i in range(0, len(res[3])):
-            dbm.append(int(res[3][i][0][1]))
+        for i in range(0, len(rows)):
+            dbm.append(int(rows[i][0][1]))
         return dbm
 
     def wireless_links(self, snmpdump=None):
         """Returns an ordered dict with all the infos about the wireless link/s"""
         final = []
-        results = self.next("1.3.6.1.4.1.14988.1.1.1.2.1.", snmpdump=snmpdump)
+        results = self._next_rows("1.3.6.1.4.1.14988.1.1.1.2.1.", snmpdump=snmpdump)
         link_number = len(
-            self.next("1.3.6.1.4.1.14988.1.1.1.2.1.3.", snmpdump=snmpdump)[3]
+            self._next_rows("1.3.6.1.4.1.14988.1.1.1.2.1.3.", snmpdump=snmpdump)
         )
         separated_by_meaning = []
         dbm = []
@@ -357,8 +322,8 @@ class AirOS(SNMP):
         tx_rate = []
         rx_rate = []
 
-        for i in range(0, len(results[3]), link_number):
-            separated_by_meaning.append(results[3][slice(i, i + link_number)])
+        for i in range(0, len(results), link_number):
+            separated_by_meaning.append(results[slice(i, i + link_number)])
 
         for i in range(0, len(separated_by_meaning[0])):
             dbm.append(int(separated_by_meaning[0][i][0][1]))
@@ -419,7 +384,7 @@ class AirOS(SNMP):
 
     def load(self, snmpdump=None):
         """Return the load averages for the last 1, 5, and 15 minutes."""
-        array = self.next("1.3.6.1.4.1.10002.1.1.1.4.2.1.3.", snmpdump=snmpdump)[3]
+        array = self._next_rows("1.3.6.1.4.1.10002.1.1.1.4.2.1.3.", snmpdump=snmpdump)
         one = float(array[0][0][1]) / 100
         five = float(array[1][0][1]) / 100
         fifteen = float(array[2][0][1]) / 100
@@ -438,7 +403,7 @@ class AirOS(SNMP):
     def CPU_count(self, snmpdump=None):
         """Returns the number of CPU cores for which load information is returned"""
         loadEntry = len(
-            self.next("1.3.6.1.4.1.10002.1.1.1.4.2.1.", snmpdump=snmpdump)[3]
+            self._next_rows("1.3.6.1.4.1.10002.1.1.1.4.2.1.", snmpdump=snmpdump)
         )
         loadNumber = int(
             self.get_value("1.3.6.1.4.1.10002.1.1.1.4.1.0", snmpdump=snmpdump)
@@ -447,69 +412,61 @@ class AirOS(SNMP):
         # are returned: loadIndex, loadDescr, loadValue
         return int(loadEntry // (3 * loadNumber))
 
-    def resources_to_dict(self, snmpdump=None):
+    def memory_to_dict(self, snmpdump=None):
+        """returns a dict with the memory usage"""
+        return {
+            "total": self.RAM_total(snmpdump=snmpdump),
+            "buffered": self.RAM_buffered(snmpdump=snmpdump),
+            "free": self.RAM_free(snmpdump=snmpdump),
+            "cache": self.RAM_cached(snmpdump=snmpdump),
+        }
+
+    def swap_to_dict(self, snmpdump=None):
+        """returns a dict with the swap usage"""
+        return {
+            "total": self.SWAP_total(snmpdump=snmpdump),
+            "free": self.SWAP_free(snmpdump=snmpdump),
+        }
+
+    def resources_to_dict(self, snmpdump=None, fields=None):
         """returns an ordered dict with hardware resources information"""
-        result = self._dict(
+        return self._fields_to_dict(
             {
-                "load": self.load(snmpdump=snmpdump),
-                "cpus": self.CPU_count(snmpdump=snmpdump),
-                "memory": {
-                    "total": self.RAM_total(snmpdump=snmpdump),
-                    "buffered": self.RAM_buffered(snmpdump=snmpdump),
-                    "free": self.RAM_free(snmpdump=snmpdump),
-                    "cache": self.RAM_cached(snmpdump=snmpdump),
-                },
-                "swap": {
-                    "total": self.SWAP_total(snmpdump=snmpdump),
-                    "free": self.SWAP_free(snmpdump=snmpdump),
-                },
-            }
+                "load": self.load,
+                "cpus": self.CPU_count,
+                "memory": self.memory_to_dict,
+                "swap": self.swap_to_dict,
+            },
+            snmpdump=snmpdump,
+            fields=fields,
         )
-        return result
-
-    def _reset_memoized_properties(self):
-        for attribute in (
-            "_interfaces",
-            "_interfaces_mtu",
-            "_interfaces_state",
-            "_interfaces_speed",
-            "_interfaces_bytes",
-            "_interfaces_MAC",
-            "_interfaces_type",
-            "_wireless_interfaces",
-        ):
-            setattr(self, attribute, None)
-
-    def _ensure_memoized_properties_source(self, snmpdump):
-        if getattr(self, "_memoized_snmpdump", object()) is not snmpdump:
-            self._reset_memoized_properties()
-            self._memoized_snmpdump = snmpdump
-
-    def to_dict(self, autowalk=True, snmpdump=None):
-        self._reset_memoized_properties()
-        if snmpdump is None and autowalk:
-            snmpdump = self.walk("1.3.6")
-            try:
-                snmpdump.update(self.walk("1.2.840.10036"))
-            except NetEngineError as exc:
-                logger.warning("Unable to collect optional vendor SNMP data: %s", exc)
-        os_name, os_description = self.os(snmpdump=snmpdump)
-        result = self._dict(
+
+    def general_to_dict(self, snmpdump=None, fields=None):
+        """returns a dict with the uptime, local time and hostname"""
+        return self._fields_to_dict(
+            {
+                "uptime": self.uptime,
+                "local_time": self.local_time,
+                "hostname": self.name,
+            },
+            snmpdump=snmpdump,
+            fields=fields,
+        )
+
+    def hardware_to_dict(self, snmpdump=None, fields=None):
+        """returns a dict with the device model"""
+        return self._fields_to_dict(
+            {"model": self.model}, snmpdump=snmpdump, fields=fields
+        )
+
+    def operating_system_to_dict(self, snmpdump=None, fields=None):
+        """returns a dict with the name, description and firmware version"""
+        return self._fields_to_dict(
             {
-                "type": "DeviceMonitoring",
-                "general": {
-                    "uptime": self.uptime(snmpdump=snmpdump),
-                    "local_time": self.local_time(snmpdump=snmpdump),
-                    "hostname": self.name(snmpdump=snmpdump),
-                },
-                "hardware": {"model": self.model(snmpdump=snmpdump)},
-                "operating_system": {
-                    "name": os_name,
-                    "description": os_description,
-                    "version": self.firmware(snmpdump=snmpdump),
-                },
-                "resources": self.resources_to_dict(snmpdump=snmpdump),
-                "interfaces": self.interfaces_to_dict(snmpdump=snmpdump),
-            }
+                "name": lambda snmpdump=None: self.os(snmpdump=snmpdump)[0],
+                "description": lambda snmpdump=None: self.os(snmpdump=snmpdump)[1],
+                "version": self.firmware,
+            },
+            snmpdump=snmpdump,
+            fields=fields,
         )
-        return result
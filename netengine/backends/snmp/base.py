@@ -1,9 +1,15 @@
 import asyncio
 import binascii
+import contextlib
+import copy
+import hashlib
 import inspect
 import logging
+import sys
+import time
 
 import netaddr
+from pyasn1.type.univ import Null, OctetString
 
 try:
     from pysnmp.hlapi.v3arch.asyncio import (
@@ -11,19 +17,24 @@ try:
         ContextData,
         ObjectIdentity,
         ObjectType,
-        SnmpEngine,
-        UdpTransportTarget,
+        bulk_walk_cmd,
         get_cmd,
         walk_cmd,
     )
+    from pysnmp.proto.errind import RequestTimedOut
 except ImportError as exc:
     raise ImportError(
         'pysnmp library is not installed, install it with "pip install pysnmp"'
     ) from exc
 
-from netengine.backends import BaseBackend
+from netengine.backends import BaseBackend, memoize
 from netengine.exceptions import NetEngineError
 
+from .accounting import request_method
+from .coalesce import InFlightRequests
+from .dump import SnmpDump
+from .session import CircuitOpen, DeadlineExceeded, SNMPSession, Unreachable
+
 __all__ = ["SNMP"]
 
 logger = logging.getLogger(__name__)
@@ -33,44 +44,668 @@ class SNMP(BaseBackend):
     """SNMP base backend."""
 
     _oid_to_retrieve = None
+    _session = None
+    _session_depth = 0
+    # SNMP engine shared by the asynchronous sessions of many devices running
+    # on the same event loop (eg: by the Poller), each session builds its own
+    # engine when this is not set
+    engine = None
+    # identical requests outstanding at the same time, eg: sent by concurrent
+    # polls of the same agent, share a single network exchange and result
+    coalesce_requests = True
+    _in_flight = InFlightRequests()
+    # optional ResponseCache of the GET and walk responses
+    cache = None
+    # optional HealthTracker (circuit breaker) of the polled hosts and the
+    # OID (sysUpTime) probed before polling a host whose circuit is half-open
+    health = None
+    # optional RequestAccounting of the requests sent to the device
+    accounting = None
+    # optional MetricsRegistry fed with the requests and the to_dict() sections
+    metrics = None
+    _walk_buckets = (1, 10, 100, 1000, 10000, 100000)
+    # the request API, the requests are accounted to the backend method
+    # which called it (see _request_method())
+    _request_api = frozenset(
+        (
+            "get",
+            "aget",
+            "get_many",
+            "aget_many",
+            "get_value",
+            "aget_value",
+            "get_values",
+            "aget_values",
+            "walk",
+            "awalk",
+            "iter_walk",
+            "aiter_walk",
+            "next",
+            "anext_walk",
+        )
+    )
+    _uptime_oid = "1.3.6.1.2.1.1.3.0"
+    _probe_oid = _uptime_oid
+    # whether the agent answered an SNMPv2c request, see _bulk_fallback()
+    _v2c_answered = False
+    # seconds waited for each response, number of times each request is
+    # sent again and maximum duration of a session (eg: of a to_dict() poll)
+    timeout = 1
+    retries = 5
+    deadline = None
+    # number of varbinds requested per GETBULK PDU when walking with SNMPv2c
+    max_repetitions = 25
+    # GET requests sent by get_many() are split so that neither the request
+    # nor the response (estimated) exceed the agent's maximum message size
+    max_get_varbinds = 40
+    max_message_size = 1472
+    _varbind_value_size = 32
+    # the subtrees and scalars read by to_dict(), which are collected when
+    # autowalk is enabled; failing to walk the optional subtrees is not an error
+    _autowalk_subtrees = ()
+    _optional_autowalk_subtrees = ()
+    _autowalk_scalars = ()
+    # maximum number of autowalk requests sent to the device at the same time
+    autowalk_concurrency = 4
+    # optional InterfaceFilter of the interfaces whose data is collected
+    interface_filter = None
+    # the fields of the to_dict() sections ("section.key") mapped to the
+    # subtrees and scalars of the autowalk plan which they read; the OIDs of
+    # a section ("section") are read by any of its fields
+    _field_oids = {}
+    # the sections of to_dict() mapped to the names of the methods which
+    # return them
+    _sections = {}
+    # the keys of the interfaces in interfaces_to_dict(), in order, mapped to
+    # the _interface_columns() which they read; the "addresses" and the
+    # "statistics" are read by interface_addr_and_mask() and by
+    # _interface_counters_and_bits()
+    _interface_keys = {}
+    # ifTable and ifXTable columns read by _interface_columns()
+    _interface_column_oids = {
+        "descr": "1.3.6.1.2.1.2.2.1.2",
+        "type": "1.3.6.1.2.1.2.2.1.3",
+        "mtu": "1.3.6.1.2.1.2.2.1.4",
+        "speed": "1.3.6.1.2.1.2.2.1.5",
+        "mac": "1.3.6.1.2.1.2.2.1.6",
+        "admin_status": "1.3.6.1.2.1.2.2.1.7",
+        "oper_status": "1.3.6.1.2.1.2.2.1.8",
+        "in_octets": "1.3.6.1.2.1.2.2.1.10",
+        "in_ucast_pkts": "1.3.6.1.2.1.2.2.1.11",
+        "in_nucast_pkts": "1.3.6.1.2.1.2.2.1.12",
+        "out_octets": "1.3.6.1.2.1.2.2.1.16",
+        "out_ucast_pkts": "1.3.6.1.2.1.2.2.1.17",
+        "out_nucast_pkts": "1.3.6.1.2.1.2.2.1.18",
+        "name": "1.3.6.1.2.1.31.1.1.1.1",
+        # high capacity (64-bit) counters and speed in Mbps
+        "hc_in_octets": "1.3.6.1.2.1.31.1.1.1.6",
+        "hc_in_ucast_pkts": "1.3.6.1.2.1.31.1.1.1.7",
+        "hc_in_multicast_pkts": "1.3.6.1.2.1.31.1.1.1.8",
+        "hc_in_broadcast_pkts": "1.3.6.1.2.1.31.1.1.1.9",
+        "hc_out_octets": "1.3.6.1.2.1.31.1.1.1.10",
+        "hc_out_ucast_pkts": "1.3.6.1.2.1.31.1.1.1.11",
+        "hc_out_multicast_pkts": "1.3.6.1.2.1.31.1.1.1.12",
+        "hc_out_broadcast_pkts": "1.3.6.1.2.1.31.1.1.1.13",
+        "high_speed": "1.3.6.1.2.1.31.1.1.1.15",
+        # IEEE 802.11 MIB dot11StationID, set only on wireless interfaces
+        "wireless": "1.2.840.10036.1.1.1.1",
+    }
+    # the 64-bit (ifXTable) and the 32-bit (ifTable) columns summed by each
+    # counter of the interface statistics, see _interface_counters()
+    _interface_counter_columns = {
+        "rx_bytes": (("hc_in_octets",), ("in_octets",)),
+        "tx_bytes": (("hc_out_octets",), ("out_octets",)),
+        "rx_packets": (
+            ("hc_in_ucast_pkts", "hc_in_multicast_pkts", "hc_in_broadcast_pkts"),
+            ("in_ucast_pkts", "in_nucast_pkts"),
+        ),
+        "tx_packets": (
+            ("hc_out_ucast_pkts", "hc_out_multicast_pkts", "hc_out_broadcast_pkts"),
+            ("out_ucast_pkts", "out_nucast_pkts"),
+        ),
+    }
+    # the counters of the statistics of the interfaces in to_dict()
+    _statistics_counters = ("rx_bytes", "tx_bytes", "rx_packets", "tx_packets")
+    # the value of ifSpeed when the speed is reported by ifHighSpeed
+    _max_if_speed = 2**32 - 1
+    # IANA ifType values reported in the interface type
+    _interface_types = {
+        "6": "ethernet",
+        "24": "loopback",
+        "157": "wireless",
+        "209": "bridge",
+    }
 
-    def __init__(self, host, community="public", agent="my-agent", port=161):
+    def __init__(
+        self,
+        host,
+        community="public",
+        agent="my-agent",
+        port=161,
+        version=1,
+        max_repetitions=None,
+        cache=None,
+        timeout=None,
+        retries=None,
+        deadline=None,
+        health=None,
+        interface_filter=None,
+        accounting=None,
+        metrics=None,
+    ):
+        if version not in (1, 2):
+            raise ValueError("version must be either 1 (SNMPv1) or 2 (SNMPv2c)")
         self.host = host
-        self.community = CommunityData(agent, community, mpModel=0)
         self.port = port
+        self._agent = agent
+        self._community = community
+        self._set_version(version)
+        if max_repetitions is not None:
+            self.max_repetitions = max_repetitions
+        if cache is not None:
+            self.cache = cache
+        if timeout is not None:
+            self.timeout = timeout
+        if retries is not None:
+            self.retries = retries
+        if deadline is not None:
+            self.deadline = deadline
+        if health is not None:
+            self.health = health
+        if interface_filter is not None:
+            self.interface_filter = interface_filter
+        if accounting is not None:
+            self.accounting = accounting
+        if metrics is not None:
+            self.metrics = metrics
+
+    def _set_version(self, version):
+        self.version = version
+        # the engine keeps the first community and model configured for an
+        # index: the devices which share it (see Poller) need an index of
+        # their own, which does not reveal the community
+        digest = hashlib.sha256(self._community.encode()).hexdigest()[:16]
+        # message processing model 0 is SNMPv1, 1 is SNMPv2c
+        self.community = CommunityData(
+            f"{self._agent}-v{version}-{digest}",
+            self._community,
+            mpModel=version - 1,
+        )
 
     def __str__(self):
         return f"<SNMP: {self.host}>"
 
-    async def _command(self, command, oid):
-        transport = await UdpTransportTarget.create((self.host, self.port))
+    def __enter__(self):
+        """
+        opens a session which shares one SNMP engine, transport
+        and event loop among all the requests until the block exits
+        """
+        if self._session is None:
+            self._session = self._open_session()
+        self._session_depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self._session_depth -= 1
+        if not self._session_depth:
+            session, self._session = self._session, None
+            session.close()
+            self._record_health(session)
+            # live values are memoized only while the session is open
+            self.memo.invalidate()
+
+    @property
+    def _memoize_live_values(self):
+        return self._session is not None
+
+    async def __aenter__(self):
+        """like ``with``, but the session runs on the current event loop"""
+        if self._session is None:
+            self._session = self._open_session(
+                engine=self.engine, loop=asyncio.get_running_loop()
+            )
+        self._session_depth += 1
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.__exit__(*exc_info)
+
+    def _open_session(self, **kwargs):
+        return SNMPSession(
+            self.host,
+            self.port,
+            timeout=self.timeout,
+            retries=self.retries,
+            deadline=self.deadline,
+            **kwargs,
+        )
+
+    def _check_health(self, session):
+        """
+        looks up the circuit of the device before the first request of the
+        session, the sessions which send none (eg: parsing a dump) leave it
+        untouched and never take the probe of a half-open circuit
+        """
+        session.health_checked = True
+        if self.health is None:
+            return
+        state = self.health.state((self.host, self.port))
+        if state == self.health.OPEN:
+            status = self.health.status((self.host, self.port))
+            session.circuit_open = CircuitOpen(
+                f"{self.host}:{self.port} failed {status['failures']} times in "
+                f"a row, next attempt in {status['retry_in']:.0f}s"
+            )
+        elif state == self.health.HALF_OPEN:
+            session.probe = True
+
+    def _record_health(self, session):
+        """records the outcome of the session in the circuit breaker"""
+        if self.health is None or session.circuit_open is not None:
+            return
+        if session.unreachable is not None:
+            self.health.record_failure((self.host, self.port))
+        elif session.responded:
+            self.health.record_success((self.host, self.port))
+
+    async def _session_error(self):
+        """
+        returns the error indication which prevents sending requests;
+        when the circuit is half-open, the requests wait for the probe
+        """
+        session = self._session
+        if not session.health_checked:
+            self._check_health(session)
+        if session.probe is True:
+            session.probe = asyncio.ensure_future(
+                self._request(get_cmd, self._probe_oid)
+            )
+        if session.probe is not None:
+            await asyncio.shield(session.probe)
+        return session.error()
+
+    def _run(self, coroutine):
+        """runs ``coroutine`` on the open session or on a temporary one"""
+        with self:
+            return self._session.run(coroutine)
+
+    def _request_key(self, *request):
+        """identifies the requests which can be coalesced"""
+        return (self.host, self.port, self._community, self.version) + request
+
+    def _cached(self, kind, oid):
+        """
+        returns the cached response of a GET of one instance, raises
+        KeyError when missing or expired
+        """
+        if self.cache is None:
+            raise KeyError(oid)
+        return self.cache.get(self._request_key(kind, oid), oid)
+
+    def _cache(self, kind, oid, response):
+        if self.cache is not None:
+            self.cache.put(self._request_key(kind, oid), oid, response)
+
+    async def _coalesced(self, request, coroutine_function, *args):
+        """
+        runs ``coroutine_function(*args)``, or awaits the result of the
+        identical ``request`` already in flight
+        """
+        if self.accounting is not None and request_method.get() is None:
+            # the task which sends a shared request runs out of the call
+            # stack of its caller, it inherits the method from the context
+            with self._requests_of(self._request_method()):
+                return await self._coalesced(request, coroutine_function, *args)
+        if not self.coalesce_requests:
+            return await coroutine_function(*args)
+        return await self._in_flight.run(
+            self._request_key(*request), self._in_session, coroutine_function, *args
+        )
+
+    async def _in_session(self, coroutine_function, *args):
+        # the session stays open until the shared request completes,
+        # even if the caller which started it is cancelled
+        async with self:
+            return await coroutine_function(*args)
+
+    async def _command(self, command, *oids):
+        return await self._coalesced((command,) + oids, self._send, command, *oids)
+
+    async def _send(self, command, *oids):
+        # fails fast once the device is unreachable or the deadline expired
+        error_indication = await self._session_error()
+        if error_indication is not None:
+            return error_indication, 0, 0, []
+        return await self._request(command, *oids)
+
+    async def _request(self, command, *oids, check=True):
+        """
+        sends the request on the open session; with ``check`` a timeout
+        makes the device unreachable for the rest of the session
+        """
+        session = self._session
+        transport = await session.transport()
+        start = time.monotonic()
         result = command(
-            SnmpEngine(),
+            session.engine,
             self.community,
             transport,
             ContextData(),
-            ObjectType(ObjectIdentity(oid)),
+            *(ObjectType(ObjectIdentity(oid)) for oid in oids),
         )
         if inspect.isawaitable(result):
-            return await result
+            try:
+                result = await session.wait(result)
+            except DeadlineExceeded as error:
+                result = error, 0, 0, []
+                self._account("get", oids, start, result)
+                return result
+        self._account("get", oids, start, result)
+        if not result[0] and self.version == 2:
+            self._v2c_answered = True
+        if check:
+            session.check_response(result[0])
         return result
 
+    @contextlib.contextmanager
+    def _requests_of(self, method):
+        """accounts the requests sent in the block to ``method``"""
+        token = request_method.set(method)
+        try:
+            yield
+        finally:
+            request_method.reset(token)
+
+    def _request_method(self):
+        """
+        returns the name of the backend method which is sending a request:
+        the one set in the context, otherwise the nearest public method of
+        the backend in the call stack which is not part of the request API,
+        otherwise the request API method which was called
+        """
+        method = request_method.get()
+        if method is not None:
+            return method
+        api_method = "unknown"
+        frame = sys._getframe(1)
+        while frame is not None:
+            name = frame.f_code.co_name
+            if (
+                not name.startswith("_")
+                and hasattr(type(self), name)
+                and frame.f_locals.get("self") is self
+            ):
+                if name not in self._request_api:
+                    return name
+                api_method = name
+            frame = frame.f_back
+        return api_method
+
+    def _account(self, kind, oids, start, result, walk=False):
+        """
+        records a request of ``oids`` which started at ``start`` and
+        returned ``result`` in the accounting and in the metrics, if any;
+        the subtree of a walked OID is the OID, the one of a GET the OID
+        without its last arc (eg: the ifTable column of an interface)
+        """
+        if self.accounting is None and self.metrics is None:
+            return
+        seconds = time.monotonic() - start
+        error_indication, error_status, _, var_binds = result
+        if self.metrics is not None:
+            self._request_metrics(kind, seconds, error_indication)
+        if self.accounting is None:
+            return
+        if not error_indication and error_status:
+            error_indication = f"SNMP error status {int(error_status)}"
+        self.accounting.record(
+            self.host,
+            kind,
+            self._request_method(),
+            [str(oid) if walk else str(oid).rpartition(".")[0] for oid in oids],
+            len(var_binds),
+            sum(self._var_bind_size(var_bind) for var_bind in var_binds),
+            seconds,
+            error_indication,
+        )
+
+    def _request_metrics(self, kind, seconds, error_indication):
+        metrics = self.metrics
+        labels = (self.host,)
+        metrics.counter(
+            "netengine_snmp_requests_total", "SNMP requests sent", ("host", "kind")
+        ).inc(labels=(self.host, kind))
+        metrics.histogram(
+            "netengine_snmp_request_seconds",
+            "Time waited for the SNMP responses, retries included",
+            ("host",),
+        ).observe(seconds, labels)
+        if isinstance(error_indication, RequestTimedOut):
+            metrics.counter(
+                "netengine_snmp_timeouts_total",
+                "SNMP requests which timed out after all their retries",
+                ("host",),
+            ).inc(labels=labels)
+        # pysnmp sends a request again after each timeout, unseen by the
+        # caller: the retries are estimated from the time waited
+        retries = min(int(seconds / self.timeout), self.retries)
+        if retries:
+            metrics.counter(
+                "netengine_snmp_retries_total",
+                "SNMP requests sent again after a timeout (estimated)",
+                ("host",),
+            ).inc(retries, labels)
+
     async def _walk(self, oid):
-        transport = await UdpTransportTarget.create((self.host, self.port))
-        result = (None, 0, 0, [])
-        async for error_indication, error_status, error_index, var_binds in walk_cmd(
-            SnmpEngine(),
+        """collects the rows of the subtree, stopping at the first error"""
+        rows = []
+        async with contextlib.aclosing(self._walk_rows(oid)) as responses:
+            async for error_indication, error_status, error_index, row in responses:
+                if error_indication or error_status:
+                    return error_indication, error_status, error_index, rows
+                rows.append(row)
+        return None, 0, 0, rows
+
+    async def _walk_rows(self, oid):
+        """
+        walks the subtree with GETBULK (SNMPv2c) or GETNEXT (SNMPv1); when
+        the first GETBULK fails, see _bulk_fallback()
+        """
+        if self.version == 2:
+            rows = 0
+            async with contextlib.aclosing(
+                self._walk_with(bulk_walk_cmd, oid, 0, self.max_repetitions)
+            ) as responses:
+                async for response in responses:
+                    error_indication = response[0]
+                    if error_indication and not rows:
+                        if await self._bulk_fallback(oid, error_indication):
+                            break
+                    self._session.check_response(error_indication)
+                    if not error_indication:
+                        self._v2c_answered = True
+                    rows += 1
+                    yield response
+                else:
+                    return
+        async with contextlib.aclosing(self._walk_with(walk_cmd, oid)) as responses:
+            async for response in responses:
+                yield response
+
+    async def _bulk_fallback(self, oid, error_indication):
+        """
+        returns whether the subtree whose first GETBULK failed is walked
+        with GETNEXT instead: an agent which never answered SNMPv2c requests
+        may be an SNMPv1 one, which silently drops them. It is probed with
+        an SNMPv2c GET: when it answers only this walk uses GETNEXT,
+        otherwise the backend falls back to SNMPv1. The failures of the
+        agents which answered SNMPv2c requests are not retried.
+        """
+        session_errors = (CircuitOpen, DeadlineExceeded, Unreachable)
+        if self._v2c_answered or isinstance(error_indication, session_errors):
+            return False
+        probe = await self._request(get_cmd, self._probe_oid, check=False)
+        if isinstance(probe[0], session_errors):
+            return False
+        if probe[0]:
+            logger.warning(
+                "%s does not answer SNMPv2c requests (%s), falling back to SNMPv1",
+                self.host,
+                error_indication,
+            )
+            self._set_version(1)
+        else:
+            logger.warning(
+                "%s failed a GETBULK request (%s), walking %s with GETNEXT",
+                self.host,
+                error_indication,
+                oid,
+            )
+        return True
+
+    async def _walk_with(self, command, oid, *args):
+        """yields the rows of the responses as they arrive"""
+        session = self._session
+        error_indication = await self._session_error()
+        if error_indication is not None:
+            yield error_indication, 0, 0, ()
+            return
+        transport = await session.transport()
+        responses = command(
+            session.engine,
             self.community,
             transport,
             ContextData(),
+            *args,
             ObjectType(ObjectIdentity(oid)),
             lexicographicMode=False,
-        ):
-            result = (error_indication, error_status, error_index, result[3])
-            if error_indication or error_status:
-                return result
-            result[3].append(var_binds)
-        return result
+        )
+        kind = "getbulk" if command is bulk_walk_cmd else "getnext"
+        # a response which leaves the subtree ends the walk; pysnmp only
+        # sends a request to find it when the last one was not a short
+        # GETBULK response, which may already include it
+        var_binds = None
+        try:
+            while True:
+                start = time.monotonic()
+                try:
+                    response = await session.wait(responses.__anext__())
+                except StopAsyncIteration:
+                    if (
+                        kind == "getnext"
+                        or var_binds is None
+                        or len(var_binds) >= args[-1]
+                    ):
+                        self._account(kind, (oid,), start, (None, 0, 0, ()), True)
+                    return
+                except DeadlineExceeded as error:
+                    self._account(kind, (oid,), start, (error, 0, 0, ()), True)
+                    yield error, 0, 0, ()
+                    return
+                self._account(kind, (oid,), start, response, True)
+                error_indication, error_status, error_index, var_binds = response
+                # the GETBULK responses are checked by _walk_rows(), the
+                # timeouts may be caused by v1-only agents
+                if command is not bulk_walk_cmd:
+                    session.check_response(error_indication)
+                if error_indication or error_status:
+                    yield error_indication, error_status, error_index, ()
+                    return
+                if command is bulk_walk_cmd:
+                    # GETBULK responses carry several rows, one varbind per row
+                    for var_bind in var_binds:
+                        yield None, 0, 0, (var_bind,)
+                else:
+                    yield None, 0, 0, var_binds
+        finally:
+            # stops the requests when the caller stops iterating early
+            await responses.aclose()
+
+    async def _get_many(self, oids):
+        """runs get_many(), the session must be open"""
+        results = {}
+        missing = []
+        for oid in oids:
+            if not oid:
+                # an empty OID is not available, it would not even be encoded
+                continue
+            try:
+                results[oid] = self._cached("get", oid)[1]
+            except KeyError:
+                missing.append(oid)
+        for batch in self._get_batches(missing):
+            await self._get_batch(batch, results)
+        return self._dict((oid, results.get(oid)) for oid in oids)
+
+    def _get_batches(self, oids):
+        """splits ``oids`` in batches which fit in a single GET request"""
+        for batch in self._group_batches([(oid,) for oid in oids]):
+            yield [oid for oid, in batch]
+
+    def _group_batches(self, groups, fixed=()):
+        """
+        splits ``groups`` of OIDs in batches which fit in a single GET request
+        together with the ``fixed`` OIDs, never splitting a group
+        """
+        # message and PDU headers
+        available = self.max_message_size - 64 - len(self._community)
+        available -= sum(self._varbind_size(oid) for oid in fixed)
+        batch = []
+        varbinds = len(fixed)
+        size = 0
+        for group in groups:
+            group_size = sum(self._varbind_size(oid) for oid in group)
+            if batch and (
+                varbinds + len(group) > self.max_get_varbinds
+                or size + group_size > available
+            ):
+                yield batch
+                batch = []
+                varbinds = len(fixed)
+                size = 0
+            batch.append(group)
+            varbinds += len(group)
+            size += group_size
+        if batch:
+            yield batch
+
+    def _varbind_size(self, oid):
+        # encoded OID arcs, varbind headers and an estimate of the value
+        return oid.count(".") + 5 + self._varbind_value_size
+
+    async def _get_batch(self, oids, results):
+        logger.info("SNMP GET %s OIDs starting from %s", len(oids), oids[0])
+        error_indication, error_status, error_index, var_binds = await self._command(
+            get_cmd, *oids
+        )
+        if error_indication:
+            raise NetEngineError(str(error_indication))
+        error_status = int(error_status)
+        # tooBig: retry splitting the batch in two halves, a single
+        # OID whose value does not fit is reported as not available
+        if error_status == 1:
+            if len(oids) > 1:
+                half = len(oids) // 2
+                await self._get_batch(oids[:half], results)
+                await self._get_batch(oids[half:], results)
+            return
+        # noSuchName (SNMPv1): retry without the OID which is not available
+        if error_status == 2 and error_index:
+            remaining = list(oids)
+            del remaining[int(error_index) - 1]
+            if remaining:
+                await self._get_batch(remaining, results)
+            return
+        if error_status:
+            raise NetEngineError(f"SNMP error status {error_status}")
+        for oid, var_bind in zip(oids, var_binds):
+            # noSuchObject, noSuchInstance and endOfMibView are Null subclasses
+            value = var_bind[1]
+            if isinstance(value, Null):
+                results[oid] = None
+            else:
+                results[oid] = value
+                self._cache("get", oid, var_bind)
 
     def _octet_to_mac(self, octet_mac):
         """Return a MAC address from an SNMP octet string."""
@@ -98,26 +733,394 @@ class SNMP(BaseBackend):
             return oid.replace(" ", "").replace(",", ".")
         return ".".join(str(element) for element in oid)
 
+    def _select_fields(self, fields):
+        """
+        returns a dict which maps the sections selected by ``fields``
+        to the set of their selected keys, or to None when all of them are
+        selected; returns None when ``fields`` is None (all the sections)
+        """
+        if fields is None:
+            return None
+        if isinstance(fields, str):
+            raise ValueError("fields must be a list of strings")
+        sections = {name.partition(".")[0] for name in self._field_oids}
+        selection = {}
+        for field in fields:
+            section, _, key = field.partition(".")
+            if field not in self._field_oids and field not in sections:
+                raise ValueError(
+                    f"unknown field {field!r}, the fields are: "
+                    + ", ".join(self._field_oids)
+                )
+            if not key:
+                selection[section] = None
+            elif selection.get(section, ()) is not None:
+                selection.setdefault(section, set()).add(key)
+        return selection
+
+    def _autowalk_plan(self, fields=None):
+        """
+        returns the subtrees, the optional subtrees and the scalars
+        collected by autowalk to serialize ``fields`` (all when None)
+        """
+        selection = self._select_fields(fields)
+        plan = (
+            self._autowalk_subtrees,
+            self._optional_autowalk_subtrees,
+            self._autowalk_scalars,
+        )
+        if selection is None:
+            return plan
+        oids = set()
+        for name, field_oids in self._field_oids.items():
+            section, _, key = name.partition(".")
+            if section in selection and (
+                not key or selection[section] is None or key in selection[section]
+            ):
+                oids.update(field_oids)
+        return tuple(tuple(oid for oid in part if oid in oids) for part in plan)
+
+    def _autowalk(self, partial=False, fields=None):
+        """
+        collects the subtrees and scalars read by to_dict() in a single dump;
+        with ``partial`` the data which cannot be collected is left out and
+        with ``fields`` only the data read by those fields is collected
+        """
+        return self._run(self._aautowalk(partial=partial, fields=fields))
+
+    async def _aautowalk(self, partial=False, fields=None):
+        with self._requests_of("autowalk"):
+            return await self._acollect(partial=partial, fields=fields)
+
+    async def _acollect(self, partial=False, fields=None):
+        """collects the autowalk plan, see _autowalk()"""
+        semaphore = asyncio.Semaphore(self.autowalk_concurrency)
+
+        async def limited(coroutine):
+            async with semaphore:
+                return await coroutine
+
+        required, optional, scalars = self._autowalk_plan(fields)
+        # the deferred columns are optional when they all were in the plan
+        deferred_optional = set(optional)
+        required, optional, deferred = self._filter_autowalk_plan(required, optional)
+        deferred_optional = deferred_optional.issuperset(deferred)
+        subtrees = required + optional
+        async with self:
+            scalars, *walks = await asyncio.gather(
+                limited(self.aget_many(scalars)),
+                *(limited(self.awalk(subtree)) for subtree in subtrees),
+                return_exceptions=True,
+            )
+            snmpdump = SnmpDump()
+            for subtree, walk in zip(subtrees, walks):
+                if isinstance(walk, NetEngineError) and (
+                    partial or subtree in optional
+                ):
+                    logger.warning("Unable to collect optional SNMP data: %s", walk)
+                    if partial:
+                        # the sections which read it fail instead of being empty
+                        snmpdump.failed[subtree] = str(walk)
+                    continue
+                if isinstance(walk, BaseException):
+                    raise walk
+                snmpdump.update(walk)
+            self._add_scalars(snmpdump, scalars, partial)
+            if deferred:
+                # the columns of the selected interfaces only
+                try:
+                    indexes = self._interface_indexes(snmpdump=snmpdump)
+                    oids = [f"{oid}.{index}" for oid in deferred for index in indexes]
+                    values = await self.aget_many(oids)
+                except NetEngineError as error:
+                    values = error
+                    if partial:
+                        snmpdump.failed.update(dict.fromkeys(deferred, str(error)))
+                self._add_scalars(snmpdump, values, partial or deferred_optional)
+        return snmpdump
+
+    def _add_scalars(self, snmpdump, values, partial):
+        """adds the values returned by aget_many(), or raises its error"""
+        if isinstance(values, NetEngineError) and partial:
+            logger.warning("Unable to collect optional SNMP data: %s", values)
+            return
+        if isinstance(values, BaseException):
+            raise values
+        for oid, value in values.items():
+            if value is not None:
+                snmpdump.add(oid, value)
+
+    def _filter_autowalk_plan(self, required, optional):
+        """
+        returns the subtrees and optional subtrees walked with the
+        interface_filter and the interface columns, required or optional,
+        which are requested afterwards, only for the interfaces it selects;
+        the columns read by the filter are walked (optionally, when not in
+        the plan)
+        """
+        column_oids = set(self._interface_column_oids.values())
+        if self.interface_filter is None or not column_oids & {*required, *optional}:
+            return required, optional, ()
+        filter_oids = [
+            self._interface_column_oids[column]
+            for column in self.interface_filter.columns
+        ]
+        deferred = tuple(
+            oid
+            for oid in required + optional
+            if oid in column_oids and oid not in filter_oids
+        )
+        required = tuple(oid for oid in required if oid not in deferred)
+        optional = tuple(oid for oid in optional if oid not in deferred)
+        optional += tuple(oid for oid in filter_oids if oid not in required + optional)
+        return required, optional, deferred
+
+    def explain(self, fields=None, snmpdump=None):
+        """
+        Returns the requests which to_dict() (autowalk) plans to send, without
+        sending them: a dict for each walk and GET with its ``kind``
+        ("walk" or "get"), its ``oids``, whether it is ``optional`` and the
+        number of ``requests`` (PDUs) it takes; the requests of the walks, and
+        the GET of the interface columns deferred by the interface_filter,
+        depend on the size of the tables and are estimated from ``snmpdump``
+        (eg: the dump of a previous poll), otherwise they are None.
+        """
+        if isinstance(snmpdump, dict):
+            snmpdump = SnmpDump(snmpdump)
+        required, optional, scalars = self._autowalk_plan(fields)
+        deferred_optional = set(optional)
+        required, optional, deferred = self._filter_autowalk_plan(required, optional)
+        deferred_optional = deferred_optional.issuperset(deferred)
+        plan = []
+        for subtree in required + optional:
+            requests = None
+            if snmpdump is not None:
+                requests = self._walk_requests(len(snmpdump.oids(subtree)))
+            plan.append(
+                self._dict(
+                    kind="walk",
+                    oids=[subtree],
+                    optional=subtree in optional,
+                    requests=requests,
+                )
+            )
+        batches = [list(deferred)] if deferred and snmpdump is None else []
+        if deferred and snmpdump is not None:
+            indexes = self._interface_indexes(snmpdump=snmpdump)
+            oids = [f"{oid}.{index}" for oid in deferred for index in indexes]
+            batches = list(self._get_batches(oids))
+        for batch in list(self._get_batches(list(scalars))) + batches:
+            plan.append(
+                self._dict(
+                    kind="get",
+                    oids=batch,
+                    optional=batch[0] in deferred and deferred_optional,
+                    requests=None if batch[0] in deferred else 1,
+                )
+            )
+        return plan
+
+    def _walk_requests(self, rows):
+        """
+        the requests which walk a subtree of ``rows`` OIDs, the last one
+        finds the end of the subtree
+        """
+        if self.version == 2:
+            return rows // self.max_repetitions + 1
+        return rows + 1
+
+    def to_dict(self, autowalk=True, snmpdump=None, partial=False, fields=None):
+        """
+        returns the NetJSON DeviceMonitoring of the device; with ``partial``
+        the sections which cannot be collected are left out instead of
+        raising NetEngineError; ``fields`` selects the sections ("interfaces")
+        or their keys ("interfaces.statistics") which are collected
+        """
+        with self:
+            self.memo.invalidate()
+            if snmpdump is None and autowalk:
+                snmpdump = self._autowalk(partial=partial, fields=fields)
+            elif isinstance(snmpdump, dict):
+                # indexes the OIDs once instead of scanning them at every lookup
+                snmpdump = SnmpDump(snmpdump)
+            return self._sections_to_dict(
+                {
+                    name: getattr(self, method)
+                    for name, method in self._sections.items()
+                },
+                snmpdump=snmpdump,
+                partial=partial,
+                fields=fields,
+            )
+
+    async def ato_dict(self, autowalk=True, snmpdump=None, partial=False, fields=None):
+        """
+        Awaitable counterpart of to_dict(): the SNMP requests of autowalk
+        run on the current event loop, the dump is then parsed in place
+        """
+        if snmpdump is None and not autowalk:
+            # every value is requested separately by the synchronous API, in a
+            # worker thread where a copy of the device opens its own session
+            return await asyncio.to_thread(
+                self._detached().to_dict,
+                autowalk=False,
+                partial=partial,
+                fields=fields,
+            )
+        if snmpdump is None:
+            snmpdump = await self._aautowalk(partial=partial, fields=fields)
+        return self.to_dict(
+            autowalk=False, snmpdump=snmpdump, partial=partial, fields=fields
+        )
+
+    def _detached(self):
+        """
+        returns a copy of the device which does not share the open
+        session, bound to an event loop, nor the memoized values
+        """
+        device = copy.copy(self)
+        device._session = None
+        device._session_depth = 0
+        device._memo = None
+        return device
+
+    def _sections_to_dict(self, sections, snmpdump=None, partial=False, fields=None):
+        """
+        returns the DeviceMonitoring dict of the ``sections``, which map
+        each key to the method returning its value; with ``partial`` the
+        sections which cannot be collected are left out, with ``fields``
+        only the selected sections and keys are computed; raises
+        NetEngineError when the device did not answer any request
+        """
+        selection = self._select_fields(fields)
+        result = self._dict(type="DeviceMonitoring")
+        for name, section in sections.items():
+            if selection is not None and name not in selection:
+                continue
+            keys = None if selection is None else selection[name]
+            start = time.monotonic()
+            try:
+                with self._requests_of(getattr(section, "__name__", name)):
+                    if keys is None:
+                        result[name] = section(snmpdump=snmpdump)
+                    else:
+                        result[name] = section(snmpdump=snmpdump, fields=keys)
+            except Exception as exc:
+                if not partial:
+                    raise
+                logger.warning("Unable to collect %s of %s: %s", name, self.host, exc)
+            if self.metrics is not None:
+                self.metrics.histogram(
+                    "netengine_section_seconds",
+                    "Time spent computing the sections of to_dict()",
+                    ("backend", "section"),
+                ).observe(time.monotonic() - start, (type(self).__name__, name))
+        session = self._session
+        if session is not None and session.health_checked and not session.responded:
+            # the requests failed before the device answered any of them,
+            # the values of the sections were not collected but left empty
+            error = session.error()
+            if error is not None:
+                raise NetEngineError(str(error))
+        return result
+
     def walk(self, oid):
         """Retrieve an SNMP subtree in the format consumed by dump-backed calls."""
-        result = {}
-        error_indication, error_status, _, var_binds_list = self.next(oid)
-        if error_indication:
-            raise NetEngineError(error_indication)
-        if error_status:
-            raise NetEngineError(error_status)
-        for var_binds in var_binds_list:
-            for var_bind in var_binds:
-                result[str(var_bind[0])] = [None, None, None, [var_bind]]
-        return result
+        return self._run(self.awalk(oid))
+
+    async def awalk(self, oid):
+        """
+        Awaitable counterpart of walk(); concurrent walks of the same
+        subtree share the returned dump, which must not be modified
+        """
+        oid = self._oid(oid)
+        # subtrees are not cached: their rows change when interfaces
+        # appear or their indexes are reused after a reboot
+        return await self._coalesced(("walk", oid), self._awalk, oid)
+
+    async def _awalk(self, oid):
+        dump = SnmpDump()
+        async with contextlib.aclosing(self.aiter_walk(oid)) as var_binds:
+            async for var_bind in var_binds:
+                dump.add(var_bind[0], var_bind[1])
+        if self.metrics is not None:
+            self.metrics.histogram(
+                "netengine_snmp_walk_varbinds",
+                "Varbinds of the walked subtrees",
+                buckets=self._walk_buckets,
+            ).observe(len(dump))
+        return dump
+
+    def iter_walk(self, oid, max_oids=None, max_bytes=None):
+        """
+        Yields the varbinds of an SNMP subtree as the responses arrive,
+        stopping after ``max_oids`` varbinds or when their estimated size
+        exceeds ``max_bytes``; errors raise NetEngineError.
+        """
+        with self:
+            walk = self.aiter_walk(oid, max_oids=max_oids, max_bytes=max_bytes)
+            try:
+                while True:
+                    try:
+                        yield self._session.run(walk.__anext__())
+                    except StopAsyncIteration:
+                        return
+            finally:
+                self._session.run(walk.aclose())
+
+    async def aiter_walk(self, oid, max_oids=None, max_bytes=None):
+        """Awaitable counterpart of iter_walk()."""
+        oid = self._oid(oid)
+        logger.info("SNMP NEXT %s", oid)
+        count = size = 0
+        async with self, contextlib.aclosing(self._walk_rows(oid)) as rows:
+            async for error_indication, error_status, _, row in rows:
+                if error_indication:
+                    raise NetEngineError(str(error_indication))
+                if error_status:
+                    raise NetEngineError(f"SNMP error status {error_status}")
+                for var_bind in row:
+                    count += 1
+                    size += self._var_bind_size(var_bind)
+                    if max_oids is not None and count > max_oids:
+                        return
+                    if max_bytes is not None and size > max_bytes:
+                        return
+                    yield var_bind
+
+    def _var_bind_size(self, var_bind):
+        """estimates the size of a varbind, as in _get_batches()"""
+        value = var_bind[1]
+        if isinstance(value, (bytes, str, OctetString)):
+            value_size = len(value)
+        else:
+            value_size = 5
+        return str(var_bind[0]).count(".") + 5 + value_size
 
     def get(self, oid, snmpdump=None):
         """Execute an SNMP GET request or read its value from an SNMP dump."""
         oid = self._oid(oid)
         if snmpdump is not None:
             return snmpdump.get(oid, [None, None, None, [[None, ""]]])
+        return self._run(self.aget(oid))
+
+    async def aget(self, oid, snmpdump=None):
+        """Awaitable counterpart of get()."""
+        oid = self._oid(oid)
+        if snmpdump is not None:
+            return self.get(oid, snmpdump=snmpdump)
+        try:
+            return None, 0, 0, [self._cached("get", oid)]
+        except KeyError:
+            pass
         logger.info("SNMP GET %s", oid)
-        return asyncio.run(self._command(get_cmd, oid))
+        async with self:
+            result = await self._command(get_cmd, oid)
+        error_indication, error_status, _, var_binds = result
+        if not error_indication and not error_status and var_binds:
+            if not isinstance(var_binds[0][1], Null):
+                self._cache("get", oid, var_binds[0])
+        return result
 
     def next(self, oid, snmpdump=None):
         """Execute an SNMP walk request or read its values from an SNMP dump."""
@@ -133,23 +1136,446 @@ class SNMP(BaseBackend):
                 )
             )
             return [None, 0, 0, [item[1][3] for item in items]]
+        return self._run(self.anext_walk(oid))
+
+    def _check_collected(self, oid, snmpdump):
+        """raises NetEngineError when autowalk could not collect ``oid``"""
+        if isinstance(snmpdump, SnmpDump):
+            error = snmpdump.failure(oid)
+            if error is not None:
+                raise NetEngineError(error)
+
+    def _next_rows(self, oid, snmpdump=None):
+        """returns the rows of next(), raises NetEngineError when the walk fails"""
+        self._check_collected(oid, snmpdump)
+        error_indication, error_status, _, rows = self.next(oid, snmpdump=snmpdump)
+        if error_indication:
+            raise NetEngineError(str(error_indication))
+        if error_status:
+            raise NetEngineError(f"SNMP error status {error_status}")
+        return rows
+
+    async def anext_walk(self, oid, snmpdump=None):
+        """Awaitable counterpart of next()."""
+        oid = self._oid(oid)
+        if snmpdump is not None:
+            return self.next(oid, snmpdump=snmpdump)
         logger.info("SNMP NEXT %s", oid)
-        return asyncio.run(self._walk(oid))
+        async with self:
+            return await self._coalesced(("next", oid), self._walk, oid)
+
+    def get_many(self, oids, snmpdump=None):
+        """
+        Execute SNMP GET requests packing many OIDs in each of them, or read
+        the values from an SNMP dump; returns an ordered dict which maps every
+        OID to its value, or to None when the OID is not available
+        """
+        oids = [self._oid(oid) for oid in oids]
+        if snmpdump is not None:
+            missing = [None, None, None, [[None, None]]]
+            return self._dict(
+                (oid, snmpdump.get(oid, missing)[3][0][1]) for oid in oids
+            )
+        if not oids:
+            return self._dict()
+        return self._run(self.aget_many(oids))
+
+    async def aget_many(self, oids, snmpdump=None):
+        """Awaitable counterpart of get_many()."""
+        oids = [self._oid(oid) for oid in oids]
+        if snmpdump is not None or not oids:
+            return self.get_many(oids, snmpdump=snmpdump)
+        async with self:
+            return await self._get_many(oids)
+
+    def get_values(self, oids, snmpdump=None):
+        """Like get_many() but values are strings, empty when not available."""
+        return self._values_to_str(self.get_many(oids, snmpdump=snmpdump))
+
+    async def aget_values(self, oids, snmpdump=None):
+        """Awaitable counterpart of get_values()."""
+        return self._values_to_str(await self.aget_many(oids, snmpdump=snmpdump))
+
+    def _values_to_str(self, values):
+        return self._dict(
+            (oid, "" if value is None else self._value_to_str(value))
+            for oid, value in values.items()
+        )
 
     def get_value(self, oid, snmpdump=None):
         """Return the OID value or raise NetEngineError."""
-        result = self.get(oid, snmpdump=snmpdump)
+        return self._result_to_str(self.get(oid, snmpdump=snmpdump))
+
+    async def aget_value(self, oid, snmpdump=None):
+        """Awaitable counterpart of get_value()."""
+        return self._result_to_str(await self.aget(oid, snmpdump=snmpdump))
+
+    def _result_to_str(self, result):
         try:
-            value = result[3][0][1]
-            return value.decode("latin-1") if isinstance(value, bytes) else str(value)
+            return self._value_to_str(result[3][0][1])
         except IndexError as exc:
             raise NetEngineError(str(result[0])) from exc
 
+    def _value_to_str(self, value):
+        return value.decode("latin-1") if isinstance(value, bytes) else str(value)
+
+    def _fields_to_dict(self, methods, snmpdump=None, fields=None):
+        """
+        returns a dict with the values returned by the ``methods``
+        selected by ``fields`` (all when None), calling only those
+        """
+        return self._dict(
+            (key, method(snmpdump=snmpdump))
+            for key, method in methods.items()
+            if fields is None or key in fields
+        )
+
+    def _interface_columns(self, columns, snmpdump=None):
+        """
+        returns a dict which maps every requested ifTable/ifXTable column
+        to the values of the interfaces keyed by ifIndex; values are strings
+        as returned by get_values() and the columns which were not read from
+        the same dump yet are retrieved together, in a single pass; with an
+        interface_filter only the selected interfaces are returned and read
+        """
+        indexes = self._interface_indexes(snmpdump=snmpdump)
+        table = self._read_interface_columns(columns, indexes, snmpdump=snmpdump)
+        if self.interface_filter is None:
+            return {column: table[column] for column in columns}
+        return {
+            column: {index: table[column][index] for index in indexes}
+            for column in columns
+        }
+
+    def _counter_passes(self, counters, snmpdump=None):
+        """
+        returns the columns summed by each of the ``counters`` in the passes
+        of _interface_counters(): the 64-bit ones and then the 32-bit ones,
+        only the latter when read live with SNMPv1, which does not support
+        64-bit values
+        """
+        positions = (1,) if snmpdump is None and self.version == 1 else (0, 1)
+        return [
+            {
+                counter: self._interface_counter_columns[counter][position]
+                for counter in counters
+            }
+            for position in positions
+        ]
+
+    def _interface_counters(self, counters, snmpdump=None):
+        """
+        returns the ``counters`` (eg: rx_bytes) of the interfaces keyed by
+        ifIndex, summing the 64-bit ifXTable columns and, for the values
+        which are not available, the 32-bit ifTable ones; the counters which
+        are not available at all are left out
+        """
+        return {
+            index: values
+            for index, (values, _) in self._interface_counters_and_bits(
+                counters, snmpdump=snmpdump
+            ).items()
+        }
+
+    def _interface_counters_and_bits(self, counters, snmpdump=None):
+        """
+        like _interface_counters(), but maps each ifIndex to its counters
+        and their width (64 or 32), None when they are not all read from
+        the same table or none is available
+        """
+        values = {counter: {} for counter in counters}
+        bits = {counter: {} for counter in counters}
+        passes = self._counter_passes(counters, snmpdump=snmpdump)
+        for position, sums in enumerate(passes):
+            width = 32 if position == len(passes) - 1 else 64
+            names = [name for column_names in sums.values() for name in column_names]
+            columns = self._interface_columns(
+                ["descr", *dict.fromkeys(names)], snmpdump=snmpdump
+            )
+            indexes = list(columns["descr"])
+            for counter, column_names in sums.items():
+                for index in indexes:
+                    row = [columns[name][index] for name in column_names]
+                    if index not in values[counter] and "" not in row:
+                        values[counter][index] = sum(int(value) for value in row)
+                        bits[counter][index] = width
+            if all(len(values[counter]) == len(indexes) for counter in counters):
+                break
+        results = {}
+        for index in indexes:
+            widths = {
+                bits[counter][index] for counter in counters if index in bits[counter]
+            }
+            results[index] = (
+                {
+                    counter: values[counter][index]
+                    for counter in counters
+                    if index in values[counter]
+                },
+                widths.pop() if len(widths) == 1 else None,
+            )
+        return results
+
+    def interfaces_to_dict(self, snmpdump=None, fields=None):
+        """
+        Returns an ordered dict with all the information available about the
+        interface, or with its name and the keys in ``fields``
+        """
+        keys = [key for key in self._interface_keys if fields is None or key in fields]
+        columns = ["descr"]
+        for key in keys:
+            columns.extend(self._interface_keys[key])
+        if "statistics" in keys:
+            # the counters are read in the same pass
+            first_pass = self._counter_passes(self._statistics_counters, snmpdump)[0]
+            for counter_columns in first_pass.values():
+                columns.extend(counter_columns)
+        columns = self._interface_columns(columns, snmpdump=snmpdump)
+        if "statistics" in keys:
+            statistics = self._interface_counters_and_bits(
+                self._statistics_counters, snmpdump=snmpdump
+            )
+        if "type" in keys:
+            wireless_if = self.get_wireless_interfaces(snmpdump=snmpdump)
+        if "addresses" in keys:
+            addresses = self.interface_addr_and_mask(snmpdump=snmpdump)
+        results = []
+        for index, name in columns["descr"].items():
+            if not name:
+                continue
+            result = self._dict(name=name)
+            for key in keys:
+                if key == "mac":
+                    result["mac"] = self._octet_to_mac(columns["mac"][index])
+                elif key == "type":
+                    if name in wireless_if:
+                        result["type"] = "wireless"
+                    else:
+                        result["type"] = self._interface_types.get(
+                            columns["type"][index], "unknown"
+                        )
+                elif key == "up":
+                    result["up"] = int(columns["oper_status"][index]) == 1
+                elif key == "mtu":
+                    result["mtu"] = int(columns["mtu"][index])
+                elif key == "addresses":
+                    result["addresses"] = addresses.get(index, [])
+                elif key == "statistics":
+                    # the width tells the rates of the wrapped counters from
+                    # their resets
+                    result["statistics"], result["counter_bits"] = statistics[index]
+            results.append(result)
+        return results
+
+    def counters_snapshot(self):
+        """
+        Returns a sample of the counters of each interface: the counters
+        (eg: rx_bytes, see to_dict()) of a batch of interfaces are read in a
+        single GET request together with sysUpTime, so that every sample
+        carries the ``uptime`` (seconds) measured by the agent and the local
+        monotonic time at which the response was ``received``; ``bits`` is
+        the width of the counters (64 or 32)
+        """
+        return self._run(self.acounters_snapshot())
+
+    async def acounters_snapshot(self):
+        """Awaitable counterpart of counters_snapshot()."""
+        with self._requests_of("counters_snapshot"):
+            return await self._acounters_snapshot()
+
+    async def _acounters_snapshot(self):
+        async with self:
+            snmpdump = await self._awalk_interface_names()
+            names = self._interface_columns(("descr",), snmpdump=snmpdump)["descr"]
+            pending = [index for index, name in names.items() if name]
+            samples = {}
+            passes = self._counter_passes(self._statistics_counters)
+            for position, sums in enumerate(passes):
+                last = position == len(passes) - 1
+                for index, uptime, received, counters in await self._snapshot(
+                    sums, pending
+                ):
+                    # the interfaces which lack some 64-bit counters are
+                    # sampled again with the 32-bit ones
+                    if len(counters) < len(sums) and not last:
+                        continue
+                    samples[index] = self._dict(
+                        name=names[index],
+                        uptime=uptime,
+                        received=received,
+                        bits=32 if last else 64,
+                        counters=counters,
+                    )
+                pending = [index for index in pending if index not in samples]
+                if not pending:
+                    break
+        return [samples[index] for index in names if index in samples]
+
+    async def _snapshot(self, sums, indexes):
+        """
+        reads the columns summed by each counter of ``sums`` for the
+        ``indexes``, in batches which include sysUpTime; returns the
+        ``(index, uptime, received, counters)`` of each interface
+        """
+        oids = {
+            column: self._interface_column_oids[column]
+            for column_names in sums.values()
+            for column in column_names
+        }
+        groups = {
+            tuple(f"{oid}.{index}" for oid in oids.values()): index for index in indexes
+        }
+        semaphore = asyncio.Semaphore(self.autowalk_concurrency)
+
+        async def limited(batch):
+            async with semaphore:
+                return await self._snapshot_batch(
+                    [(groups[group], group) for group in batch]
+                )
+
+        batches = await asyncio.gather(
+            *(
+                limited(batch)
+                for batch in self._group_batches(groups, fixed=(self._uptime_oid,))
+            )
+        )
+        samples = []
+        for index, uptime, received, values in (
+            sample for batch in batches for sample in batch
+        ):
+            counters = {}
+            for counter, column_names in sums.items():
+                row = [values.get(f"{oids[name]}.{index}") for name in column_names]
+                if None not in row:
+                    counters[counter] = sum(int(value) for value in row)
+            samples.append((index, uptime, received, counters))
+        return samples
+
+    async def _snapshot_batch(self, groups):
+        """
+        GETs sysUpTime and the OIDs of the ``(index, oids)`` groups in a
+        single request, returns the ``(index, uptime, received, values)``
+        of each group
+        """
+        oids = [oid for _, group in groups for oid in group]
+        logger.info("SNMP GET snapshot of %s interfaces", len(groups))
+        error_indication, error_status, error_index, var_binds = await self._command(
+            get_cmd, self._uptime_oid, *oids
+        )
+        received = time.monotonic()
+        if error_indication:
+            raise NetEngineError(str(error_indication))
+        error_status = int(error_status)
+        # tooBig: retry splitting the interfaces in two halves
+        if error_status == 1 and len(groups) > 1:
+            half = len(groups) // 2
+            first = await self._snapshot_batch(groups[:half])
+            return first + await self._snapshot_batch(groups[half:])
+        # noSuchName (SNMPv1): retry without the OID which is not available
+        if error_status == 2 and int(error_index) > 1:
+            missing = oids[int(error_index) - 2]
+            return await self._snapshot_batch(
+                [
+                    (index, tuple(oid for oid in group if oid != missing))
+                    for index, group in groups
+                ]
+            )
+        if error_status:
+            raise NetEngineError(f"SNMP error status {error_status}")
+        uptime = int(var_binds[0][1]) / 100
+        values = {
+            oid: var_bind[1]
+            for oid, var_bind in zip(oids, var_binds[1:])
+            # noSuchObject, noSuchInstance and endOfMibView are Null subclasses
+            if not isinstance(var_bind[1], Null)
+        }
+        return [(index, uptime, received, values) for index, _ in groups]
+
+    async def _awalk_interface_names(self):
+        """walks the ifIndexes and the columns read by the interface_filter"""
+        columns = ["descr"]
+        if self.interface_filter is not None:
+            columns = self.interface_filter.columns
+        subtrees = [self._oid_to_retrieve.rstrip(".")] + [
+            self._interface_column_oids[column] for column in columns
+        ]
+        walks = await asyncio.gather(
+            *(self.awalk(subtree) for subtree in subtrees), return_exceptions=True
+        )
+        snmpdump = SnmpDump()
+        for position, walk in enumerate(walks):
+            # the other columns of the filter (eg: ifName) are optional
+            if isinstance(walk, NetEngineError) and position > 1:
+                logger.warning("Unable to collect optional SNMP data: %s", walk)
+                continue
+            if isinstance(walk, BaseException):
+                raise walk
+            snmpdump.update(walk)
+        return snmpdump
+
+    def _interface_speed(self, speed, high_speed):
+        """returns the speed in bps, from ifHighSpeed (Mbps) when ifSpeed is saturated"""
+        speed = int(speed)
+        if speed == self._max_if_speed and high_speed:
+            return int(high_speed) * 1000000
+        return speed
+
+    @memoize
+    def _interface_indexes(self, snmpdump=None):
+        """the ifIndexes of the interfaces selected by the interface_filter"""
+        indexes = self._value_to_retrieve(snmpdump=snmpdump)
+        if self.interface_filter is None:
+            return indexes
+        table = self._read_interface_columns(
+            self.interface_filter.columns, indexes, snmpdump=snmpdump
+        )
+        return self.interface_filter.indexes(table)
+
+    def _read_interface_columns(self, columns, indexes, snmpdump=None):
+        """reads the missing ``columns`` of the ``indexes`` in the interface table"""
+        table = self._interface_table(snmpdump=snmpdump)
+        missing = [column for column in columns if column not in table]
+        if isinstance(snmpdump, SnmpDump):
+            # each column is a contiguous range of the sorted dump
+            for column in missing:
+                self._check_collected(self._interface_column_oids[column], snmpdump)
+                values = snmpdump.column(self._interface_column_oids[column])
+                table[column] = {
+                    index: (
+                        self._value_to_str(values[(index,)])
+                        if (index,) in values
+                        else ""
+                    )
+                    for index in indexes
+                }
+        elif missing:
+            oids = self._interface_column_oids
+            values = self.get_values(
+                [f"{oids[column]}.{index}" for column in missing for index in indexes],
+                snmpdump=snmpdump,
+            )
+            for column in missing:
+                table[column] = {
+                    index: values[f"{oids[column]}.{index}"] for index in indexes
+                }
+        return table
+
+    @memoize
+    def _interface_table(self, snmpdump=None):
+        """the columns read by _interface_columns(), filled as they are read"""
+        return {}
+
+    @memoize
     def _value_to_retrieve(self, snmpdump=None):
         """Return the interface indexes used by backend-specific methods."""
         if self._oid_to_retrieve is None:
             raise NetEngineError(
                 "Please fix properly the _oid_to_retrieve string in OpenWRT or AirOS SNMP backend"
             )
-        indexes = self.next(self._oid_to_retrieve, snmpdump=snmpdump)[3]
+        if isinstance(snmpdump, SnmpDump):
+            self._check_collected(self._oid_to_retrieve, snmpdump)
+            return [
+                int(index) for index in snmpdump.column(self._oid_to_retrieve).values()
+            ]
+        indexes = self._next_rows(self._oid_to_retrieve, snmpdump=snmpdump)
         return [int(index[0][1]) for index in indexes]
@@ -0,0 +1,124 @@
+"""NetEngine cache of SNMP responses"""
+
+__all__ = ["ResponseCache"]
+
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResponseCache(object):
+    """
+    Caches the SNMP responses for a time (TTL) which depends on the
+    requested OID: the TTL of an OID is the one of its longest prefix
+    found in ``ttls``, or ``default_ttl``; responses whose TTL is zero are
+    not cached. When ``maxsize`` responses are cached the least recently
+    used is evicted. A cache can be shared by many devices.
+    """
+
+    # one hour for the identity and inventory OIDs, which rarely change
+    inventory_ttl = 3600
+    default_ttls = {
+        # sysDescr, sysObjectID, sysName
+        "1.3.6.1.2.1.1.1": inventory_ttl,
+        "1.3.6.1.2.1.1.2": inventory_ttl,
+        "1.3.6.1.2.1.1.5": inventory_ttl,
+        # ifTable: ifDescr, ifType, ifMtu, ifSpeed, ifPhysAddress
+        "1.3.6.1.2.1.2.2.1.2": inventory_ttl,
+        "1.3.6.1.2.1.2.2.1.3": inventory_ttl,
+        "1.3.6.1.2.1.2.2.1.4": inventory_ttl,
+        "1.3.6.1.2.1.2.2.1.5": inventory_ttl,
+        "1.3.6.1.2.1.2.2.1.6": inventory_ttl,
+        # ifXTable: ifName, ifHighSpeed
+        "1.3.6.1.2.1.31.1.1.1.1": inventory_ttl,
+        "1.3.6.1.2.1.31.1.1.1.15": inventory_ttl,
+        # IEEE 802.11 MIB product name and version (AirOS model and firmware)
+        "1.2.840.10036.3.1.2.1.3": inventory_ttl,
+        "1.2.840.10036.3.1.2.1.4": inventory_ttl,
+    }
+
+    def __init__(self, ttls=None, default_ttl=0, maxsize=10000, clock=time.monotonic):
+        """
+        ``ttls`` maps OID prefixes to TTLs in seconds, it extends (and
+        overrides) ``default_ttls``; ``clock`` returns the current time
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be a positive number")
+        self.ttls = dict(self.default_ttls)
+        if ttls:
+            self.ttls.update((prefix.strip("."), ttl) for prefix, ttl in ttls.items())
+        self.default_ttl = default_ttl
+        self.maxsize = maxsize
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (expiration time, response), from the least recently used
+        self._responses = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._responses)
+
+    def __repr__(self):
+        return (
+            f"<ResponseCache: {len(self)} responses, {self.hits} hits, "
+            f"{self.misses} misses>"
+        )
+
+    def ttl(self, oid):
+        """returns the TTL of ``oid``, the one of its longest prefix in ``ttls``"""
+        prefix = oid.strip(".")
+        while prefix:
+            if prefix in self.ttls:
+                return self.ttls[prefix]
+            prefix = prefix.rpartition(".")[0]
+        return self.default_ttl
+
+    def get(self, key, oid):
+        """
+        returns the cached response to the request of ``oid`` identified by
+        ``key``, raises KeyError when missing or expired; the lookups of the
+        OIDs which are never cached are not counted as misses
+        """
+        if self.ttl(oid) <= 0:
+            raise KeyError(key)
+        with self._lock:
+            try:
+                expiration, response = self._responses[key]
+            except KeyError:
+                self.misses += 1
+                raise
+            if expiration <= self._clock():
+                del self._responses[key]
+                self.misses += 1
+                raise KeyError(key)
+            self._responses.move_to_end(key)
+            self.hits += 1
+            return response
+
+    def put(self, key, oid, response):
+        """caches the ``response`` to the request of ``oid`` identified by ``key``"""
+        ttl = self.ttl(oid)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._responses[key] = (self._clock() + ttl, response)
+            self._responses.move_to_end(key)
+            while len(self._responses) > self.maxsize:
+                self._responses.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """forgets all the cached responses"""
+        with self._lock:
+            self._responses.clear()
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._responses),
+        }
@@ -0,0 +1,51 @@
+"""NetEngine coalescing of identical SNMP requests"""
+
+__all__ = ["InFlightRequests"]
+
+
+import asyncio
+import weakref
+
+
+class InFlightRequests(object):
+    """
+    Identical requests which are outstanding at the same time on an event
+    loop share a single network exchange: the first caller starts it in a
+    task which all the callers await, and which is cancelled only when
+    every caller has been cancelled
+    """
+
+    def __init__(self):
+        # event loop -> {request key: [task, number of waiting callers]}
+        self._requests = weakref.WeakKeyDictionary()
+        self.coalesced = 0
+
+    def __len__(self):
+        return sum(len(requests) for requests in self._requests.values())
+
+    async def run(self, key, coroutine_function, *args):
+        """
+        returns the result of ``coroutine_function(*args)``, awaiting the
+        identical request (same ``key``) already in flight if there is one
+        """
+        loop = asyncio.get_running_loop()
+        requests = self._requests.setdefault(loop, {})
+        request = requests.get(key)
+        if request is None:
+            task = loop.create_task(coroutine_function(*args))
+            request = requests[key] = [task, 0]
+            task.add_done_callback(lambda _: self._forget(requests, key, request))
+        else:
+            self.coalesced += 1
+        task = request[0]
+        request[1] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            request[1] -= 1
+            if not request[1] and not task.done():
+                task.cancel()
+
+    def _forget(self, requests, key, request):
+        if requests.get(key) is request:
+            del requests[key]
@@ -0,0 +1,232 @@
+"""NetEngine SNMP dumps"""
+
+__all__ = ["Oid", "SnmpDump"]
+
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping, MutableMapping
+
+from pyasn1.type.univ import Integer, Null, ObjectIdentifier, OctetString
+
+# a packed arc is a length byte (1 to 5) followed by the big endian arc,
+# so no packed subtree continues with this byte
+_SUBTREE_END = b"\x06"
+
+
+def _pack(arcs):
+    """
+    packs the OID arcs in bytes which sort in numeric order and
+    where the OIDs of a subtree start with the packed subtree OID
+    """
+    packed = bytearray()
+    for arc in arcs:
+        size = (arc.bit_length() + 7) // 8 or 1
+        packed.append(size)
+        packed += arc.to_bytes(size, "big")
+    return bytes(packed)
+
+
+def _unpack(key):
+    arcs = []
+    position = 0
+    while position < len(key):
+        start = position + 1
+        position = start + key[position]
+        arcs.append(int.from_bytes(key[start:position], "big"))
+    return tuple(arcs)
+
+
+def _oid_key(oid):
+    """returns the packed key of an OID string"""
+    return _pack(int(arc) for arc in oid.strip(".").split(".") if arc)
+
+
+class Oid(object):
+    """OID of the results read from an SnmpDump"""
+
+    __slots__ = ("_key",)
+
+    def __init__(self, key):
+        self._key = key
+
+    def getOid(self):
+        return _unpack(self._key)
+
+    get_oid = getOid
+
+    def __str__(self):
+        return ".".join(str(arc) for arc in _unpack(self._key))
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}('{self}')"
+
+    def __eq__(self, other):
+        if isinstance(other, Oid):
+            return self._key == other._key
+        return str(self) == other
+
+    def __hash__(self):
+        return hash(self._key)
+
+
+class SnmpDump(MutableMapping):
+    """
+    Maps OID strings to SNMP results, keeping the OIDs sorted in numeric
+    order so that the OIDs of a subtree are found with a binary search.
+
+    OIDs are stored packed in bytes and values as plain python scalars
+    (numbers as int, octet strings as bytes, object identifiers as str
+    and missing values as None); results are rebuilt when read.
+    """
+
+    def __init__(self, data=None):
+        self._data = {}
+        # types of the octet strings which are not plain OctetString,
+        # eg: IpAddress, few OIDs have them so they are stored apart
+        self._types = {}
+        # packed keys sorted in numeric order, None when stale
+        self._index = []
+        # subtrees which could not be collected, mapped to their error
+        self.failed = {}
+        if data is not None:
+            self.update(data)
+
+    def _sorted_index(self):
+        """sorts the index lazily, after the OIDs inserted out of order"""
+        if self._index is None:
+            self._index = sorted(self._data)
+        return self._index
+
+    def _key(self, oid):
+        try:
+            return _oid_key(str(oid))
+        except ValueError as exc:
+            raise KeyError(oid) from exc
+
+    def add(self, oid, value):
+        """stores the ``value`` of ``oid`` in compact form"""
+        key = self._key(oid)
+        if key not in self._data and self._index is not None:
+            # walks return OIDs in order, appending keeps the index sorted
+            if self._index and key < self._index[-1]:
+                self._index = None
+            else:
+                self._index.append(key)
+        self._types.pop(key, None)
+        if value is None or isinstance(value, Null):
+            value = None
+        elif isinstance(value, Integer):
+            value = int(value)
+        elif isinstance(value, OctetString):
+            if type(value) is not OctetString:
+                self._types[key] = type(value)
+            value = value.asOctets()
+        elif isinstance(value, ObjectIdentifier):
+            value = str(value)
+        self._data[key] = value
+
+    def _value(self, key):
+        value = self._data[key]
+        if value is None:
+            return Null("")
+        if isinstance(value, bytes):
+            return self._types.get(key, OctetString)(value)
+        return value
+
+    def _result(self, key):
+        return [None, None, None, [(Oid(key), self._value(key))]]
+
+    def __getitem__(self, oid):
+        return self._result(self._key(oid))
+
+    def __setitem__(self, oid, result):
+        self.add(oid, result[3][0][1])
+
+    def __delitem__(self, oid):
+        key = self._key(oid)
+        del self._data[key]
+        self._types.pop(key, None)
+        self._index = None
+
+    def __contains__(self, oid):
+        try:
+            return self._key(oid) in self._data
+        except KeyError:
+            return False
+
+    def __iter__(self):
+        return (str(Oid(key)) for key in self._sorted_index())
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({dict(self.items())!r})"
+
+    def update(self, *args, **kwargs):
+        """merges other dumps or mappings, sorting the index only once"""
+        if self._data:
+            self._index = None
+        if len(args) == 1 and isinstance(args[0], SnmpDump) and not kwargs:
+            # merges the compact form, without rebuilding the results
+            other = args[0]
+            for key in other._data:
+                self._types.pop(key, None)
+            self._data.update(other._data)
+            self._types.update(other._types)
+            self.failed.update(other.failed)
+            if self._index is not None:
+                self._index = list(other._sorted_index())
+            return
+        if len(args) == 1 and isinstance(args[0], Mapping):
+            args = (args[0].items(),)
+        super().update(*args, **kwargs)
+
+    def _keys(self, prefix):
+        index = self._sorted_index()
+        if not prefix or not prefix.strip("."):
+            return index
+        key = _oid_key(prefix)
+        start = bisect_left(index, key)
+        end = bisect_left(index, key + _SUBTREE_END, start)
+        return index[start:end]
+
+    def oids(self, prefix=None):
+        """returns the OIDs of the ``prefix`` subtree in numeric order"""
+        return [str(Oid(key)) for key in self._keys(prefix)]
+
+    def items(self, prefix=None):
+        """
+        returns the ``(oid, result)`` pairs in numeric order; when ``prefix``
+        is given only the OIDs of its subtree, eg: ``1.3.6.1.2.1.2.2.1.1``
+        matches ``1.3.6.1.2.1.2.2.1.1.5`` but not ``1.3.6.1.2.1.2.2.1.10.5``
+        """
+        return [(str(Oid(key)), self._result(key)) for key in self._keys(prefix)]
+
+    def next_oid(self, oid):
+        """returns the first OID which follows ``oid`` in numeric order, or None"""
+        index = self._sorted_index()
+        position = bisect_right(index, _oid_key(oid))
+        if position == len(index):
+            return None
+        return str(Oid(index[position]))
+
+    def failure(self, prefix):
+        """
+        returns the error of the failed subtree which contains or is
+        contained in the ``prefix`` subtree, or None
+        """
+        prefix = prefix.strip(".") + "."
+        for subtree, error in self.failed.items():
+            subtree = subtree.strip(".") + "."
+            if prefix.startswith(subtree) or subtree.startswith(prefix):
+                return error
+        return None
+
+    def column(self, prefix):
+        """
+        returns the values of the ``prefix`` subtree keyed by the tuple of
+        the arcs which follow the prefix, eg: the ifIndex of ifTable columns
+        """
+        length = len(_oid_key(prefix))
+        return {_unpack(key[length:]): self._value(key) for key in self._keys(prefix)}
@@ -0,0 +1,82 @@
+"""NetEngine filters of the polled interfaces"""
+
+__all__ = ["InterfaceFilter"]
+
+
+import re
+from fnmatch import fnmatchcase
+
+
+class InterfaceFilter(object):
+    """
+    Selects the interfaces polled by a backend: ``include`` and ``exclude``
+    are glob patterns (eg: ``"eth*"``) or compiled regular expressions
+    matched against the ifDescr and ifName of each interface, ``types`` the
+    IANA ifType values (eg: ``6`` for ethernet) and ``admin_up`` the admin
+    status (True: only the enabled interfaces, False: only the disabled
+    ones). An interface is selected when it matches every criterion set.
+    """
+
+    def __init__(self, include=None, exclude=None, types=None, admin_up=None):
+        for name, patterns in (("include", include), ("exclude", exclude)):
+            if isinstance(patterns, (str, re.Pattern)):
+                raise ValueError(f"{name} must be a list of patterns")
+        self.include = list(include) if include is not None else None
+        self.exclude = list(exclude or ())
+        self.types = {str(value) for value in types} if types is not None else None
+        self.admin_up = admin_up
+
+    def __repr__(self):
+        return (
+            f"<InterfaceFilter: include={self.include!r}, exclude={self.exclude!r}, "
+            f"types={self.types!r}, admin_up={self.admin_up!r}>"
+        )
+
+    @property
+    def columns(self):
+        """the ifTable/ifXTable columns read to evaluate the filter"""
+        columns = ["descr", "name"]
+        if self.types is not None:
+            columns.append("type")
+        if self.admin_up is not None:
+            columns.append("admin_status")
+        return columns
+
+    def _matches_any(self, patterns, names):
+        for pattern in patterns:
+            for name in names:
+                if isinstance(pattern, re.Pattern):
+                    if pattern.search(name):
+                        return True
+                elif fnmatchcase(name, pattern):
+                    return True
+        return False
+
+    def match(self, descr, name="", type=None, admin_status=None):
+        """returns True when the interface is selected"""
+        names = [value for value in (descr, name) if value]
+        if self.include is not None and not self._matches_any(self.include, names):
+            return False
+        if self._matches_any(self.exclude, names):
+            return False
+        if self.types is not None and type not in self.types:
+            return False
+        if self.admin_up is not None and (admin_status == "1") != self.admin_up:
+            return False
+        return True
+
+    def indexes(self, columns):
+        """
+        returns the ifIndexes selected from ``columns``, which map the
+        columns of the filter to the values of the interfaces by ifIndex
+        """
+        return [
+            index
+            for index, descr in columns["descr"].items()
+            if self.match(
+                descr,
+                columns["name"].get(index, ""),
+                columns.get("type", {}).get(index),
+                columns.get("admin_status", {}).get(index),
+            )
+        ]
@@ -0,0 +1,102 @@
+"""NetEngine health of the polled hosts"""
+
+__all__ = ["HealthTracker"]
+
+
+import threading
+import time
+
+
+class _Host(object):
+    __slots__ = ("failures", "backoff", "retry_at")
+
+    def __init__(self):
+        self.failures = 0
+        self.backoff = 0
+        self.retry_at = 0
+
+
+class HealthTracker(object):
+    """
+    Circuit breaker tracking the consecutive failures of each host: after
+    ``threshold`` failures its circuit opens and the requests fail at once
+    until, after ``backoff`` seconds, a single probe is allowed (half-open);
+    each failed probe doubles the time waited, up to ``max_backoff``, and a
+    success closes the circuit. A tracker can be shared by many devices and
+    poll cycles of a long-lived process.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, threshold=3, backoff=30, max_backoff=3600, clock=time.monotonic):
+        if threshold < 1:
+            raise ValueError("threshold must be a positive number")
+        self.threshold = threshold
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._clock = clock
+        self._lock = threading.Lock()
+        # only the hosts which failed since their last success
+        self._hosts = {}
+
+    def __repr__(self):
+        return f"<HealthTracker: {len(self.open_hosts())} open circuits>"
+
+    def state(self, key):
+        """
+        returns the state of the circuit of ``key``; when it is half-open
+        the probe is reserved to the caller, the others find it open until
+        the outcome of the probe is recorded
+        """
+        with self._lock:
+            host = self._hosts.get(key)
+            if host is None or host.failures < self.threshold:
+                return self.CLOSED
+            now = self._clock()
+            if now < host.retry_at:
+                return self.OPEN
+            host.retry_at = now + host.backoff
+            return self.HALF_OPEN
+
+    def record_success(self, key):
+        """closes the circuit of ``key``"""
+        with self._lock:
+            self._hosts.pop(key, None)
+
+    def record_failure(self, key):
+        """counts a failure of ``key``, opening its circuit at the threshold"""
+        with self._lock:
+            host = self._hosts.setdefault(key, _Host())
+            host.failures += 1
+            if host.failures < self.threshold:
+                return
+            if host.failures == self.threshold:
+                host.backoff = self.backoff
+            else:
+                host.backoff = min(host.backoff * 2, self.max_backoff)
+            host.retry_at = self._clock() + host.backoff
+
+    def status(self, key):
+        """returns the state, the consecutive failures and the seconds to the next probe"""
+        with self._lock:
+            host = self._hosts.get(key)
+            if host is None or host.failures < self.threshold:
+                failures = 0 if host is None else host.failures
+                return {"state": self.CLOSED, "failures": failures, "retry_in": 0}
+            retry_in = max(host.retry_at - self._clock(), 0)
+            return {
+                "state": self.OPEN if retry_in else self.HALF_OPEN,
+                "failures": host.failures,
+                "retry_in": retry_in,
+            }
+
+    def open_hosts(self):
+        """returns the keys of the hosts whose circuit is not closed"""
+        with self._lock:
+            return [
+                key
+                for key, host in self._hosts.items()
+                if host.failures >= self.threshold
+            ]
@@ -10,6 +10,7 @@ from datetime import timedelta
 
 from netaddr import EUI, mac_unix_expanded
 
+from netengine.backends import memoize
 from netengine.backends.snmp import SNMP
 from netengine.exceptions import NetEngineError
 
@@ -20,6 +21,130 @@ class OpenWRT(SNMP):
     """OpenWRT SNMP backend"""
 
     _oid_to_retrieve = "1.3.6.1.2.1.2.2.1.1."
+    _autowalk_subtrees = (
+        # ifTable: ifIndex, ifDescr, ifType, ifMtu,
+        # ifPhysAddress, ifOperStatus, ifInOctets, ifOutOctets
+        "1.3.6.1.2.1.2.2.1.1",
+        "1.3.6.1.2.1.2.2.1.2",
+        "1.3.6.1.2.1.2.2.1.3",
+        "1.3.6.1.2.1.2.2.1.4",
+        "1.3.6.1.2.1.2.2.1.6",
+        "1.3.6.1.2.1.2.2.1.8",
+        "1.3.6.1.2.1.2.2.1.10",
+        "1.3.6.1.2.1.2.2.1.16",
+        # ifXTable: ifName
+        "1.3.6.1.2.1.31.1.1.1.1",
+        # ipAddrTable: address, ifIndex, netmask
+        "1.3.6.1.2.1.4.20.1.1",
+        "1.3.6.1.2.1.4.20.1.2",
+        "1.3.6.1.2.1.4.20.1.3",
+        # ipNetToPhysicalTable: physical address, state
+        "1.3.6.1.2.1.4.35.1.4",
+        "1.3.6.1.2.1.4.35.1.7",
+        # hrProcessorLoad
+        "1.3.6.1.2.1.25.3.3.1.2",
+        # UCD-SNMP-MIB laLoad
+        "1.3.6.1.4.1.2021.10.1.3",
+    )
+    _optional_autowalk_subtrees = (
+        # IEEE 802.11 MIB dot11StationID, used to detect wireless interfaces
+        "1.2.840.10036.1.1.1.1",
+        # ifTable: ifInUcastPkts, ifInNUcastPkts, ifOutUcastPkts, ifOutNUcastPkts
+        "1.3.6.1.2.1.2.2.1.11",
+        "1.3.6.1.2.1.2.2.1.12",
+        "1.3.6.1.2.1.2.2.1.17",
+        "1.3.6.1.2.1.2.2.1.18",
+        # ifXTable: ifHCInOctets, ifHCInUcastPkts, ifHCInMulticastPkts,
+        # ifHCInBroadcastPkts and the same outbound counters
+        "1.3.6.1.2.1.31.1.1.1.6",
+        "1.3.6.1.2.1.31.1.1.1.7",
+        "1.3.6.1.2.1.31.1.1.1.8",
+        "1.3.6.1.2.1.31.1.1.1.9",
+        "1.3.6.1.2.1.31.1.1.1.10",
+        "1.3.6.1.2.1.31.1.1.1.11",
+        "1.3.6.1.2.1.31.1.1.1.12",
+        "1.3.6.1.2.1.31.1.1.1.13",
+    )
+    _autowalk_scalars = (
+        # sysUpTime, sysName
+        "1.3.6.1.2.1.1.3.0",
+        "1.3.6.1.2.1.1.5.0",
+        # hrSystemDate
+        "1.3.6.1.2.1.25.1.2.0",
+        # UCD-SNMP-MIB memory
+        "1.3.6.1.4.1.2021.4.3.0",
+        "1.3.6.1.4.1.2021.4.4.0",
+        "1.3.6.1.4.1.2021.4.5.0",
+        "1.3.6.1.4.1.2021.4.11.0",
+        "1.3.6.1.4.1.2021.4.13.0",
+        "1.3.6.1.4.1.2021.4.14.0",
+        "1.3.6.1.4.1.2021.4.15.0",
+    )
+    _field_oids = {
+        "general.hostname": ("1.3.6.1.2.1.1.5.0",),
+        "general.uptime": ("1.3.6.1.2.1.1.3.0",),
+        "general.local_time": ("1.3.6.1.2.1.25.1.2.0",),
+        "resources.load": ("1.3.6.1.4.1.2021.10.1.3",),
+        "resources.cpus": ("1.3.6.1.2.1.25.3.3.1.2",),
+        "resources.memory": (
+            "1.3.6.1.4.1.2021.4.5.0",
+            "1.3.6.1.4.1.2021.4.11.0",
+            "1.3.6.1.4.1.2021.4.13.0",
+            "1.3.6.1.4.1.2021.4.14.0",
+            "1.3.6.1.4.1.2021.4.15.0",
+        ),
+        "resources.swap": ("1.3.6.1.4.1.2021.4.3.0", "1.3.6.1.4.1.2021.4.4.0"),
+        "interfaces": (
+            "1.3.6.1.2.1.2.2.1.1",
+            "1.3.6.1.2.1.2.2.1.2",
+            "1.3.6.1.2.1.31.1.1.1.1",
+        ),
+        "interfaces.name": (),
+        "interfaces.mac": ("1.3.6.1.2.1.2.2.1.6",),
+        "interfaces.type": ("1.3.6.1.2.1.2.2.1.3", "1.2.840.10036.1.1.1.1"),
+        "interfaces.up": ("1.3.6.1.2.1.2.2.1.8",),
+        "interfaces.mtu": ("1.3.6.1.2.1.2.2.1.4",),
+        "interfaces.addresses": (
+            "1.3.6.1.2.1.4.20.1.1",
+            "1.3.6.1.2.1.4.20.1.2",
+            "1.3.6.1.2.1.4.20.1.3",
+        ),
+        "interfaces.statistics": (
+            "1.3.6.1.2.1.2.2.1.10",
+            "1.3.6.1.2.1.2.2.1.11",
+            "1.3.6.1.2.1.2.2.1.12",
+            "1.3.6.1.2.1.2.2.1.16",
+            "1.3.6.1.2.1.2.2.1.17",
+            "1.3.6.1.2.1.2.2.1.18",
+            "1.3.6.1.2.1.31.1.1.1.6",
+            "1.3.6.1.2.1.31.1.1.1.7",
+            "1.3.6.1.2.1.31.1.1.1.8",
+            "1.3.6.1.2.1.31.1.1.1.9",
+            "1.3.6.1.2.1.31.1.1.1.10",
+            "1.3.6.1.2.1.31.1.1.1.11",
+            "1.3.6.1.2.1.31.1.1.1.12",
+            "1.3.6.1.2.1.31.1.1.1.13",
+        ),
+        "neighbors": (
+            "1.3.6.1.2.1.4.35.1.4",
+            "1.3.6.1.2.1.4.35.1.7",
+            "1.3.6.1.2.1.31.1.1.1.1",
+        ),
+    }
+    _sections = {
+        "general": "general_to_dict",
+        "resources": "resources_to_dict",
+        "interfaces": "interfaces_to_dict",
+        "neighbors": "neighbors",
+    }
+    _interface_keys = {
+        "mac": ("mac",),
+        "type": ("type",),
+        "up": ("oper_status",),
+        "mtu": ("mtu",),
+        "addresses": (),
+        "statistics": (),
+    }
 
     def __str__(self):
         """print a human readable object description"""
@@ -39,6 +164,7 @@ class OpenWRT(SNMP):
         )
         return os_name, os_version
 
+    @memoize
     def manufacturer(self, snmpdump=None):
         # TODO: this is dangerous, it might not work in all cases
         return self.get_manufacturer(
@@ -59,322 +185,136 @@ class OpenWRT(SNMP):
 
         return td.days, td.seconds // 3600, (td.seconds // 60) % 60
 
-    _interfaces = None
-    _wireless_interfaces = None
-
+    @memoize
     def get_interfaces(self, snmpdump=None):
         """returns the list of all the interfaces of the device"""
-        self._ensure_memoized_properties_source(snmpdump)
-        if self._interfaces is None:
-            interfaces = []
-            value_to_get = "1.3.6.1.2.1.2.2.1.2."
-
-            for i in self._value_to_retrieve(snmpdump=snmpdump):
-                value_to_get1 = value_to_get + str(i)
-
-                if value_to_get1:
-                    interfaces.append(self.get_value(value_to_get1, snmpdump=snmpdump))
-
-            self._interfaces = interfaces
-
-        return self._interfaces
+        columns = self._interface_columns(("descr",), snmpdump=snmpdump)
+        return list(columns["descr"].values())
 
+    @memoize
     def get_wireless_interfaces(self, snmpdump=None):
         """returns the list of all the wireless interfaces of the device"""
-        self._ensure_memoized_properties_source(snmpdump)
-        if self._wireless_interfaces is None:
-            interfaces = []
-            wireless_if_oid = "1.2.840.10036.1.1.1.1."
-            interfaces_oid = "1.3.6.1.2.1.2.2.1.2."
-
-            for i in self._value_to_retrieve(snmpdump=snmpdump):
-                try:
-                    value_to_get1 = self.get_value(
-                        wireless_if_oid + str(i), snmpdump=snmpdump
-                    )
-
-                    if value_to_get1:
-                        interfaces.append(
-                            self.get_value(interfaces_oid + str(i), snmpdump=snmpdump)
-                        )
-                except (NetEngineError, KeyError):
-                    pass
-
-            self._wireless_interfaces = [_f for _f in interfaces if _f]
-
-        return self._wireless_interfaces
-
-    _interfaces_MAC = None
-
+        try:
+            columns = self._interface_columns(("descr", "wireless"), snmpdump=snmpdump)
+        except NetEngineError:
+            return []
+        return [
+            name
+            for index, name in columns["descr"].items()
+            if name and columns["wireless"][index]
+        ]
+
+    @memoize
     def interfaces_MAC(self, snmpdump=None):
         """Returns an ordered dict with the hardware address of every interface"""
-        self._ensure_memoized_properties_source(snmpdump)
-        if self._interfaces_MAC is None:
-            results = []
-            indexes = self._value_to_retrieve(snmpdump=snmpdump)
-            interfaces = self.get_interfaces(snmpdump=snmpdump)
-            for index, name in zip(indexes, interfaces):
-                result = self._dict(
-                    {
-                        "name": name,
-                        "mac_address": self._octet_to_mac(
-                            self.get_value(
-                                f"1.3.6.1.2.1.2.2.1.6.{index}", snmpdump=snmpdump
-                            )
-                        ),
-                    }
-                )
-                results.append(result)
-
-            self._interfaces_MAC = results
-
-        return self._interfaces_MAC
-
-    _interfaces_mtu = None
-
+        names = self.get_interfaces(snmpdump=snmpdump)
+        macs = self._interface_columns(("mac",), snmpdump=snmpdump)["mac"]
+        return [
+            self._dict({"name": name, "mac_address": self._octet_to_mac(mac)})
+            for name, mac in zip(names, macs.values())
+        ]
+
+    @memoize
     def interfaces_mtu(self, snmpdump=None):
         """Returns an ordereed dict with the interface and its MTU"""
-        self._ensure_memoized_properties_source(snmpdump)
-        if self._interfaces_mtu is None:
-            results = []
-            starting = "1.3.6.1.2.1.2.2.1.2."
-            tmp = list(starting)
-            tmp[18] = str(4)
-            to = "".join(tmp)
-
-            for i in self._value_to_retrieve(snmpdump=snmpdump):
-                result = self._dict(
-                    {
-                        "name": self.get_value(starting + str(i), snmpdump=snmpdump),
-                        "mtu": int(self.get_value(to + str(i), snmpdump=snmpdump)),
-                    }
-                )
-                results.append(result)
-
-            self._interfaces_mtu = results
-
-        return self._interfaces_mtu
-
-    _interfaces_speed = None
+        columns = self._interface_columns(("descr", "mtu"), snmpdump=snmpdump)
+        return [
+            self._dict({"name": name, "mtu": int(columns["mtu"][index])})
+            for index, name in columns["descr"].items()
+        ]
 
+    @memoize
     def interfaces_speed(self, snmpdump=None):
         """Returns an ordered dict with the interface and ist speed in bps"""
-        self._ensure_memoized_properties_source(snmpdump)
-        if self._interfaces_speed is None:
-            results = []
-            starting = "1.3.6.1.2.1.2.2.1.2."
-            starting_speed = "1.3.6.1.2.1.2.2.1.5."
-
-            STOP_AFTER_FAILS = 3
-
-            i = 1
-            consecutive_fails = (
-                0  # counter that indicates how many consecutive attempts failed
+        columns = self._interface_columns(
+            ("descr", "speed", "high_speed"), snmpdump=snmpdump
+        )
+        # skip interfaces without a name
+        return [
+            self._dict(
+                {
+                    "name": name,
+                    "speed": self._interface_speed(
+                        columns["speed"][index], columns["high_speed"][index]
+                    ),
+                }
             )
-            while True:
-                # break cycles if STOP_AFTER_FAILS reached
-                if consecutive_fails == STOP_AFTER_FAILS:
-                    break
-
-                # get name
-                name = self.get_value(starting + str(i), snmpdump=snmpdump)
-
-                # if nothing found
-                if name == "":
-                    # increment fail counter
-                    consecutive_fails += 1
-                    # increment i
-                    i += 1
-                    # skip to next iteration
-                    continue
-                else:
-                    # reset fail counter
-                    consecutive_fails = 0
-
-                # get speed and convert to int
-                speed = int(self.get_value(starting_speed + str(i), snmpdump=snmpdump))
-
-                result = self._dict({"name": name, "speed": speed})
-
-                results.append(result)
-                # increment i
-                i += 1
-
-            self._interfaces_speed = results
-
-        return self._interfaces_speed
-
-    _interfaces_up = None
+            for index, name in columns["descr"].items()
+            if name != ""
+        ]
 
+    @memoize
     def interfaces_up(self, snmpdump=None):
         """Returns an ordereed dict with the interfaces and their state (up: true/false)"""
-        self._ensure_memoized_properties_source(snmpdump)
-        if self._interfaces_up is None:
-            results = []
-            starting = "1.3.6.1.2.1.2.2.1.2."
-            operative = "1.3.6.1.2.1.2.2.1.8."
-            tmp = list(starting)
-            tmp[18] = str(4)
-            for i in self._value_to_retrieve(snmpdump=snmpdump):
-                if self.get_value(starting + str(i), snmpdump=snmpdump) != "":
-                    result = self._dict(
-                        {
-                            "name": self.get_value(
-                                starting + str(i), snmpdump=snmpdump
-                            ),
-                            "up": int(
-                                self.get_value(operative + str(i), snmpdump=snmpdump)
-                            )
-                            == 1,
-                        }
-                    )
-                    results.append(result)
-                elif self.get_value(starting + str(i), snmpdump=snmpdump) == "":
-                    result = self._dict({"name": "", "up": False})
-                    results.append(result)
-
-            self._interfaces_up = results
-
-        return self._interfaces_up
-
-    _interfaces_bytes = None
+        columns = self._interface_columns(("descr", "oper_status"), snmpdump=snmpdump)
+        results = []
+        for index, name in columns["descr"].items():
+            if name != "":
+                up = int(columns["oper_status"][index]) == 1
+                results.append(self._dict({"name": name, "up": up}))
+            else:
+                results.append(self._dict({"name": "", "up": False}))
+        return results
 
+    @memoize
     def interfaces_bytes(self, snmpdump=None):
         """Returns an ordereed dict with the interface and its tx and rx octets (1 octet = 1 byte = 8 bits)"""
-        self._ensure_memoized_properties_source(snmpdump)
-        if self._interfaces_bytes is None:
-            results = []
-            starting = "1.3.6.1.2.1.2.2.1.2."
-            starting_rx = "1.3.6.1.2.1.2.2.1.10."
-            starting_tx = "1.3.6.1.2.1.2.2.1.16."
-
-            for i in self._value_to_retrieve(snmpdump=snmpdump):
-                result = self._dict(
-                    {
-                        "name": self.get_value(starting + str(i), snmpdump=snmpdump),
-                        "tx": int(
-                            self.get_value(starting_tx + str(i), snmpdump=snmpdump)
-                        ),
-                        "rx": int(
-                            self.get_value(starting_rx + str(i), snmpdump=snmpdump)
-                        ),
-                    }
-                )
-                results.append(result)
-
-            self._interfaces_bytes = results
-
-        return self._interfaces_bytes
-
-    _interfaces_type = None
+        columns = self._interface_columns(("descr",), snmpdump=snmpdump)
+        counters = self._interface_counters(("tx_bytes", "rx_bytes"), snmpdump=snmpdump)
+        return [
+            self._dict(
+                {
+                    "name": name,
+                    "tx": counters[index].get("tx_bytes", 0),
+                    "rx": counters[index].get("rx_bytes", 0),
+                }
+            )
+            for index, name in columns["descr"].items()
+        ]
 
+    @memoize
     def interfaces_type(self, snmpdump=None):
         """Returns an ordered dict with the interface type (e.g Ethernet, loopback)"""
-        self._ensure_memoized_properties_source(snmpdump)
-        if self._interfaces_type is None:
-            results = []
-            starting = "1.3.6.1.2.1.2.2.1.2."
-            types_oid = "1.3.6.1.2.1.2.2.1.3."
-            types = {
-                "6": "ethernet",
-                "24": "loopback",
-                "157": "wireless",
-                "209": "bridge",
-            }
-            for i in self._value_to_retrieve(snmpdump=snmpdump):
-                result = self._dict(
-                    {
-                        "name": self.get_value(starting + str(i), snmpdump=snmpdump),
-                        "type": types.get(
-                            self.get_value(types_oid + str(i), snmpdump=snmpdump),
-                            "unknown",
-                        ),
-                    }
-                )
-                results.append(result)
-            self._interfaces_type = results
-
-        return self._interfaces_type
-
-    _interface_addr_and_mask = None
+        columns = self._interface_columns(("descr", "type"), snmpdump=snmpdump)
+        return [
+            self._dict(
+                {
+                    "name": name,
+                    "type": self._interface_types.get(
+                        columns["type"][index], "unknown"
+                    ),
+                }
+            )
+            for index, name in columns["descr"].items()
+        ]
 
+    @memoize
     def interface_addr_and_mask(self, snmpdump=None):
         """TODO: this method needs to be simplified and explained"""
-        self._ensure_memoized_properties_source(snmpdump)
-        if self._interface_addr_and_mask is None:
-            interface_ip_address = self.next(
-                "1.3.6.1.2.1.4.20.1.1.", snmpdump=snmpdump
-            )[3]
-            interface_index = self.next("1.3.6.1.2.1.4.20.1.2.", snmpdump=snmpdump)[3]
-            interface_netmask = self.next("1.3.6.1.2.1.4.20.1.3.", snmpdump=snmpdump)[3]
-
-            results = {}
-
-            # TODO: Add ipv6 addresses
-            for i in range(0, len(interface_ip_address)):
-                a = interface_ip_address[i][0][1].asNumbers()
-                ip_address = ".".join(str(a[i]) for i in range(0, len(a)))
-                b = interface_netmask[i][0][1].asNumbers()
-                netmask = ".".join(str(b[i]) for i in range(0, len(b)))
-
-                index = int(interface_index[i][0][1])
-                results.setdefault(index, []).append(
-                    {
-                        "family": "ipv4",
-                        "address": ip_address,
-                        "mask": netmask,
-                    }
-                )
+        interface_ip_address = self._next_rows(
+            "1.3.6.1.2.1.4.20.1.1.", snmpdump=snmpdump
+        )
+        interface_index = self._next_rows("1.3.6.1.2.1.4.20.1.2.", snmpdump=snmpdump)
+        interface_netmask = self._next_rows("1.3.6.1.2.1.4.20.1.3.", snmpdump=snmpdump)
 
-            self._interface_addr_and_mask = results
+        results = {}
 
-        return self._interface_addr_and_mask
+        # TODO: Add ipv6 addresses
+        for i in range(0, len(interface_ip_address)):
+            a = interface_ip_address[i][0][1].asNumbers()
+            ip_address = ".".join(str(a[i]) for i in range(0, len(a)))
+            b = interface_netmask[i][0][1].asNumbers()
+            netmask = ".".join(str(b[i]) for i in range(0, len(b)))
 
-    def interfaces_to_dict(self, snmpdump=None):
-        """Returns an ordered dict with all the information available about the interface"""
-        results = []
-        wireless_if = self.get_wireless_interfaces(snmpdump=snmpdump)
-        indexes = self._value_to_retrieve(snmpdump=snmpdump)
-        for i, (index, name) in enumerate(
-            zip(indexes, self.get_interfaces(snmpdump=snmpdump))
-        ):
-            if not name:
-                continue
-            logger.info(f"====== {i} ======")
-            logger.info("... name ...")
-            logger.info("... if_type ...")
-            if_type = self.interfaces_type(snmpdump=snmpdump)[i]["type"]
-            logger.info("... mac_address ...")
-            mac_address = self.interfaces_MAC(snmpdump=snmpdump)[i]["mac_address"]
-            logger.info("... rx_bytes ...")
-            rx_bytes = int(self.interfaces_bytes(snmpdump=snmpdump)[i]["rx"])
-            logger.info("... tx_bytes ...")
-            tx_bytes = int(self.interfaces_bytes(snmpdump=snmpdump)[i]["tx"])
-            logger.info("... up ...")
-            up = self.interfaces_up(snmpdump=snmpdump)[i]["up"]
-            logger.info("... mtu ...")
-            mtu = int(self.interfaces_mtu(snmpdump=snmpdump)[i]["mtu"])
-            logger.info("... if_ip ...")
-            addresses = self.interface_addr_and_mask(snmpdump=snmpdump).get(index, [])
-
-            if name in wireless_if:
-                if_type = "wireless"
-
-            result = self._dict(
+            index = int(interface_index[i][0][1])
+            results.setdefault(index, []).append(
                 {
-                    "name": name,
-                    "mac": mac_address,
-                    "type": if_type,
-                    "up": up,
-                    "mtu": mtu,
-                    "addresses": addresses,
-                    "statistics": {
-                        "rx_bytes": rx_bytes,
-                        "tx_bytes": tx_bytes,
-                    },
+                    "family": "ipv4",
+                    "address": ip_address,
+                    "mask": netmask,
                 }
             )
-            results.append(result)
+
         return results
 
     def local_time(self, snmpdump=None):
@@ -464,55 +404,45 @@ class OpenWRT(SNMP):
 
     def CPU_count(self, snmpdump=None):
         """returns the count of CPUs of the device"""
-        return len(self.next("1.3.6.1.2.1.25.3.3.1.2.", snmpdump=snmpdump)[3])
+        return len(self._next_rows("1.3.6.1.2.1.25.3.3.1.2.", snmpdump=snmpdump))
 
     def load(self, snmpdump=None):
         """Return the load averages for the last 1, 5, and 15 minutes."""
-        array = self.next("1.3.6.1.4.1.2021.10.1.3.", snmpdump=snmpdump)[3]
+        array = self._next_rows("1.3.6.1.4.1.2021.10.1.3.", snmpdump=snmpdump)
         one = float(array[0][0][1])
         five = float(array[1][0][1])
         fifteen = float(array[2][0][1])
         return [one, five, fifteen]
 
-    def resources_to_dict(self, snmpdump=None):
+    def memory_to_dict(self, snmpdump=None):
+        """returns a dict with the memory usage"""
+        return {
+            "total": self.RAM_total(snmpdump=snmpdump),
+            "shared": self.RAM_shared(snmpdump=snmpdump),
+            "free": self.RAM_free(snmpdump=snmpdump),
+            "cache": self.RAM_cached(snmpdump=snmpdump),
+            "buffered": self.RAM_buffered(snmpdump=snmpdump),
+        }
+
+    def swap_to_dict(self, snmpdump=None):
+        """returns a dict with the swap usage"""
+        return {
+            "total": self.SWAP_total(snmpdump=snmpdump),
+            "free": self.SWAP_free(snmpdump=snmpdump),
+        }
+
+    def resources_to_dict(self, snmpdump=None, fields=None):
         """returns an ordered dict with hardware resources information"""
-        result = self._dict(
+        return self._fields_to_dict(
             {
-                "load": self.load(snmpdump=snmpdump),
-                "cpus": self.CPU_count(snmpdump=snmpdump),
-                "memory": {
-                    "total": self.RAM_total(snmpdump=snmpdump),
-                    "shared": self.RAM_shared(snmpdump=snmpdump),
-                    "free": self.RAM_free(snmpdump=snmpdump),
-                    "cache": self.RAM_cached(snmpdump=snmpdump),
-                    "buffered": self.RAM_buffered(snmpdump=snmpdump),
-                },
-                "swap": {
-                    "total": self.SWAP_total(snmpdump=snmpdump),
-                    "free": self.SWAP_free(snmpdump=snmpdump),
-                },
-            }
+                "load": self.load,
+                "cpus": self.CPU_count,
+                "memory": self.memory_to_dict,
+                "swap": self.swap_to_dict,
+            },
+            snmpdump=snmpdump,
+            fields=fields,
         )
-        return result
-
-    def _reset_memoized_properties(self):
-        for attribute in (
-            "_interfaces",
-            "_wireless_interfaces",
-            "_interfaces_MAC",
-            "_interfaces_mtu",
-            "_interfaces_speed",
-            "_interfaces_up",
-            "_interfaces_bytes",
-            "_interfaces_type",
-            "_interface_addr_and_mask",
-        ):
-            setattr(self, attribute, None)
-
-    def _ensure_memoized_properties_source(self, snmpdump):
-        if getattr(self, "_memoized_snmpdump", object()) is not snmpdump:
-            self._reset_memoized_properties()
-            self._memoized_snmpdump = snmpdump
 
     def neighbors(self, snmpdump=None):
         """returns a dict with neighbors information"""
@@ -528,7 +458,7 @@ class OpenWRT(SNMP):
 
         neighbors_oid = "1.3.6.1.2.1.4.35.1.4"
         neighbor_states_oid = "1.3.6.1.2.1.4.35.1.7"
-        neighbor_info = self.next("1.3.6.1.2.1.4.35.1.", snmpdump=snmpdump)[3]
+        neighbor_info = self._next_rows("1.3.6.1.2.1.4.35.1.", snmpdump=snmpdump)
         neighbors = []
         neighbor_states = {}
         result = []
@@ -576,25 +506,14 @@ class OpenWRT(SNMP):
             )
         return result
 
-    def to_dict(self, autowalk=True, snmpdump=None):
-        self._reset_memoized_properties()
-        if snmpdump is None and autowalk:
-            snmpdump = self.walk("1.3.6.1")
-            try:
-                snmpdump.update(self.walk("1.2.840.10036"))
-            except NetEngineError as exc:
-                logger.warning("Unable to collect optional vendor SNMP data: %s", exc)
-        result = self._dict(
+    def general_to_dict(self, snmpdump=None, fields=None):
+        """returns a dict with the hostname, uptime and local time"""
+        return self._fields_to_dict(
             {
-                "type": "DeviceMonitoring",
-                "general": {
-                    "hostname": self.name(snmpdump=snmpdump),
-                    "uptime": self.uptime(snmpdump=snmpdump),
-                    "local_time": self.local_time(snmpdump=snmpdump),
-                },
-                "resources": self.resources_to_dict(snmpdump=snmpdump),
-                "interfaces": self.interfaces_to_dict(snmpdump=snmpdump),
-                "neighbors": self.neighbors(snmpdump=snmpdump),
-            }
+                "hostname": self.name,
+                "uptime": self.uptime,
+                "local_time": self.local_time,
+            },
+            snmpdump=snmpdump,
+            fields=fields,
         )
-        return result
@@ -0,0 +1,162 @@
+"""NetEngine SNMP sessions"""
+
+__all__ = ["SNMPSession", "CircuitOpen", "DeadlineExceeded", "Unreachable"]
+
+
+import asyncio
+import time
+
+from pysnmp.hlapi.v3arch.asyncio import SnmpEngine, UdpTransportTarget
+from pysnmp.proto.errind import ErrorIndication, RequestTimedOut
+
+
+class CircuitOpen(ErrorIndication):
+    """the circuit of the device is open, the request is not sent"""
+
+
+class DeadlineExceeded(ErrorIndication):
+    """the deadline of the session expired before the response arrived"""
+
+
+class Unreachable(ErrorIndication):
+    """a previous request of the session timed out, the request is not sent"""
+
+
+def _inside_event_loop():
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class SNMPSession(object):
+    """
+    Owns the SNMP engine, the transport target and the event loop
+    shared by all the requests sent to a device during a poll
+    """
+
+    def __init__(
+        self,
+        host,
+        port,
+        engine=None,
+        loop=None,
+        timeout=1,
+        retries=5,
+        deadline=None,
+    ):
+        """
+        when ``loop`` is omitted the session creates (and later closes)
+        its own event loop, which is used by the synchronous API;
+        an ``engine`` can be shared among sessions running on the same loop;
+        each request waits ``timeout`` seconds for the response and is sent
+        again up to ``retries`` times, the requests which are still waiting
+        ``deadline`` seconds after the session was opened fail
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.retries = retries
+        self._expires = None if deadline is None else time.monotonic() + deadline
+        self.deadline = deadline
+        # error indication of the request which found the device unreachable
+        self.unreachable = None
+        # whether the device answered any request
+        self.responded = False
+        # CircuitOpen error indication of the requests, when the circuit
+        # breaker of the device is open; when it is half-open the probe
+        # (True until it is sent, then its task) which precedes the requests;
+        # the circuit is looked up before the first request
+        self.health_checked = False
+        self.circuit_open = None
+        self.probe = None
+        self._owns_loop = loop is None
+        self._loop = loop
+        self._owns_engine = engine is None
+        self._engine = engine
+        self._transport = None
+
+    @property
+    def loop(self):
+        """lazily creates the event loop of synchronous sessions"""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop
+
+    @property
+    def engine(self):
+        """lazily creates the SNMP engine, which is expensive to build"""
+        if self._engine is None:
+            self._engine = SnmpEngine()
+        return self._engine
+
+    async def transport(self):
+        """returns the transport target, resolving the address only once"""
+        if self._transport is None:
+            self._transport = await UdpTransportTarget.create(
+                (self.host, self.port), timeout=self.timeout, retries=self.retries
+            )
+        return self._transport
+
+    def error(self):
+        """
+        returns the error indication which prevents sending requests,
+        once the device is unreachable or the deadline expired
+        """
+        if self.circuit_open is not None:
+            return self.circuit_open
+        if self.unreachable is not None:
+            return Unreachable(
+                f"{self.host}:{self.port} is unreachable ({self.unreachable}), "
+                "the request was not sent"
+            )
+        if self._expires is not None and time.monotonic() >= self._expires:
+            return self._deadline_exceeded()
+        return None
+
+    def _deadline_exceeded(self):
+        return DeadlineExceeded(
+            f"{self.host}:{self.port} deadline of {self.deadline}s exceeded"
+        )
+
+    def check_response(self, error_indication):
+        """records whether the device answered or the request timed out"""
+        if not error_indication:
+            self.responded = True
+        elif isinstance(error_indication, RequestTimedOut) and self.unreachable is None:
+            self.unreachable = error_indication
+
+    async def wait(self, awaitable):
+        """
+        awaits the response, raises DeadlineExceeded (an error indication)
+        when the deadline expires before it arrives
+        """
+        if self._expires is None:
+            return await awaitable
+        try:
+            return await asyncio.wait_for(
+                awaitable, max(self._expires - time.monotonic(), 0)
+            )
+        except asyncio.TimeoutError:
+            raise self._deadline_exceeded() from None
+
+    def run(self, coroutine):
+        """runs ``coroutine`` to completion on the session event loop"""
+        if not self._owns_loop or _inside_event_loop():
+            coroutine.close()
+            raise RuntimeError(
+                "synchronous SNMP requests cannot run inside an asyncio event "
+                "loop, use the awaitable API (aget, awalk, ato_dict, ...) instead"
+            )
+        return self.loop.run_until_complete(coroutine)
+
+    def close(self):
+        """releases the engine dispatcher and the event loop owned by the session"""
+        if self._owns_engine and self._engine is not None:
+            self._engine.close_dispatcher()
+        self._engine = None
+        self._transport = None
+        if self._owns_loop and self._loop is not None and not self._loop.is_closed():
+            self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+            self._loop.close()
@@ -0,0 +1,265 @@
+"""NetEngine SNMP agent simulator, for offline load tests and benchmarks"""
+
+__all__ = ["SNMPAgent", "load_fixture", "start_agents"]
+
+
+import asyncio
+import codecs
+import json
+import random
+
+from pyasn1.codec.ber import decoder, encoder
+from pyasn1.error import PyAsn1Error
+from pyasn1.type.univ import Null, OctetString
+from pysnmp.proto import api
+
+from .dump import SnmpDump
+
+# error status of the responses
+_TOO_BIG = 1
+_NO_SUCH_NAME = 2
+
+_V1 = api.PROTOCOL_MODULES[api.SNMP_VERSION_1]
+
+_IF_INDEX = "1.3.6.1.2.1.2.2.1.1"
+_IF_DESCR = "1.3.6.1.2.1.2.2.1.2"
+
+
+def load_fixture(path):
+    """
+    loads a JSON fixture of ``tests/static`` (or any JSON object which maps
+    OIDs to values) in an SnmpDump: numeric strings are served as numbers,
+    the other strings and the ``{"type": "bytes"}`` values as octet strings
+    """
+    with open(path) as f:
+        data = json.load(f)
+    snmpdump = SnmpDump()
+    for oid, value in data.items():
+        if isinstance(value, dict) and value.get("type") == "bytes":
+            value = OctetString(codecs.escape_decode(value["value"])[0])
+        elif isinstance(value, str):
+            value = int(value) if value.isdigit() else OctetString(value.encode())
+        elif not isinstance(value, int):
+            continue
+        snmpdump.add(oid, value)
+    # the fixtures omit the ifIndex column, which real agents always serve
+    for oid in snmpdump.oids(_IF_DESCR):
+        index = oid.rpartition(".")[2]
+        if f"{_IF_INDEX}.{index}" not in snmpdump:
+            snmpdump.add(f"{_IF_INDEX}.{index}", int(index))
+    return snmpdump
+
+
+class SNMPAgent(asyncio.DatagramProtocol):
+    """
+    Serves the OIDs of an SnmpDump over UDP answering SNMPv1 and SNMPv2c
+    GET, GETNEXT and GETBULK requests, like a real agent would; ``latency``
+    and ``jitter`` (seconds) delay the responses, ``loss`` is the
+    probability of dropping a request, ``max_message_size`` (bytes) and
+    ``max_varbinds`` make the agent answer tooBig to the larger requests.
+    """
+
+    def __init__(
+        self,
+        snmpdump,
+        community="public",
+        latency=0,
+        jitter=0,
+        loss=0,
+        max_message_size=1472,
+        max_varbinds=None,
+        seed=None,
+    ):
+        if not 0 <= loss <= 1:
+            raise ValueError("loss must be between 0 and 1")
+        self.snmpdump = snmpdump
+        self.community = community
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.max_message_size = max_message_size
+        self.max_varbinds = max_varbinds
+        self._random = random.Random(seed)
+        self._transport = None
+        self.host = None
+        self.port = None
+        self.requests = 0
+        self.responses = 0
+        self.dropped = 0
+
+    def __repr__(self):
+        return f"<SNMPAgent: {self.host}:{self.port}, {len(self.snmpdump)} OIDs>"
+
+    async def start(self, host="127.0.0.1", port=0):
+        """binds the agent to ``host`` and ``port`` (0: any free port)"""
+        loop = asyncio.get_running_loop()
+        await loop.create_datagram_endpoint(lambda: self, local_addr=(host, port))
+        self.host, self.port = self._transport.get_extra_info("sockname")[:2]
+        return self
+
+    def close(self):
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+    def connection_made(self, transport):
+        self._transport = transport
+
+    def datagram_received(self, data, addr):
+        self.requests += 1
+        if self.loss and self._random.random() < self.loss:
+            self.dropped += 1
+            return
+        response = self.respond(data)
+        if response is None:
+            self.dropped += 1
+            return
+        delay = self.latency
+        if self.jitter:
+            delay = max(0, delay + self._random.uniform(-self.jitter, self.jitter))
+        if delay:
+            asyncio.get_running_loop().call_later(delay, self._send, response, addr)
+        else:
+            self._send(response, addr)
+
+    def _send(self, response, addr):
+        if self._transport is not None:
+            self._transport.sendto(response, addr)
+            self.responses += 1
+
+    def respond(self, data):
+        """
+        returns the encoded response to the encoded request ``data``, None
+        for malformed requests, wrong communities and unsupported PDUs
+        """
+        try:
+            version = int(api.decodeMessageVersion(data))
+            pmod = api.PROTOCOL_MODULES[version]
+            request, _ = decoder.decode(data, asn1Spec=pmod.Message())
+        except (KeyError, PyAsn1Error):
+            return None
+        if str(pmod.apiMessage.get_community(request)) != self.community:
+            return None
+        pdu = pmod.apiMessage.get_pdu(request)
+        response = pmod.apiMessage.get_response(request)
+        response_pdu = pmod.apiMessage.get_pdu(response)
+        oids = [oid for oid, _ in pmod.apiPDU.get_varbinds(pdu)]
+        if isinstance(pdu, pmod.GetRequestPDU):
+            var_binds, error_index = self._get(pmod, oids)
+        elif isinstance(pdu, pmod.GetNextRequestPDU):
+            var_binds, error_index = self._get_next(pmod, oids)
+        elif version == api.SNMP_VERSION_2C and isinstance(pdu, pmod.GetBulkRequestPDU):
+            return self._get_bulk(pmod, pdu, response, response_pdu, oids)
+        else:
+            return None
+        if error_index is not None:
+            # SNMPv1: the whole request fails on the first missing OID
+            pmod.apiPDU.set_error_status(response_pdu, _NO_SUCH_NAME)
+            pmod.apiPDU.set_error_index(response_pdu, error_index + 1)
+            var_binds = [(oid, pmod.Null("")) for oid in oids]
+        pmod.apiPDU.set_varbinds(response_pdu, var_binds)
+        message = encoder.encode(response)
+        if len(message) > self.max_message_size or (
+            self.max_varbinds is not None and len(oids) > self.max_varbinds
+        ):
+            return self._too_big(pmod, response, response_pdu, oids)
+        return message
+
+    def _too_big(self, pmod, response, response_pdu, oids):
+        pmod.apiPDU.set_error_status(response_pdu, _TOO_BIG)
+        pmod.apiPDU.set_error_index(response_pdu, 0)
+        if pmod is _V1:
+            pmod.apiPDU.set_varbinds(
+                response_pdu, [(oid, pmod.Null("")) for oid in oids]
+            )
+        else:
+            pmod.apiPDU.set_varbinds(response_pdu, [])
+        return encoder.encode(response)
+
+    def _value(self, pmod, oid):
+        """returns the value of ``oid`` encoded for the SNMP version, or None"""
+        try:
+            value = self.snmpdump[oid][3][0][1]
+        except KeyError:
+            return None
+        if isinstance(value, Null):
+            return None
+        if isinstance(value, str):
+            return pmod.ObjectIdentifier(value)
+        if isinstance(value, OctetString):
+            return value
+        v1 = pmod is _V1
+        if -(2**31) <= value < 2**31:
+            return pmod.Integer(value)
+        if 0 <= value < 2**32:
+            return pmod.Gauge(value) if v1 else pmod.Gauge32(value)
+        # SNMPv1 has no 64-bit type, the OID is not available
+        if not v1 and 0 <= value < 2**64:
+            return pmod.Counter64(value)
+        return None
+
+    def _next(self, pmod, oid):
+        """returns the first OID after ``oid`` with a value, or None"""
+        oid = self.snmpdump.next_oid(oid)
+        while oid is not None:
+            value = self._value(pmod, oid)
+            if value is not None:
+                return oid, value
+            oid = self.snmpdump.next_oid(oid)
+        return None
+
+    def _get(self, pmod, oids):
+        var_binds = []
+        for position, oid in enumerate(oids):
+            value = self._value(pmod, str(oid))
+            if value is None:
+                if pmod is _V1:
+                    return None, position
+                value = pmod.NoSuchInstance("")
+            var_binds.append((oid, value))
+        return var_binds, None
+
+    def _get_next(self, pmod, oids):
+        var_binds = []
+        for position, oid in enumerate(oids):
+            found = self._next(pmod, str(oid))
+            if found is None:
+                if pmod is _V1:
+                    return None, position
+                found = oid, pmod.EndOfMibView("")
+            var_binds.append(found)
+        return var_binds, None
+
+    def _get_bulk(self, pmod, pdu, response, response_pdu, oids):
+        non_repeaters = min(int(pmod.apiBulkPDU.get_non_repeaters(pdu)), len(oids))
+        max_repetitions = max(int(pmod.apiBulkPDU.get_max_repetitions(pdu)), 0)
+        var_binds, _ = self._get_next(pmod, oids[:non_repeaters])
+        rows = []
+        row = oids[non_repeaters:]
+        for _ in range(max_repetitions if row else 0):
+            row, _ = self._get_next(pmod, row)
+            rows.append(row)
+            if all(isinstance(value, pmod.EndOfMibView) for _, value in row):
+                break
+            row = [oid for oid, _ in row]
+        # the repetitions which do not fit in the message are left out
+        while True:
+            pmod.apiPDU.set_varbinds(
+                response_pdu, var_binds + [var_bind for row in rows for var_bind in row]
+            )
+            message = encoder.encode(response)
+            if len(message) <= self.max_message_size:
+                return message
+            if len(rows) <= 1:
+                return self._too_big(pmod, response, response_pdu, oids)
+            rows = rows[: len(rows) // 2]
+
+
+async def start_agents(snmpdump, count, host="127.0.0.1", **kwargs):
+    """
+    starts ``count`` agents serving ``snmpdump`` on free ports of ``host``,
+    the other arguments are passed to SNMPAgent; returns the agents
+    """
+    agents = [SNMPAgent(snmpdump, **kwargs) for _ in range(count)]
+    await asyncio.gather(*(agent.start(host) for agent in agents))
+    return agents
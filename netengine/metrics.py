@@ -0,0 +1,200 @@
+"""NetEngine metrics of the polls, exposed in the Prometheus text format"""
+
+__all__ = ["Counter", "Histogram", "MetricsRegistry", "start_http_server"]
+
+
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value):
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_labels(names, values, extra=""):
+    labels = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        labels.append(extra)
+    return "{" + ",".join(labels) + "}" if labels else ""
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Counter(object):
+    """
+    Monotonic counter of each combination of the values of its labels,
+    which are passed as a tuple in the order of ``labelnames``
+    """
+
+    type = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def __repr__(self):
+        return f"<Counter: {self.name}>"
+
+    def inc(self, amount=1, labels=()):
+        if amount < 0:
+            raise ValueError("counters can only increase")
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels=()):
+        return self._values.get(labels, 0)
+
+    def samples(self):
+        """yields the ``(suffix, label values, extra label, value)`` samples"""
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield "", labels, "", value
+
+
+class Histogram(object):
+    """
+    Distribution of the observed values in fixed buckets (their upper
+    bounds, in increasing order) with their sum and count, for each
+    combination of the values of its labels
+    """
+
+    type = "histogram"
+    # seconds, from a fast response on a LAN to a timeout with retries
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        if list(buckets) != sorted(buckets) or not buckets:
+            raise ValueError("buckets must be in increasing order")
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # labels -> [count of each bucket and of +Inf, sum]
+        self._series = {}
+
+    def __repr__(self):
+        return f"<Histogram: {self.name}>"
+
+    def observe(self, value, labels=()):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, labels=()):
+        series = self._series.get(labels)
+        return sum(series[0]) if series is not None else 0
+
+    def samples(self):
+        """yields the ``(suffix, label values, extra label, value)`` samples"""
+        with self._lock:
+            series = [
+                (labels, list(counts), total)
+                for labels, (counts, total) in self._series.items()
+            ]
+        for labels, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                yield "_bucket", labels, f'le="{_format_value(float(bound))}"', cumulative
+            yield "_sum", labels, "", total
+            yield "_count", labels, "", cumulative
+
+
+class MetricsRegistry(object):
+    """
+    Counters and histograms of a process, which can be shared by many
+    devices and rendered in the Prometheus text exposition format; the
+    metrics are created by their first use and found by name afterwards
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def __repr__(self):
+        return f"<MetricsRegistry: {len(self._metrics)} metrics>"
+
+    def __iter__(self):
+        return iter(list(self._metrics.values()))
+
+    def _get(self, metric_class, name, *args):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.setdefault(name, metric_class(name, *args))
+        if not isinstance(metric, metric_class):
+            raise ValueError(f"{name} is a {metric.type}")
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        """returns the counter ``name``, creating it the first time"""
+        return self._get(Counter, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=None):
+        """returns the histogram ``name``, creating it the first time"""
+        return self._get(
+            Histogram,
+            name,
+            documentation,
+            labelnames,
+            buckets or Histogram.DEFAULT_BUCKETS,
+        )
+
+    def render(self):
+        """returns the metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric in self:
+            lines.append(f"# HELP {metric.name} {_escape(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for suffix, labels, extra, value in metric.samples():
+                lines.append(
+                    f"{metric.name}{suffix}"
+                    f"{_format_labels(metric.labelnames, labels, extra)} "
+                    f"{_format_value(value)}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+def start_http_server(registry, port=9100, host="127.0.0.1"):
+    """
+    serves the metrics of ``registry`` on ``http://host:port/metrics`` from
+    a daemon thread; returns the server, stopped by its ``shutdown()``
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
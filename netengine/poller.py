@@ -0,0 +1,173 @@
+"""NetEngine fleet poller"""
+
+__all__ = ["Poller", "PollResult"]
+
+
+import asyncio
+import contextlib
+import inspect
+import logging
+import time
+
+from netengine.exceptions import NetEngineError
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+class PollResult(object):
+    """Outcome of the poll of a single device"""
+
+    __slots__ = ("device", "host", "result", "error", "duration")
+
+    def __init__(self, device, host, result=None, error=None, duration=0.0):
+        self.device = device
+        self.host = host
+        self.result = result
+        self.error = error
+        self.duration = duration
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        outcome = "ok" if self.ok else f"error: {self.error}"
+        return f"<PollResult {self.host} ({outcome})>"
+
+
+class Poller(object):
+    """
+    Polls many devices concurrently; errors are reported
+    per device and never abort the rest of the batch
+    """
+
+    def __init__(self, concurrency=100, timeout=None, callback=None, metrics=None):
+        """
+        ``concurrency`` is the maximum number of devices polled at the same
+        time, ``timeout`` the maximum number of seconds granted to each poll,
+        ``callback`` is called (or awaited) with every PollResult,
+        ``metrics`` is a MetricsRegistry fed with the polls and shared with
+        the devices which do not have their own
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be a positive number")
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.callback = callback
+        self.metrics = metrics
+
+    def poll(self, targets):
+        """polls ``targets`` and returns the list of PollResult"""
+        return asyncio.run(self._collect(targets))
+
+    async def _collect(self, targets):
+        return [result async for result in self.apoll(targets)]
+
+    async def apoll(self, targets):
+        """
+        polls ``targets``, an iterable of ``(backend_class, host)`` or
+        ``(backend_class, host, kwargs)`` tuples, yielding a PollResult
+        as soon as each device is done
+        """
+        targets = iter(targets)
+        # bounded, so that a slow consumer slows down the workers
+        queue = asyncio.Queue(maxsize=self.concurrency)
+        engines = []
+
+        async def worker():
+            # the iterator is shared: workers take the next target when idle
+            for target in targets:
+                result = await self._poll(target, engines)
+                if self.callback is not None:
+                    await self._call_back(result)
+                await queue.put(result)
+
+        async def run():
+            cancelled = False
+            try:
+                await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+            except asyncio.CancelledError:
+                # the consumer stopped early, nobody waits for the end
+                cancelled = True
+                raise
+            finally:
+                if not cancelled:
+                    await queue.put(_DONE)
+
+        runner = asyncio.create_task(run())
+        try:
+            while True:
+                result = await queue.get()
+                if result is _DONE:
+                    break
+                yield result
+            await runner
+        finally:
+            runner.cancel()
+            # the workers are done before their engines are closed
+            with contextlib.suppress(asyncio.CancelledError):
+                await runner
+            for engine in engines:
+                engine.close_dispatcher()
+
+    async def _call_back(self, result):
+        """calls the callback, its errors are logged and never abort the batch"""
+        try:
+            outcome = self.callback(result)
+            if inspect.isawaitable(outcome):
+                await outcome
+        except Exception:
+            logger.exception("Callback failed on the result of %s", result.host)
+
+    async def _poll(self, target, engines):
+        backend = host = device = None
+        start = time.monotonic()
+        try:
+            # a malformed target is the error of its result
+            backend, host, kwargs = (tuple(target) + ({},))[:3]
+            device = backend(host, **kwargs)
+            self._prepare(device, engines)
+            result = await asyncio.wait_for(device.ato_dict(), self.timeout)
+        except asyncio.TimeoutError:
+            error = NetEngineError(f"{host}: poll timed out after {self.timeout}s")
+        except Exception as exc:
+            error = exc
+        else:
+            error = None
+        finally:
+            # the shared engine is closed at the end of the batch
+            if engines and getattr(device, "engine", None) is engines[0]:
+                device.engine = None
+        if error is None:
+            poll = PollResult(device, host, result, duration=time.monotonic() - start)
+        else:
+            logger.warning("Unable to poll %s: %s", host, error)
+            poll = PollResult(
+                device, host, error=error, duration=time.monotonic() - start
+            )
+        if self.metrics is not None:
+            self._observe(backend, poll)
+        return poll
+
+    def _observe(self, backend, result):
+        backend = getattr(backend, "__name__", "unknown")
+        self.metrics.counter(
+            "netengine_polls_total", "Devices polled", ("backend", "outcome")
+        ).inc(labels=(backend, "ok" if result.ok else "error"))
+        self.metrics.histogram(
+            "netengine_poll_seconds", "Time spent polling a device", ("backend",)
+        ).observe(result.duration, (backend,))
+
+    def _prepare(self, device, engines):
+        # SNMP backends share a single engine among their sessions:
+        # building one per device would cost more than polling it
+        if hasattr(device, "engine") and device.engine is None:
+            if not engines:
+                from pysnmp.hlapi.v3arch.asyncio import SnmpEngine
+
+                engines.append(SnmpEngine())
+            device.engine = engines[0]
+        if getattr(device, "metrics", False) is None:
+            device.metrics = self.metrics
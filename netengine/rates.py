@@ -0,0 +1,197 @@
+"""NetEngine traffic rates computed from successive polls"""
+
+__all__ = ["RateEngine"]
+
+
+import functools
+import time
+
+_COUNTER32 = 2**32
+
+
+@functools.lru_cache(maxsize=None)
+def _rate_name(counter):
+    """returns the name of the rate of ``counter`` and the scale of its delta"""
+    if counter.endswith("_bytes"):
+        return f"{counter[:-6]}_bps", 8
+    if counter.endswith("_packets"):
+        return f"{counter[:-8]}_pps", 1
+    return f"{counter}_per_second", 1
+
+
+class _Sample(object):
+    __slots__ = ("timestamp", "uptime", "counters", "bits")
+
+    def __init__(self, timestamp, uptime, counters, bits=None):
+        self.timestamp = timestamp
+        self.uptime = uptime
+        self.counters = counters
+        self.bits = bits
+
+
+class RateEngine(object):
+    """
+    Computes the rates of the interface counters from the successive
+    samples of each device, keeping only the last sample of each interface.
+    Counters which decrease wrapped when they are 32-bit (Counter32) and
+    were reset when they are 64-bit (Counter64), whose wrap takes years, or
+    of unknown width; a device whose uptime is lower than expected
+    restarted. Rates are not computed across resets, restarts and changes
+    of the width of the counters (discontinuities).
+    """
+
+    # sysUpTime counts hundredths of second in 32 bits, it wraps after 497 days
+    uptime_wrap = _COUNTER32 / 100
+
+    def __init__(self, tolerance=30, clock=time.monotonic):
+        """
+        ``tolerance`` is the number of seconds which the uptime may lag
+        behind the time elapsed between two samples (eg: because of the
+        duration of the polls) before the device is considered restarted;
+        ``clock`` returns the time of the samples which do not specify it
+        """
+        self.tolerance = tolerance
+        self._clock = clock
+        # device -> interface -> last _Sample
+        self._devices = {}
+        self.discontinuities = 0
+
+    def __len__(self):
+        return sum(len(samples) for samples in self._devices.values())
+
+    def __repr__(self):
+        return f"<RateEngine: {len(self._devices)} devices, {len(self)} interfaces>"
+
+    def update(self, device, monitoring, timestamp=None, bits=None):
+        """
+        samples the interface statistics of ``monitoring``, the
+        DeviceMonitoring dict of ``device`` returned by to_dict(), and
+        returns the rates of its interfaces by name (eg: ``rx_bps``,
+        ``tx_pps``), omitting those sampled for the first time or after a
+        discontinuity; the interfaces which disappeared are forgotten.
+        The width of the counters is the ``counter_bits`` of each interface,
+        or ``bits`` when it does not report it (see sample())
+        """
+        if timestamp is None:
+            timestamp = self._clock()
+        uptime = (monitoring.get("general") or {}).get("uptime")
+        previous = self._devices.get(device, {})
+        samples = {}
+        rates = {}
+        for interface in monitoring.get("interfaces") or ():
+            counters = interface.get("statistics")
+            if not counters:
+                continue
+            name = interface["name"]
+            samples[name], interface_rates = self._sample(
+                previous.get(name),
+                counters,
+                timestamp,
+                uptime,
+                interface.get("counter_bits", bits),
+            )
+            if interface_rates is not None:
+                rates[name] = interface_rates
+        self._devices[device] = samples
+        return rates
+
+    def sample(
+        self, device, interface, counters, timestamp=None, uptime=None, bits=None
+    ):
+        """
+        samples the ``counters`` (a dict of counter values, eg: the octets
+        returned by interfaces_bytes()) of an ``interface`` of ``device``
+        and returns their rates, or None on the first sample and after a
+        discontinuity; ``uptime`` (seconds) enables the detection of the
+        restarts and ``bits`` (32 or 64) sets the width of the counters,
+        otherwise a counter which decreased is never taken for a wrap
+        """
+        if timestamp is None:
+            timestamp = self._clock()
+        samples = self._devices.setdefault(device, {})
+        samples[interface], rates = self._sample(
+            samples.get(interface), counters, timestamp, uptime, bits
+        )
+        return rates
+
+    def update_snapshot(self, device, snapshot):
+        """
+        samples the ``snapshot`` of ``device`` returned by counters_snapshot()
+        and returns the rates of its interfaces by name; the time elapsed
+        between two samples is measured by the sysUpTime of the agent, read
+        in the same request as the counters
+        """
+        samples = self._devices.setdefault(device, {})
+        rates = {}
+        for interface in snapshot:
+            name = interface["name"]
+            samples[name], interface_rates = self._sample(
+                samples.get(name),
+                interface["counters"],
+                interface["received"],
+                interface["uptime"],
+                interface["bits"],
+                agent_clock=True,
+            )
+            if interface_rates is not None:
+                rates[name] = interface_rates
+        return rates
+
+    def forget(self, device):
+        """forgets the samples of ``device``"""
+        self._devices.pop(device, None)
+
+    def _sample(self, previous, counters, timestamp, uptime, bits, agent_clock=False):
+        """
+        returns the new sample and the rates since ``previous``; with
+        ``agent_clock`` the rates are computed over the time elapsed on
+        the device (``uptime``), which does not depend on the network
+        """
+        sample = _Sample(timestamp, uptime, dict(counters), bits)
+        if previous is None:
+            return sample, None
+        if None not in (previous.bits, bits) and previous.bits != bits:
+            # eg: the 64-bit counters are no longer available
+            self.discontinuities += 1
+            return sample, None
+        elapsed = timestamp - previous.timestamp
+        if elapsed <= 0:
+            return sample, None
+        if self._restarted(previous.uptime, uptime, elapsed):
+            self.discontinuities += 1
+            return sample, None
+        if agent_clock and uptime > previous.uptime:
+            elapsed = uptime - previous.uptime
+        rates = {}
+        for counter, value in sample.counters.items():
+            last = previous.counters.get(counter)
+            if last is None or value is None:
+                continue
+            delta = self._delta(last, value, bits)
+            if delta is None:
+                self.discontinuities += 1
+                return sample, None
+            name, scale = _rate_name(counter)
+            rates[name] = delta * scale / elapsed
+        return sample, rates
+
+    def _restarted(self, previous_uptime, uptime, elapsed):
+        if previous_uptime is None or uptime is None:
+            return False
+        expected = previous_uptime + elapsed
+        if uptime < previous_uptime and expected >= self.uptime_wrap:
+            expected -= self.uptime_wrap
+        return uptime + self.tolerance < expected
+
+    @staticmethod
+    def _delta(last, value, bits):
+        """
+        returns the increase of a counter, None when it was reset; only the
+        32-bit counters wrap, a 64-bit counter reset below 2**32 could not
+        be told from a wrap when the width is unknown
+        """
+        if value >= last:
+            return value - last
+        if bits != 32:
+            return None
+        return value - last + _COUNTER32
@@ -1,7 +1,7 @@
 import unittest
 
 from jsonschema import ValidationError, validate
-from netaddr import AddrFormatError
+from netaddr import EUI, AddrFormatError
 
 from netengine import __version__, get_version
 from netengine.backends import BaseBackend
@@ -90,6 +90,28 @@ class TestBaseBackend(unittest.TestCase):
         with self.assertRaises(AddrFormatError):
             device.get_manufacturer("wrong MAC")
 
+    def test_get_manufacturer(self):
+        device = BaseBackend()
+        mac_address = "00:16:3e:00:00:01"
+        self.assertEqual(
+            device.get_manufacturer(mac_address),
+            EUI(mac_address).oui.registration().org,
+        )
+        self.assertEqual(device.get_manufacturer("02:00:00:00:00:00"), "")
+        self.assertEqual(device.get_manufacturer(""), "")
+        self.assertEqual(
+            device.get_manufacturer("00-16-3e-ff-fe-00-00-01"), "Xensource, Inc."
+        )
+
+    def test_get_manufacturers(self):
+        device = BaseBackend()
+        self.assertEqual(
+            device.get_manufacturers(["00:16:3e:00:00:01", "02:00:00:00:00:00"]),
+            {"00:16:3e:00:00:01": "Xensource, Inc.", "02:00:00:00:00:00": ""},
+        )
+        with self.assertRaises(AddrFormatError):
+            device.get_manufacturers(["00:16:3e:00:00:01", "wrong MAC"])
+
     def test_load_length(self):
         """DeviceMonitoring load values represent the 1, 5, and 15 minute averages."""
         with self.assertRaisesRegex(
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import unittest
 
@@ -27,3 +28,7 @@ class TestDummyBackend(unittest.TestCase):
         json_string = self.dummy.to_json(autowalk=False)
         self.assertTrue(isinstance(json_string, str))
         json.loads(json_string)
+
+    def test_ato_json(self):
+        json_string = asyncio.run(self.dummy.ato_json(autowalk=False))
+        self.assertEqual(json_string, self.dummy.to_json(autowalk=False))
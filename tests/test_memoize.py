@@ -0,0 +1,76 @@
+import gc
+import unittest
+
+from netengine.backends import Dummy, memoize
+from netengine.backends.snmp import SnmpDump
+
+__all__ = ["TestMemoize"]
+
+
+class CountingBackend(Dummy):
+    def __init__(self):
+        self.calls = 0
+
+    @memoize
+    def interfaces(self, snmpdump=None):
+        self.calls += 1
+        return [self.calls]
+
+    @memoize
+    def interface(self, index, snmpdump=None):
+        self.calls += 1
+        return (index, self.calls)
+
+
+class TestMemoize(unittest.TestCase):
+    def setUp(self):
+        self.device = CountingBackend()
+
+    def test_same_dump(self):
+        snmpdump = SnmpDump()
+        first = self.device.interfaces(snmpdump=snmpdump)
+        self.assertIs(self.device.interfaces(snmpdump), first)
+        self.assertEqual(self.device.calls, 1)
+        self.assertEqual(self.device.memo.hits, 1)
+        self.assertEqual(self.device.memo.misses, 1)
+        self.assertEqual(self.device.memo.stats(), {"hits": 1, "misses": 1, "size": 1})
+
+    def test_other_dump(self):
+        first_dump, second_dump = SnmpDump(), SnmpDump()
+        self.assertEqual(self.device.interfaces(snmpdump=first_dump), [1])
+        self.assertEqual(self.device.interfaces(snmpdump=second_dump), [2])
+        self.assertEqual(self.device.interfaces(snmpdump=first_dump), [3])
+
+    def test_plain_dict_dump(self):
+        first_dump, second_dump = {}, {}
+        self.assertEqual(self.device.interfaces(snmpdump=first_dump), [1])
+        self.assertEqual(self.device.interfaces(snmpdump=first_dump), [1])
+        self.assertEqual(self.device.interfaces(snmpdump=second_dump), [2])
+
+    def test_arguments(self):
+        snmpdump = SnmpDump()
+        self.assertEqual(self.device.interface(1, snmpdump=snmpdump), (1, 1))
+        self.assertEqual(self.device.interface(2, snmpdump=snmpdump), (2, 2))
+        self.assertEqual(self.device.interface(index=1, snmpdump=snmpdump), (1, 1))
+        self.assertEqual(self.device.interface([1], snmpdump=snmpdump), ([1], 3))
+        self.assertEqual(self.device.interface([1], snmpdump=snmpdump), ([1], 4))
+
+    def test_dump_is_weakly_referenced(self):
+        snmpdump = SnmpDump()
+        self.device.interfaces(snmpdump=snmpdump)
+        del snmpdump
+        gc.collect()
+        self.assertEqual(self.device.memo.stats()["size"], 0)
+
+    def test_live_values(self):
+        self.assertEqual(self.device.interfaces(), [1])
+        self.assertEqual(self.device.interfaces(), [2])
+        self.device._memoize_live_values = True
+        self.assertEqual(self.device.interfaces(), [3])
+        self.assertEqual(self.device.interfaces(), [3])
+
+    def test_invalidate(self):
+        snmpdump = SnmpDump()
+        self.device.interfaces(snmpdump=snmpdump)
+        self.device.memo.invalidate()
+        self.assertEqual(self.device.interfaces(snmpdump=snmpdump), [2])
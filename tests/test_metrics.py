@@ -0,0 +1,82 @@
+import unittest
+import urllib.error
+import urllib.request
+
+from netengine.metrics import Counter, Histogram, MetricsRegistry, start_http_server
+
+__all__ = ["TestMetrics"]
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.metrics = MetricsRegistry()
+
+    def test_counter(self):
+        counter = Counter("requests_total", "Requests", ("host",))
+        counter.inc(labels=("a",))
+        counter.inc(2, ("a",))
+        counter.inc(labels=("b",))
+        self.assertEqual(counter.value(("a",)), 3)
+        self.assertEqual(counter.value(("c",)), 0)
+        with self.assertRaises(ValueError):
+            counter.inc(-1)
+
+    def test_histogram(self):
+        histogram = Histogram("seconds", "Seconds", buckets=(0.1, 1))
+        for value in (0.05, 0.1, 0.5, 2):
+            histogram.observe(value)
+        self.assertEqual(histogram.count(), 4)
+        self.assertEqual(
+            list(histogram.samples()),
+            [
+                ("_bucket", (), 'le="0.1"', 2),
+                ("_bucket", (), 'le="1"', 3),
+                ("_bucket", (), 'le="+Inf"', 4),
+                ("_sum", (), "", 2.65),
+                ("_count", (), "", 4),
+            ],
+        )
+        with self.assertRaises(ValueError):
+            Histogram("seconds", "Seconds", buckets=(1, 0.1))
+
+    def test_registry(self):
+        counter = self.metrics.counter("polls_total", "Polls")
+        self.assertIs(self.metrics.counter("polls_total", "Polls"), counter)
+        self.metrics.histogram("poll_seconds", "Seconds")
+        self.assertEqual(
+            list(self.metrics), [counter, self.metrics._metrics["poll_seconds"]]
+        )
+        with self.assertRaises(ValueError):
+            self.metrics.histogram("polls_total", "Polls")
+
+    def test_render(self):
+        self.metrics.counter("polls_total", "Polled devices", ("host",)).inc(
+            labels=('a"b\\c\nd',)
+        )
+        self.metrics.histogram("poll_seconds", "Poll time", buckets=(1,)).observe(0.5)
+        self.assertEqual(
+            self.metrics.render(),
+            "# HELP polls_total Polled devices\n"
+            "# TYPE polls_total counter\n"
+            'polls_total{host="a\\"b\\\\c\\nd"} 1\n'
+            "# HELP poll_seconds Poll time\n"
+            "# TYPE poll_seconds histogram\n"
+            'poll_seconds_bucket{le="1"} 1\n'
+            'poll_seconds_bucket{le="+Inf"} 1\n'
+            "poll_seconds_sum 0.5\n"
+            "poll_seconds_count 1\n",
+        )
+
+    def test_http_server(self):
+        self.metrics.counter("polls_total", "Polls").inc()
+        server = start_http_server(self.metrics, port=0)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}"
+            with urllib.request.urlopen(f"{url}/metrics") as response:
+                self.assertIn("text/plain", response.headers["Content-Type"])
+                self.assertIn(b"polls_total 1\n", response.read())
+            with self.assertRaises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"{url}/other")
+        finally:
+            server.shutdown()
+            server.server_close()
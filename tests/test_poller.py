@@ -0,0 +1,208 @@
+import asyncio
+import contextlib
+import os
+import unittest
+from unittest.mock import patch
+
+from netengine.backends import Dummy
+from netengine.backends.snmp import OpenWRT
+from netengine.backends.snmp.simulator import SNMPAgent, load_fixture
+from netengine.exceptions import NetEngineError
+from netengine.metrics import MetricsRegistry
+from netengine.poller import Poller
+
+__all__ = ["TestPoller"]
+
+FIXTURE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "static", "test-openwrt-snmp-oid.json"
+)
+
+
+class SlowBackend(Dummy):
+    running = 0
+    max_running = 0
+
+    async def ato_dict(self, autowalk=True):
+        cls = type(self)
+        cls.running += 1
+        cls.max_running = max(cls.max_running, cls.running)
+        try:
+            await asyncio.sleep(float(self.port))
+        finally:
+            cls.running -= 1
+        if self.host == "broken":
+            raise NetEngineError("broken device")
+        return {"host": self.host}
+
+
+class TestPoller(unittest.TestCase):
+    def setUp(self):
+        SlowBackend.running = SlowBackend.max_running = 0
+
+    def test_poll(self):
+        results = Poller().poll([(Dummy, "10.40.0.1"), (Dummy, "10.40.0.2", {})])
+        self.assertEqual(
+            [result.host for result in results], ["10.40.0.1", "10.40.0.2"]
+        )
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(results[0].result, Dummy("10.40.0.1").to_dict())
+        self.assertIsInstance(results[0].device, Dummy)
+
+    def test_concurrency_limit(self):
+        targets = [(SlowBackend, f"10.40.0.{i}", {"port": 0.01}) for i in range(20)]
+        results = Poller(concurrency=3).poll(targets)
+        self.assertEqual(len(results), 20)
+        self.assertEqual(SlowBackend.max_running, 3)
+
+    def test_errors_do_not_abort_the_batch(self):
+        targets = [
+            (SlowBackend, "broken", {"port": 0}),
+            (SlowBackend, "10.40.0.1", {"port": 0}),
+            (SlowBackend, "10.40.0.2", {"unknown": "argument"}),
+        ]
+        with self.assertLogs("netengine.poller", "WARNING"):
+            results = {result.host: result for result in Poller().poll(targets)}
+        self.assertIsInstance(results["broken"].error, NetEngineError)
+        self.assertEqual(results["10.40.0.1"].result, {"host": "10.40.0.1"})
+        self.assertIsInstance(results["10.40.0.2"].error, TypeError)
+        self.assertIsNone(results["10.40.0.2"].device)
+
+    def test_malformed_target(self):
+        metrics = MetricsRegistry()
+        results = Poller(metrics=metrics).poll([(Dummy,), (Dummy, "10.40.0.1")])
+        results = {result.host: result for result in results}
+        self.assertIsInstance(results[None].error, ValueError)
+        self.assertTrue(results["10.40.0.1"].ok)
+        polls = metrics.counter("netengine_polls_total", "")
+        self.assertEqual(polls.value(("unknown", "error")), 1)
+
+    def test_timeout(self):
+        targets = [
+            (SlowBackend, "slow", {"port": 5}),
+            (SlowBackend, "fast", {"port": 0}),
+        ]
+        with self.assertLogs("netengine.poller", "WARNING"):
+            results = {r.host: r for r in Poller(timeout=0.05).poll(targets)}
+        self.assertRegex(str(results["slow"].error), "timed out")
+        self.assertTrue(results["fast"].ok)
+
+    def test_callback(self):
+        received = []
+
+        async def callback(result):
+            received.append(result.host)
+
+        Poller(callback=received.append).poll([(Dummy, "10.40.0.1")])
+        Poller(callback=callback).poll([(Dummy, "10.40.0.2")])
+        self.assertEqual(received[0].host, "10.40.0.1")
+        self.assertEqual(received[1], "10.40.0.2")
+
+    def test_callback_errors_do_not_abort_the_batch(self):
+        def callback(result):
+            if result.host == "10.40.0.1":
+                raise ValueError("callback error")
+
+        with self.assertLogs("netengine.poller", "ERROR"):
+            results = Poller(callback=callback).poll(
+                [(Dummy, "10.40.0.1"), (Dummy, "10.40.0.2")]
+            )
+        self.assertEqual(len(results), 2)
+
+    def test_early_stop(self):
+        """the workers are done once the consumer stops iterating"""
+
+        async def poll():
+            targets = [(SlowBackend, f"10.40.0.{i}", {"port": 0.01}) for i in range(20)]
+            async with contextlib.aclosing(
+                Poller(concurrency=2).apoll(targets)
+            ) as results:
+                async for result in results:
+                    break
+            self.assertEqual(SlowBackend.running, 0)
+            self.assertEqual(asyncio.all_tasks(), {asyncio.current_task()})
+            return result
+
+        self.assertTrue(asyncio.run(poll()).ok)
+
+    def test_async_iterator(self):
+        async def poll():
+            targets = [(SlowBackend, "slow", {"port": 0.05}), (Dummy, "fast")]
+            return [result.host async for result in Poller().apoll(targets)]
+
+        self.assertEqual(asyncio.run(poll()), ["fast", "slow"])
+
+    def test_invalid_concurrency(self):
+        with self.assertRaises(ValueError):
+            Poller(concurrency=0)
+
+    def test_snmp_backends_share_one_engine(self):
+        engines = []
+
+        async def ato_dict(device):
+            engines.append(device.engine)
+            return {}
+
+        with patch.object(OpenWRT, "ato_dict", ato_dict):
+            results = Poller().poll([(OpenWRT, "192.0.2.1"), (OpenWRT, "192.0.2.2")])
+        self.assertIsNotNone(engines[0])
+        self.assertIs(engines[0], engines[1])
+        self.assertIsNone(results[0].device.engine)
+
+    def test_snmp_communities(self):
+        """the devices sharing the engine keep their own community"""
+        snmpdump = load_fixture(FIXTURE)
+
+        async def poll():
+            agents = [
+                await SNMPAgent(snmpdump, community=community).start()
+                for community in ("public", "secret")
+            ]
+            try:
+                targets = [
+                    (
+                        OpenWRT,
+                        "127.0.0.1",
+                        {"port": agent.port, "community": agent.community},
+                    )
+                    for agent in agents
+                ]
+                poller = Poller(timeout=10, concurrency=1)
+                return [result async for result in poller.apoll(targets)]
+            finally:
+                for agent in agents:
+                    agent.close()
+
+        results = asyncio.run(poll())
+        self.assertEqual([result.error for result in results], [None, None])
+
+    def test_metrics(self):
+        metrics = MetricsRegistry()
+        Poller(metrics=metrics).poll(
+            [
+                (SlowBackend, "10.40.0.1", {"port": 0}),
+                (SlowBackend, "broken", {"port": 0}),
+            ]
+        )
+        polls = metrics.counter("netengine_polls_total", "")
+        self.assertEqual(polls.value(("SlowBackend", "ok")), 1)
+        self.assertEqual(polls.value(("SlowBackend", "error")), 1)
+        histogram = metrics.histogram("netengine_poll_seconds", "")
+        self.assertEqual(histogram.count(("SlowBackend",)), 2)
+
+    def test_metrics_are_shared_with_the_devices(self):
+        metrics = MetricsRegistry()
+        devices = []
+
+        async def ato_dict(device):
+            devices.append(device)
+            return {}
+
+        with patch.object(OpenWRT, "ato_dict", ato_dict):
+            Poller(metrics=metrics).poll(
+                [(OpenWRT, "192.0.2.1"), (OpenWRT, "192.0.2.2", {"metrics": None})]
+            )
+        self.assertIs(devices[0].metrics, metrics)
+        own = MetricsRegistry()
+        with patch.object(OpenWRT, "ato_dict", ato_dict):
+            Poller(metrics=metrics).poll([(OpenWRT, "192.0.2.1", {"metrics": own})])
+        self.assertIs(devices[-1].metrics, own)
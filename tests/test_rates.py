@@ -0,0 +1,132 @@
+import unittest
+
+from netengine.backends.snmp import OpenWRT, SnmpDump
+from netengine.rates import RateEngine
+
+__all__ = ["TestRateEngine"]
+
+
+def monitoring(uptime, *interfaces):
+    return {
+        "type": "DeviceMonitoring",
+        "general": {"uptime": uptime},
+        "interfaces": [
+            {"name": name, "statistics": {"rx_bytes": rx, "tx_bytes": tx}}
+            for name, rx, tx in interfaces
+        ],
+    }
+
+
+class TestRateEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = RateEngine()
+
+    def test_update(self):
+        self.assertEqual(
+            self.engine.update("host", monitoring(100, ("eth0", 0, 0)), timestamp=0),
+            {},
+        )
+        rates = self.engine.update(
+            "host", monitoring(110, ("eth0", 1000, 500)), timestamp=10
+        )
+        self.assertEqual(rates, {"eth0": {"rx_bps": 800, "tx_bps": 400}})
+
+    def test_counter32_wrap(self):
+        self.engine.sample(
+            "host", "eth0", {"rx_bytes": 2**32 - 100}, timestamp=0, bits=32
+        )
+        rates = self.engine.sample(
+            "host", "eth0", {"rx_bytes": 100}, timestamp=1, bits=32
+        )
+        self.assertEqual(rates, {"rx_bps": 1600})
+        self.assertEqual(self.engine.discontinuities, 0)
+
+    def test_counter32_wrap_to_dict(self):
+        """the width of the counters is read from the to_dict() interfaces"""
+        device = OpenWRT("192.0.2.1")
+        results = []
+        for rx_bytes in (2**32 - 100, 100):
+            # only the 32-bit ifTable counters are available
+            snmpdump = SnmpDump()
+            snmpdump.add("1.3.6.1.2.1.2.2.1.1.1", 1)
+            snmpdump.add("1.3.6.1.2.1.2.2.1.2.1", "eth0")
+            snmpdump.add("1.3.6.1.2.1.2.2.1.10.1", rx_bytes)
+            results.append(
+                device.to_dict(snmpdump=snmpdump, fields=["interfaces.statistics"])
+            )
+        self.assertEqual(results[0]["interfaces"][0]["counter_bits"], 32)
+        self.assertEqual(self.engine.update("host", results[0], timestamp=0), {})
+        rates = self.engine.update("host", results[1], timestamp=1)
+        self.assertEqual(rates, {"eth0": {"rx_bps": 1600}})
+        self.assertEqual(self.engine.discontinuities, 0)
+
+    def test_counter64_reset(self):
+        self.engine.sample("host", "eth0", {"rx_bytes": 2**40}, timestamp=0)
+        self.assertIsNone(
+            self.engine.sample("host", "eth0", {"rx_bytes": 100}, timestamp=1)
+        )
+        self.assertEqual(self.engine.discontinuities, 1)
+        # the new value is the baseline of the next rate
+        rates = self.engine.sample("host", "eth0", {"rx_bytes": 200}, timestamp=2)
+        self.assertEqual(rates, {"rx_bps": 800})
+        # counters declared 64-bit are never wrapped
+        self.engine.sample("host", "eth1", {"rx_packets": 10}, timestamp=0, bits=64)
+        self.assertIsNone(
+            self.engine.sample("host", "eth1", {"rx_packets": 5}, timestamp=1, bits=64)
+        )
+
+    def test_counter64_reset_below_32_bits(self):
+        """a counter of unknown width which decreased is never wrapped"""
+        self.engine.sample("host", "eth0", {"rx_bytes": 2**31}, timestamp=0)
+        self.assertIsNone(
+            self.engine.sample("host", "eth0", {"rx_bytes": 100}, timestamp=1)
+        )
+        self.engine.sample("host", "eth1", {"rx_bytes": 2**31}, timestamp=0, bits=64)
+        self.assertIsNone(
+            self.engine.sample("host", "eth1", {"rx_bytes": 100}, timestamp=1, bits=64)
+        )
+        self.assertEqual(self.engine.discontinuities, 2)
+
+    def test_width_change(self):
+        self.engine.sample("host", "eth0", {"rx_bytes": 100}, timestamp=0, bits=64)
+        self.assertIsNone(
+            self.engine.sample("host", "eth0", {"rx_bytes": 200}, timestamp=1, bits=32)
+        )
+        self.assertEqual(self.engine.discontinuities, 1)
+
+    def test_restart(self):
+        self.engine.update("host", monitoring(1000, ("eth0", 5000, 0)), timestamp=0)
+        # the counters increased but the device restarted in the meantime
+        rates = self.engine.update(
+            "host", monitoring(200, ("eth0", 9000, 0)), timestamp=300
+        )
+        self.assertEqual(rates, {})
+        self.assertEqual(self.engine.discontinuities, 1)
+        rates = self.engine.update(
+            "host", monitoring(500, ("eth0", 9300, 0)), timestamp=600
+        )
+        self.assertEqual(rates, {"eth0": {"rx_bps": 8, "tx_bps": 0}})
+
+    def test_uptime_wrap(self):
+        uptime = int(RateEngine.uptime_wrap) - 100
+        self.engine.sample("host", "eth0", {"rx_bytes": 0}, timestamp=0, uptime=uptime)
+        rates = self.engine.sample(
+            "host", "eth0", {"rx_bytes": 300}, timestamp=300, uptime=199
+        )
+        self.assertEqual(rates, {"rx_bps": 8})
+
+    def test_rate_names(self):
+        self.engine.sample("host", "wlan0", {"tx_packets": 0, "rx_errors": 0}, 0)
+        rates = self.engine.sample(
+            "host", "wlan0", {"tx_packets": 4, "rx_errors": 2}, 2
+        )
+        self.assertEqual(rates, {"tx_pps": 2, "rx_errors_per_second": 1})
+
+    def test_forget(self):
+        self.engine.update("host", monitoring(0, ("eth0", 0, 0), ("eth1", 0, 0)), 0)
+        self.assertEqual(len(self.engine), 2)
+        # the interfaces which disappeared are forgotten
+        self.engine.update("host", monitoring(1, ("eth0", 0, 0)), 1)
+        self.assertEqual(len(self.engine), 1)
+        self.engine.forget("host")
+        self.assertEqual(len(self.engine), 0)
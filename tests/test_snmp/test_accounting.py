@@ -0,0 +1,171 @@
+import asyncio
+import os
+import unittest
+from unittest.mock import patch
+
+from netengine.backends.snmp import InterfaceFilter, OpenWRT, RequestAccounting
+from netengine.backends.snmp.simulator import load_fixture, start_agents
+
+from ..utils import MockOutputMixin
+
+__all__ = ["TestRequestAccounting"]
+
+FIXTURE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "static",
+    "test-openwrt-snmp-oid.json",
+)
+
+
+class TestRequestAccounting(unittest.TestCase, MockOutputMixin):
+    def setUp(self):
+        self.snmpdump = load_fixture(FIXTURE)
+        self.accounting = RequestAccounting()
+
+    def _poll(self, version):
+        """polls a local agent, returns the requests which it received"""
+
+        async def poll():
+            (agent,) = await start_agents(self.snmpdump, 1)
+            try:
+                device = OpenWRT(
+                    "127.0.0.1",
+                    port=agent.port,
+                    version=version,
+                    accounting=self.accounting,
+                )
+                await device.ato_dict()
+                return agent.requests
+            finally:
+                agent.close()
+
+        return asyncio.run(poll())
+
+    def test_autowalk(self):
+        for version, kind in ((1, "getnext"), (2, "getbulk")):
+            self.accounting.reset()
+            requests = self._poll(version)
+            stats = self.accounting.stats()
+            self.assertEqual(stats["total"]["requests"], requests)
+            self.assertEqual(set(stats["kinds"]), {"get", kind})
+            self.assertEqual(set(stats["methods"]), {"autowalk"})
+            self.assertEqual(stats["total"]["errors"], 0)
+            self.assertGreater(stats["total"]["bytes"], stats["total"]["varbinds"])
+            # each ifDescr is read by a GETNEXT, the last one ends the walk
+            if version == 1:
+                self.assertEqual(
+                    stats["subtrees"]["1.3.6.1.2.1.2.2.1.2"]["requests"], 9
+                )
+
+    def test_history(self):
+        self.accounting = RequestAccounting(history=5)
+        requests = self._poll(2)
+        self.assertEqual(len(self.accounting.requests), 5)
+        self.assertEqual(self.accounting.total.requests, requests)
+        self.assertEqual(
+            set(self.accounting.requests[0]),
+            {"host", "kind", "method", "subtrees", "varbinds", "bytes", "seconds"}
+            | {"error"},
+        )
+
+    def test_methods(self):
+        """the requests of to_dict() without autowalk are accounted by section"""
+        data = self._load_mock_json("/static/test-openwrt-snmp-oid.json")
+        device = OpenWRT("192.0.2.1", accounting=self.accounting)
+        with patch(
+            "netengine.backends.snmp.base.get_cmd",
+            side_effect=lambda *args: self._get_mocked_getcmd(data=data, input=args),
+        ), patch(
+            "netengine.backends.snmp.base.walk_cmd",
+            side_effect=lambda *args, **kwargs: self._get_mocked_walkcmd(
+                self._get_mocked_nextcmd(*args)
+            ),
+        ):
+            device.to_dict(autowalk=False, fields=["general", "interfaces.mtu"])
+            device.interfaces_mtu()
+        methods = self.accounting.stats()["methods"]
+        self.assertEqual(
+            set(methods), {"general_to_dict", "interfaces_to_dict", "interfaces_mtu"}
+        )
+        # the GET of sysName is accounted to the sysName scalar
+        self.assertIn("1.3.6.1.2.1.1.5", self.accounting.stats()["subtrees"])
+
+    def test_subtree_shares(self):
+        self.accounting.record(
+            "host",
+            "get",
+            "name",
+            ["1.3.6.1.2.1.2.2.1.4"] * 3 + ["1.3.6.1.2.1.1.5"],
+            4,
+            100,
+            0.4,
+        )
+        subtrees = self.accounting.stats()["subtrees"]
+        self.assertEqual(subtrees["1.3.6.1.2.1.2.2.1.4"]["varbinds"], 3)
+        self.assertEqual(subtrees["1.3.6.1.2.1.2.2.1.4"]["bytes"], 75)
+        self.assertEqual(subtrees["1.3.6.1.2.1.1.5"]["requests"], 1)
+        self.assertAlmostEqual(subtrees["1.3.6.1.2.1.1.5"]["seconds"], 0.1)
+
+    def test_explain(self):
+        device = OpenWRT("192.0.2.1")
+        plan = device.explain(fields=["general"])
+        self.assertEqual(
+            [(request["kind"], request["requests"]) for request in plan],
+            [("get", 1)],
+        )
+        self.assertIn("1.3.6.1.2.1.1.5.0", plan[0]["oids"])
+        plan = device.explain(fields=["interfaces.mtu"], snmpdump=self.snmpdump)
+        self.assertEqual(
+            [(request["oids"], request["requests"]) for request in plan],
+            [
+                (["1.3.6.1.2.1.2.2.1.1"], 9),
+                (["1.3.6.1.2.1.2.2.1.2"], 9),
+                (["1.3.6.1.2.1.2.2.1.4"], 6),
+                (["1.3.6.1.2.1.31.1.1.1.1"], 2),
+            ],
+        )
+        device._set_version(2)
+        plan = device.explain(fields=["interfaces.mtu"], snmpdump=self.snmpdump)
+        self.assertEqual([request["requests"] for request in plan], [1, 1, 1, 1])
+
+    def test_explain_deferred_columns(self):
+        device = OpenWRT(
+            "192.0.2.1", interface_filter=InterfaceFilter(include=["br-*"])
+        )
+        plan = device.explain(fields=["interfaces.mtu"])
+        self.assertEqual(
+            plan[-1],
+            {
+                "kind": "get",
+                "oids": ["1.3.6.1.2.1.2.2.1.4"],
+                "optional": False,
+                "requests": None,
+            },
+        )
+        plan = device.explain(fields=["interfaces.mtu"], snmpdump=self.snmpdump)
+        self.assertEqual(plan[-1]["oids"], ["1.3.6.1.2.1.2.2.1.4.5"])
+        self.assertEqual(plan[-1]["requests"], 1)
+
+    def test_explain_deferred_optional_columns(self):
+        """the optional counter columns are read only for the selected interfaces"""
+        device = OpenWRT(
+            "192.0.2.1", interface_filter=InterfaceFilter(include=["br-*"])
+        )
+        plan = device.explain(fields=["interfaces.statistics"])
+        walked = [request["oids"][0] for request in plan if request["kind"] == "walk"]
+        self.assertEqual(
+            walked,
+            ["1.3.6.1.2.1.2.2.1.1", "1.3.6.1.2.1.2.2.1.2", "1.3.6.1.2.1.31.1.1.1.1"],
+        )
+        self.assertIn("1.3.6.1.2.1.31.1.1.1.6", plan[-1]["oids"])
+        self.assertIn("1.3.6.1.2.1.2.2.1.11", plan[-1]["oids"])
+        self.assertFalse(plan[-1]["optional"])
+        plan = device.explain(fields=["interfaces.type"])
+        self.assertEqual(
+            plan[-1]["oids"], ["1.3.6.1.2.1.2.2.1.3", "1.2.840.10036.1.1.1.1"]
+        )
+
+    def test_explain_matches_poll(self):
+        requests = self._poll(2)
+        plan = OpenWRT("192.0.2.1", version=2).explain(snmpdump=self.snmpdump)
+        self.assertEqual(sum(request["requests"] for request in plan), requests)
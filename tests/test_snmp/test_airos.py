@@ -1,5 +1,6 @@
 import json
 import unittest
+from contextlib import ExitStack
 from datetime import timezone
 from unittest.mock import call, patch
 
@@ -98,10 +99,10 @@ class TestSNMPAirOS(unittest.TestCase, MockOutputMixin):
         with patch.object(self.device, "_value_to_retrieve", return_value=[1]):
             with patch.object(
                 self.device,
-                "get_value",
-                side_effect=lambda oid, snmpdump: (
-                    "first" if snmpdump is first_dump else "second"
-                ),
+                "get_values",
+                side_effect=lambda oids, snmpdump: {
+                    oid: "first" if snmpdump is first_dump else "second" for oid in oids
+                },
             ):
                 self.assertEqual(self.device.get_interfaces(first_dump), ["first"])
                 self.assertEqual(self.device.get_interfaces(second_dump), ["second"])
@@ -175,68 +176,107 @@ class TestSNMPAirOS(unittest.TestCase, MockOutputMixin):
         self.assertEqual(first["interfaces"][0]["statistics"]["tx_bytes"], 3214378817)
         self.assertEqual(second["interfaces"][0]["statistics"]["tx_bytes"], 42)
 
-    def test_autowalk_roots(self):
-        """AirOS metadata is split between standard and vendor OID roots."""
-        with patch.object(self.device, "walk", return_value={}) as walk:
-            with patch.object(self.device, "uptime", return_value=0):
-                with patch.object(self.device, "local_time", return_value=0):
-                    with patch.object(self.device, "name", return_value="device"):
-                        with patch.object(self.device, "model", return_value="model"):
-                            with patch.object(
-                                self.device, "os", return_value=("AirOS", "Linux")
-                            ):
-                                with patch.object(
-                                    self.device, "firmware", return_value="AirOS v1"
-                                ):
-                                    with patch.object(
-                                        self.device,
-                                        "resources_to_dict",
-                                        return_value={},
-                                    ):
-                                        with patch.object(
-                                            self.device,
-                                            "interfaces_to_dict",
-                                            return_value=[],
-                                        ):
-                                            self.device.to_dict()
-                                            self.device.to_dict(snmpdump={})
+    def _patch_sections(self, stack):
+        for method, value in (
+            ("uptime", 0),
+            ("local_time", 0),
+            ("name", "device"),
+            ("model", "model"),
+            ("os", ("AirOS", "Linux")),
+            ("firmware", "AirOS v1"),
+            ("resources_to_dict", {}),
+            ("interfaces_to_dict", []),
+        ):
+            stack.enter_context(patch.object(self.device, method, return_value=value))
+
+    def test_autowalk_plan(self):
+        """AirOS walks only the subtrees and scalars read by to_dict()."""
+        with ExitStack() as stack:
+            walk = stack.enter_context(
+                patch.object(self.device, "awalk", return_value={})
+            )
+            get_many = stack.enter_context(
+                patch.object(self.device, "aget_many", return_value={})
+            )
+            self._patch_sections(stack)
+            self.device.to_dict()
+            self.device.to_dict(snmpdump={})
+        self.assertEqual(
+            {walk_call.args[0] for walk_call in walk.call_args_list},
+            {"1.3.6.1.2.1.2.2.1.2", "1.2.840.10036.1.1.1.1"}
+            | set(self.device._autowalk_subtrees)
+            | set(self.device._optional_autowalk_subtrees),
+        )
+        self.assertNotIn(call("1.3.6"), walk.call_args_list)
+        get_many.assert_called_once_with(self.device._autowalk_scalars)
+
+    def test_autowalk_covers_to_dict(self):
+        self._assert_autowalk_covers(self.device)
+
+    def test_autowalk_covers_fields(self):
+        self._assert_autowalk_covers(
+            self.device, fields=["interfaces.statistics", "resources.load"]
+        )
+        self._assert_autowalk_covers(self.device, fields=["general", "hardware"])
+
+    def test_to_dict_fields(self):
+        fields = ["interfaces.statistics", "resources.load"]
+        result = self.device.to_dict(autowalk=False, fields=fields)
+        self.assertEqual(list(result), ["type", "resources", "interfaces"])
+        self.assertEqual(list(result["resources"]), ["load"])
+        for interface in result["interfaces"]:
+            self.assertEqual(list(interface), ["name", "statistics", "counter_bits"])
+        full = self.device.to_dict(autowalk=False)
+        self.assertEqual(result["resources"]["load"], full["resources"]["load"])
         self.assertEqual(
-            walk.call_args_list,
-            [call("1.3.6"), call("1.2.840.10036")],
-            "AirOS must preserve supplied dumps and autowalk both OID roots",
+            [interface["statistics"] for interface in result["interfaces"]],
+            [interface["statistics"] for interface in full["interfaces"]],
         )
 
+    def test_fields_plan(self):
+        plan = [set(part) for part in self.device._autowalk_plan()]
+        selected = self.device._autowalk_plan(["resources.load"])
+        self.assertEqual(selected, ((self.device._autowalk_subtrees[-1],), (), ()))
+        oids = set()
+        for field_oids in self.device._field_oids.values():
+            oids.update(field_oids)
+        # every OID collected by autowalk is read by some field
+        self.assertEqual(set().union(*plan), oids)
+
+    def test_unknown_field(self):
+        with self.assertRaisesRegex(ValueError, "unknown field"):
+            self.device.to_dict(fields=["interfaces.speed"])
+        with self.assertRaises(ValueError):
+            self.device.to_dict(fields="interfaces")
+
+    def test_autowalk_scalars(self):
+        with patch.object(self.device, "awalk", return_value={}):
+            snmpdump = self.device._autowalk()
+        self.assertEqual(snmpdump["1.3.6.1.2.1.1.5.0"][3][0][1], self.device.name())
+        self.assertNotIn("1.3.6.1.2.1.1.2.0", snmpdump)
+
     def test_autowalk_continues_without_vendor_data(self):
-        with patch.object(
-            self.device, "walk", side_effect=[{}, NetEngineError("unsupported")]
-        ) as walk:
-            with patch.object(self.device, "uptime", return_value=0):
-                with patch.object(self.device, "local_time", return_value=0):
-                    with patch.object(self.device, "name", return_value="device"):
-                        with patch.object(self.device, "model", return_value="model"):
-                            with patch.object(
-                                self.device, "os", return_value=("AirOS", "Linux")
-                            ):
-                                with patch.object(
-                                    self.device, "firmware", return_value="AirOS v1"
-                                ):
-                                    with patch.object(
-                                        self.device,
-                                        "resources_to_dict",
-                                        return_value={},
-                                    ):
-                                        with patch.object(
-                                            self.device,
-                                            "interfaces_to_dict",
-                                            return_value=[],
-                                        ):
-                                            with self.assertLogs(
-                                                "netengine.backends.snmp.airos",
-                                                "WARNING",
-                                            ):
-                                                result = self.device.to_dict()
+        def awalk(oid):
+            if oid in self.device._optional_autowalk_subtrees:
+                raise NetEngineError("unsupported")
+            return {}
+
+        with ExitStack() as stack:
+            walk = stack.enter_context(
+                patch.object(self.device, "awalk", side_effect=awalk)
+            )
+            self._patch_sections(stack)
+            with self.assertLogs("netengine.backends.snmp.base", "WARNING"):
+                result = self.device.to_dict()
         self.assertEqual(result["general"]["hostname"], "device")
-        self.assertEqual(walk.call_args_list, [call("1.3.6"), call("1.2.840.10036")])
+        self.assertIn(call("1.2.840.10036.1.1.1.1"), walk.call_args_list)
+
+    def test_autowalk_required_data_error(self):
+        with patch.object(
+            self.device, "awalk", side_effect=NetEngineError("request timed out")
+        ):
+            with self.assertRaisesRegex(NetEngineError, "request timed out"):
+                self.device.to_dict()
 
     def test_monitoring_metadata(self):
         """Serialized monitoring data follows the NetJSON metadata placement."""
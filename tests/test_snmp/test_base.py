@@ -1,7 +1,11 @@
+import asyncio
 import unittest
 from unittest.mock import patch
 
-from netengine.backends.snmp import SNMP, AirOS
+from pysnmp.proto.errind import requestTimedOut
+from pysnmp.proto.rfc1905 import noSuchInstance
+
+from netengine.backends.snmp import SNMP, AirOS, OpenWRT
 from netengine.exceptions import NetEngineError
 
 __all__ = ["TestSNMP"]
@@ -31,7 +35,8 @@ class TestSNMP(unittest.TestCase):
             "next",
             return_value=(Exception("request timed out"), 0, 0, ()),
         ):
-            self.assertEqual(self.device._value_to_retrieve(), [])
+            with self.assertRaisesRegex(NetEngineError, "request timed out"):
+                self.device._value_to_retrieve()
 
     def test_next_collects_walk_responses(self):
         async def walk_response(*args, **kwargs):
@@ -47,6 +52,607 @@ class TestSNMP(unittest.TestCase):
             )
         self.assertFalse(walk.call_args.kwargs["lexicographicMode"])
 
+    def _walk_response(self, rows, closed=None):
+        async def walk_response(*args, **kwargs):
+            try:
+                for index in range(1, rows + 1):
+                    yield None, 0, 0, ((f"1.3.6.1.2.1.2.2.1.2.{index}", "eth0"),)
+            finally:
+                if closed is not None:
+                    closed.append(True)
+
+        return walk_response
+
+    def test_iter_walk(self):
+        closed = []
+        with patch(
+            "netengine.backends.snmp.base.walk_cmd",
+            side_effect=self._walk_response(3, closed),
+        ):
+            var_binds = list(self.device.iter_walk("1.3.6.1.2.1.2.2.1.2"))
+        self.assertEqual(
+            [str(var_bind[0]) for var_bind in var_binds],
+            ["1.3.6.1.2.1.2.2.1.2.1", "1.3.6.1.2.1.2.2.1.2.2", "1.3.6.1.2.1.2.2.1.2.3"],
+        )
+        self.assertEqual(closed, [True])
+        self.assertIsNone(self.device._session)
+
+    def test_iter_walk_limits(self):
+        closed = []
+        with patch(
+            "netengine.backends.snmp.base.walk_cmd",
+            side_effect=self._walk_response(1000, closed),
+        ) as walk:
+            self.assertEqual(
+                len(list(self.device.iter_walk("1.3.6.1.2.1.2.2.1.2", max_oids=2))), 2
+            )
+            # each varbind is estimated 19 bytes: 10 dots + 5 + 4 of value
+            self.assertEqual(
+                len(list(self.device.iter_walk("1.3.6.1.2.1.2.2.1.2", max_bytes=60))),
+                3,
+            )
+        self.assertEqual(walk.call_count, 2)
+        self.assertEqual(closed, [True, True])
+
+    def test_iter_walk_stops_early(self):
+        closed = []
+        with patch(
+            "netengine.backends.snmp.base.walk_cmd",
+            side_effect=self._walk_response(1000, closed),
+        ):
+            walk = self.device.iter_walk("1.3.6.1.2.1.2.2.1.2")
+            next(walk)
+            walk.close()
+        self.assertEqual(closed, [True])
+        self.assertIsNone(self.device._session)
+
+    def test_aiter_walk_error(self):
+        async def walk_response(*args, **kwargs):
+            yield None, 0, 0, (("1.3.6.1.2.1.2.2.1.2.1", "eth0"),)
+            yield "No SNMP response received before timeout", 0, 0, ()
+
+        async def walk():
+            return [var_bind async for var_bind in self.device.aiter_walk("1.3.6")]
+
+        with patch("netengine.backends.snmp.base.walk_cmd", side_effect=walk_response):
+            with self.assertRaisesRegex(NetEngineError, "before timeout"):
+                asyncio.run(walk())
+
+    def test_version(self):
+        self.assertEqual(self.device.version, 1)
+        self.assertEqual(self.device.community.message_processing_model, 0)
+        device = SNMP("192.0.2.1", version=2)
+        self.assertEqual(device.community.message_processing_model, 1)
+        with self.assertRaises(ValueError):
+            SNMP("192.0.2.1", version=3)
+
+    def test_bulk_walk(self):
+        async def bulk_walk_response(*args, **kwargs):
+            yield None, 0, 0, ((0, 1), (0, 2))
+            yield None, 0, 0, ((0, 3),)
+
+        device = AirOS("192.0.2.1", version=2, max_repetitions=50)
+        with patch(
+            "netengine.backends.snmp.base.bulk_walk_cmd",
+            side_effect=bulk_walk_response,
+        ) as bulk_walk, patch("netengine.backends.snmp.base.walk_cmd") as walk:
+            self.assertEqual(
+                device.next("1.3.6.1.2.1.2.2.1.1"),
+                (None, 0, 0, [((0, 1),), ((0, 2),), ((0, 3),)]),
+            )
+        self.assertEqual(bulk_walk.call_args.args[4:6], (0, 50))
+        self.assertFalse(bulk_walk.call_args.kwargs["lexicographicMode"])
+        walk.assert_not_called()
+
+    def _bulk_fallback(self, device, probe_error):
+        """walks with a failing GETBULK, the GET probe fails with ``probe_error``"""
+
+        closed = []
+
+        async def bulk_walk_response(*args, **kwargs):
+            try:
+                yield requestTimedOut, 0, 0, ()
+            finally:
+                closed.append(True)
+
+        async def walk_response(*args, **kwargs):
+            # the GETBULK walk is closed before the GETNEXT one starts
+            self.assertEqual(closed, [True])
+            yield None, 0, 0, ((0, 1),)
+
+        with patch(
+            "netengine.backends.snmp.base.bulk_walk_cmd",
+            side_effect=bulk_walk_response,
+        ), patch(
+            "netengine.backends.snmp.base.walk_cmd", side_effect=walk_response
+        ) as walk, patch(
+            "netengine.backends.snmp.base.get_cmd",
+            return_value=(probe_error, 0, 0, [(0, 1)]),
+        ) as get:
+            result = device.next("1.3.6.1.2.1.2.2.1.1")
+        return result, walk, get
+
+    def test_bulk_walk_falls_back_to_snmpv1(self):
+        """an agent which does not answer SNMPv2c at all is an SNMPv1 one"""
+        device = AirOS("192.0.2.1", version=2)
+        with self.assertLogs("netengine.backends.snmp.base", "WARNING"):
+            result, walk, get = self._bulk_fallback(device, requestTimedOut)
+        self.assertEqual(result, (None, 0, 0, [((0, 1),)]))
+        self.assertEqual(get.call_args.args[1].message_processing_model, 1)
+        self.assertEqual(walk.call_args.args[1].message_processing_model, 0)
+        self.assertEqual(device.version, 1)
+
+    def test_bulk_walk_falls_back_to_getnext(self):
+        """an SNMPv2c agent which fails a GETBULK stays SNMPv2c"""
+        device = AirOS("192.0.2.1", version=2)
+        with self.assertLogs("netengine.backends.snmp.base", "WARNING"):
+            result, walk, _ = self._bulk_fallback(device, None)
+        self.assertEqual(result, (None, 0, 0, [((0, 1),)]))
+        self.assertEqual(walk.call_args.args[1].message_processing_model, 1)
+        self.assertEqual(device.version, 2)
+        self.assertTrue(device._v2c_answered)
+
+    def test_bulk_walk_timeout(self):
+        """the GETBULK timeouts of an SNMPv2c agent make it unreachable"""
+        device = AirOS("192.0.2.1", version=2)
+        device._v2c_answered = True
+        with device:
+            result, walk, get = self._bulk_fallback(device, None)
+            self.assertIs(device._session.unreachable, requestTimedOut)
+        self.assertEqual(result, (requestTimedOut, 0, 0, []))
+        walk.assert_not_called()
+        get.assert_not_called()
+        self.assertEqual(device.version, 2)
+
+    def _get_cmd(self, values, error_status=lambda oids: (0, 0)):
+        """mocks get_cmd answering with ``values``"""
+        requests = []
+
+        def get_cmd(engine, auth, transport, context, *var_binds):
+            oids = [
+                str(var_bind._ObjectType__args[0]._ObjectIdentity__args[0])
+                for var_bind in var_binds
+            ]
+            requests.append(oids)
+            status, index = error_status(oids)
+            if status:
+                return None, status, index, []
+            return None, 0, 0, [(oid, values.get(oid, noSuchInstance)) for oid in oids]
+
+        return get_cmd, requests
+
+    def test_get_many(self):
+        get_cmd, requests = self._get_cmd({"1.1": 1, "1.2": 2})
+        with patch("netengine.backends.snmp.base.get_cmd", side_effect=get_cmd):
+            self.assertEqual(
+                self.device.get_many(["1.1", "1.2", "1.3"]),
+                {"1.1": 1, "1.2": 2, "1.3": None},
+            )
+            self.assertEqual(self.device.get_many([]), {})
+        self.assertEqual(requests, [["1.1", "1.2", "1.3"]])
+
+    def test_get_values_empty_oid(self):
+        get_cmd, requests = self._get_cmd({"1.1": 1})
+        with patch("netengine.backends.snmp.base.get_cmd", side_effect=get_cmd):
+            self.assertEqual(
+                self.device.get_values(["", "1.1", " "]), {"": "", "1.1": "1"}
+            )
+            self.assertEqual(self.device.get_values([""]), {"": ""})
+        self.assertEqual(requests, [["1.1"]])
+
+    def test_get_many_batches(self):
+        oids = [f"1.3.6.1.2.1.2.2.1.10.{index}" for index in range(100)]
+        get_cmd, requests = self._get_cmd({})
+        with patch("netengine.backends.snmp.base.get_cmd", side_effect=get_cmd):
+            self.device.get_many(oids)
+        self.assertEqual(sum(requests, []), oids)
+        self.assertTrue(
+            all(len(batch) <= self.device.max_get_varbinds for batch in requests)
+        )
+        with patch.object(self.device, "max_message_size", 500):
+            get_cmd, requests = self._get_cmd({})
+            with patch("netengine.backends.snmp.base.get_cmd", side_effect=get_cmd):
+                self.device.get_many(oids)
+        self.assertEqual(sum(requests, []), oids)
+        self.assertGreater(len(requests), 3)
+
+    def test_get_many_too_big(self):
+        get_cmd, requests = self._get_cmd(
+            {"1.1": 1, "1.2": 2, "1.3": 3},
+            error_status=lambda oids: (1, 0) if len(oids) > 1 else (0, 0),
+        )
+        with patch("netengine.backends.snmp.base.get_cmd", side_effect=get_cmd):
+            self.assertEqual(
+                self.device.get_many(["1.1", "1.2", "1.3"]),
+                {"1.1": 1, "1.2": 2, "1.3": 3},
+            )
+        self.assertEqual(
+            requests, [["1.1", "1.2", "1.3"], ["1.1"], ["1.2", "1.3"], ["1.2"], ["1.3"]]
+        )
+
+    def test_get_many_no_such_name(self):
+        get_cmd, requests = self._get_cmd(
+            {"1.1": 1, "1.3": 3},
+            error_status=lambda oids: (
+                (2, oids.index("1.2") + 1) if "1.2" in oids else (0, 0)
+            ),
+        )
+        with patch("netengine.backends.snmp.base.get_cmd", side_effect=get_cmd):
+            self.assertEqual(
+                self.device.get_many(["1.1", "1.2", "1.3"]),
+                {"1.1": 1, "1.2": None, "1.3": 3},
+            )
+        self.assertEqual(requests, [["1.1", "1.2", "1.3"], ["1.1", "1.3"]])
+
+    def test_get_many_error(self):
+        with patch(
+            "netengine.backends.snmp.base.get_cmd",
+            return_value=(Exception("request timed out"), 0, 0, []),
+        ):
+            with self.assertRaisesRegex(NetEngineError, "request timed out"):
+                self.device.get_many(["1.1"])
+
+    def test_get_many_dump(self):
+        snmpdump = {"1.1": [None, None, None, [[None, "value"]]]}
+        with patch("netengine.backends.snmp.base.get_cmd") as get_cmd:
+            self.assertEqual(
+                self.device.get_many(["1.1", "1.2"], snmpdump=snmpdump),
+                {"1.1": "value", "1.2": None},
+            )
+            self.assertEqual(
+                self.device.get_values(["1.1", "1.2"], snmpdump=snmpdump),
+                {"1.1": "value", "1.2": ""},
+            )
+        get_cmd.assert_not_called()
+
+    def test_session_reuses_engine_and_transport(self):
+        with patch(
+            "netengine.backends.snmp.base.get_cmd",
+            return_value=(None, 0, 0, [[None, "value"]]),
+        ) as get, patch("netengine.backends.snmp.session.SnmpEngine") as engine:
+            with self.device:
+                self.device.get("1.3.6.1.2.1.1.5.0")
+                self.device.get("1.3.6.1.2.1.1.3.0")
+                session = self.device._session
+            self.assertIsNone(self.device._session)
+            self.assertTrue(session.loop.is_closed())
+        engine.assert_called_once_with()
+        self.assertEqual(get.call_count, 2)
+        first, second = get.call_args_list
+        self.assertIs(first.args[0], second.args[0])
+        self.assertIs(first.args[2], second.args[2])
+
+    def test_timeout_and_retries(self):
+        device = AirOS("192.0.2.1", timeout=0.5, retries=2)
+        with patch(
+            "netengine.backends.snmp.base.get_cmd",
+            return_value=(None, 0, 0, [[None, "value"]]),
+        ), patch("netengine.backends.snmp.session.UdpTransportTarget.create") as create:
+            device.get("1.3.6.1.2.1.1.5.0")
+        self.assertEqual(create.call_args.kwargs, {"timeout": 0.5, "retries": 2})
+
+    def test_unreachable_fails_fast(self):
+        with patch(
+            "netengine.backends.snmp.base.get_cmd",
+            return_value=(requestTimedOut, 0, 0, []),
+        ) as get, patch("netengine.backends.snmp.base.walk_cmd") as walk:
+            with self.device:
+                with self.assertRaisesRegex(NetEngineError, "before timeout"):
+                    self.device.get_value("1.3.6.1.2.1.1.5.0")
+                with self.assertRaisesRegex(NetEngineError, "is unreachable"):
+                    self.device.get_many(["1.3.6.1.2.1.1.3.0"])
+                with self.assertRaisesRegex(NetEngineError, "is unreachable"):
+                    self.device.walk("1.3.6.1.2.1.2.2.1.2")
+            # a new session tries again
+            with self.assertRaisesRegex(NetEngineError, "before timeout"):
+                self.device.get_value("1.3.6.1.2.1.1.5.0")
+        self.assertEqual(get.call_count, 2)
+        walk.assert_not_called()
+
+    def test_bulk_walk_timeout_is_not_unreachable(self):
+        """the GETBULK timeouts of an SNMPv1 agent do not make it unreachable"""
+        device = AirOS("192.0.2.1", version=2)
+        with device:
+            with self.assertLogs("netengine.backends.snmp.base", "WARNING"):
+                result, _, _ = self._bulk_fallback(device, requestTimedOut)
+            self.assertIsNone(device._session.unreachable)
+        self.assertEqual(result, (None, 0, 0, [((0, 1),)]))
+
+    def test_deadline(self):
+        async def get_cmd(*args):
+            await asyncio.sleep(1)
+            return None, 0, 0, [[None, "value"]]
+
+        async def walk_response(*args, **kwargs):
+            yield None, 0, 0, (("1.3.6.1.2.1.2.2.1.2.1", "eth0"),)
+            await asyncio.sleep(1)
+            yield None, 0, 0, (("1.3.6.1.2.1.2.2.1.2.2", "eth1"),)
+
+        device = AirOS("192.0.2.1", deadline=0.05)
+        with patch("netengine.backends.snmp.base.get_cmd", side_effect=get_cmd), patch(
+            "netengine.backends.snmp.base.walk_cmd", side_effect=walk_response
+        ):
+            with self.assertRaisesRegex(NetEngineError, "deadline of 0.05s exceeded"):
+                device.get_value("1.3.6.1.2.1.1.5.0")
+            with self.assertRaisesRegex(NetEngineError, "deadline of 0.05s exceeded"):
+                device.walk("1.3.6.1.2.1.2.2.1.2")
+            with device:
+                device.next("1.3.6.1.2.1.2.2.1.2")
+                # the deadline of the session expired: nothing is sent
+                with patch("netengine.backends.snmp.base.walk_cmd") as walk:
+                    with self.assertRaisesRegex(NetEngineError, "deadline"):
+                        device.walk("1.3.6.1.2.1.2.2.1.2")
+                walk.assert_not_called()
+
+    def _timed_out(self, calls):
+        async def get_cmd(*args):
+            calls.append(args)
+            return requestTimedOut, 0, 0, []
+
+        async def walk_response(*args, **kwargs):
+            calls.append(args)
+            yield requestTimedOut, 0, 0, ()
+
+        return patch(
+            "netengine.backends.snmp.base.get_cmd", side_effect=get_cmd
+        ), patch("netengine.backends.snmp.base.walk_cmd", side_effect=walk_response)
+
+    def test_to_dict_unreachable(self):
+        device = OpenWRT("192.0.2.1")
+        calls = []
+        get_cmd, walk_cmd = self._timed_out(calls)
+        with get_cmd, walk_cmd:
+            with self.assertRaisesRegex(NetEngineError, "timeout|unreachable"):
+                device.to_dict()
+        self.assertLessEqual(len(calls), device.autowalk_concurrency)
+
+    def test_to_dict_partial_unreachable(self):
+        device = OpenWRT("192.0.2.1")
+        get_cmd, walk_cmd = self._timed_out([])
+        with get_cmd, walk_cmd, self.assertLogs("netengine.backends.snmp.base"):
+            with self.assertRaisesRegex(NetEngineError, "unreachable"):
+                device.to_dict(partial=True)
+            with self.assertRaisesRegex(NetEngineError, "unreachable"):
+                device.to_dict(autowalk=False, partial=True)
+
+    def test_to_dict_partial_walk_error(self):
+        device = OpenWRT("192.0.2.1")
+
+        async def get_cmd(engine, auth, transport, context, *var_binds):
+            oids = [
+                str(var_bind._ObjectType__args[0]._ObjectIdentity__args[0])
+                for var_bind in var_binds
+            ]
+            return None, 0, 0, [(oid, "1") for oid in oids]
+
+        async def walk_response(*args, **kwargs):
+            # genErr
+            yield None, 5, 1, ()
+
+        with patch("netengine.backends.snmp.base.get_cmd", side_effect=get_cmd), patch(
+            "netengine.backends.snmp.base.walk_cmd", side_effect=walk_response
+        ):
+            with self.assertLogs("netengine.backends.snmp.base", "WARNING"):
+                result = device.to_dict(partial=True)
+            with self.assertLogs("netengine.backends.snmp.base", "WARNING"):
+                result_without_autowalk = device.to_dict(autowalk=False, partial=True)
+        # the sections which read the walks are left out, not empty
+        for collected in (result, result_without_autowalk):
+            self.assertEqual(collected["type"], "DeviceMonitoring")
+            self.assertNotIn("interfaces", collected)
+            self.assertNotIn("neighbors", collected)
+
+    def test_nested_sessions(self):
+        with self.device:
+            session = self.device._session
+            with self.device:
+                self.assertIs(self.device._session, session)
+            self.assertIs(self.device._session, session)
+        self.assertIsNone(self.device._session)
+
+    def test_async_api_runs_on_the_current_loop(self):
+        loops = []
+
+        async def get_cmd(*args):
+            loops.append(asyncio.get_running_loop())
+            return None, 0, 0, [[None, "DeviceName"]]
+
+        async def poll():
+            async with self.device:
+                name = await self.device.aget_value("1.3.6.1.2.1.1.5.0")
+                values = await self.device.aget_values(["1.3.6.1.2.1.1.5.0"])
+            return asyncio.get_running_loop(), name, values
+
+        with patch("netengine.backends.snmp.base.get_cmd", side_effect=get_cmd):
+            loop, name, values = asyncio.run(poll())
+        self.assertEqual(name, "DeviceName")
+        self.assertEqual(values, {"1.3.6.1.2.1.1.5.0": "DeviceName"})
+        self.assertEqual(loops, [loop, loop])
+        self.assertIsNone(self.device._session)
+
+    def test_async_walk(self):
+        async def walk_response(*args, **kwargs):
+            yield None, 0, 0, [("1.3.6.1.2.1.1.5.0", "DeviceName")]
+
+        with patch("netengine.backends.snmp.base.walk_cmd", side_effect=walk_response):
+            self.assertEqual(
+                asyncio.run(self.device.awalk("1.3.6.1.2.1.1")),
+                {
+                    "1.3.6.1.2.1.1.5.0": [
+                        None,
+                        None,
+                        None,
+                        [("1.3.6.1.2.1.1.5.0", "DeviceName")],
+                    ]
+                },
+            )
+
+    def test_sync_api_inside_event_loop(self):
+        async def poll():
+            self.device.get("1.3.6.1.2.1.1.5.0")
+
+        with self.assertRaisesRegex(RuntimeError, "awaitable API"):
+            asyncio.run(poll())
+
+    def test_ato_dict_autowalk(self):
+        snmpdump = {"1.3.6.1.2.1.1.5.0": [None, None, None, [[None, "name"]]]}
+        with patch.object(
+            self.device, "awalk", return_value=snmpdump
+        ) as awalk, patch.object(
+            self.device, "aget_many", return_value={}
+        ) as aget_many, patch.object(
+            self.device, "to_dict", return_value={}
+        ) as to_dict:
+            self.assertEqual(asyncio.run(self.device.ato_dict()), {})
+        self.assertEqual(
+            awalk.await_count,
+            len(self.device._autowalk_subtrees)
+            + len(self.device._optional_autowalk_subtrees),
+        )
+        aget_many.assert_awaited_once_with(self.device._autowalk_scalars)
+        to_dict.assert_called_once()
+        snmpdump = to_dict.call_args.kwargs["snmpdump"]
+        self.assertEqual(
+            self.device.get_value("1.3.6.1.2.1.1.5.0", snmpdump=snmpdump), "name"
+        )
+
+    def test_autowalk_concurrency(self):
+        running = []
+        peak = []
+
+        async def awalk(oid):
+            running.append(oid)
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.remove(oid)
+            return {f"{oid}.1": [None, None, None, [[None, 1]]]}
+
+        self.device.autowalk_concurrency = 2
+        with patch.object(self.device, "awalk", side_effect=awalk), patch.object(
+            self.device, "aget_many", return_value={}
+        ):
+            snmpdump = self.device._autowalk()
+        self.assertEqual(max(peak), 2)
+        self.assertIn("1.3.6.1.2.1.2.2.1.1.1", snmpdump)
+
+    def _slow_get_cmd(self, calls):
+        async def get_cmd(*args):
+            calls.append(args)
+            await asyncio.sleep(0.01)
+            return None, 0, 0, [[None, "DeviceName"]]
+
+        return get_cmd
+
+    def test_coalesce_get(self):
+        calls = []
+        coalesced = SNMP._in_flight.coalesced
+        other = AirOS("192.0.2.1")
+
+        async def poll():
+            return await asyncio.gather(
+                self.device.aget_value("1.3.6.1.2.1.1.5.0"),
+                other.aget_value("1.3.6.1.2.1.1.5.0"),
+                self.device.aget_value("1.3.6.1.2.1.1.5.0"),
+            )
+
+        with patch(
+            "netengine.backends.snmp.base.get_cmd",
+            side_effect=self._slow_get_cmd(calls),
+        ):
+            self.assertEqual(asyncio.run(poll()), ["DeviceName"] * 3)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(SNMP._in_flight.coalesced - coalesced, 2)
+        self.assertEqual(len(SNMP._in_flight), 0)
+
+    def test_coalesce_distinct_requests(self):
+        calls = []
+        other = AirOS("192.0.2.1", community="private")
+
+        async def poll():
+            return await asyncio.gather(
+                self.device.aget_value("1.3.6.1.2.1.1.5.0"),
+                self.device.aget_value("1.3.6.1.2.1.1.6.0"),
+                other.aget_value("1.3.6.1.2.1.1.5.0"),
+            )
+
+        with patch(
+            "netengine.backends.snmp.base.get_cmd",
+            side_effect=self._slow_get_cmd(calls),
+        ):
+            asyncio.run(poll())
+        self.assertEqual(len(calls), 3)
+
+    def test_coalesce_disabled(self):
+        calls = []
+        self.device.coalesce_requests = False
+
+        async def poll():
+            return await asyncio.gather(
+                self.device.aget_value("1.3.6.1.2.1.1.5.0"),
+                self.device.aget_value("1.3.6.1.2.1.1.5.0"),
+            )
+
+        with patch(
+            "netengine.backends.snmp.base.get_cmd",
+            side_effect=self._slow_get_cmd(calls),
+        ):
+            asyncio.run(poll())
+        self.assertEqual(len(calls), 2)
+
+    def test_coalesce_walk(self):
+        calls = []
+
+        async def walk_response(*args, **kwargs):
+            calls.append(args)
+            await asyncio.sleep(0.01)
+            yield None, 0, 0, [("1.3.6.1.2.1.1.5.0", "DeviceName")]
+
+        async def poll():
+            return await asyncio.gather(
+                self.device.awalk("1.3.6.1.2.1.1"), self.device.awalk("1.3.6.1.2.1.1")
+            )
+
+        with patch("netengine.backends.snmp.base.walk_cmd", side_effect=walk_response):
+            first, second = asyncio.run(poll())
+        self.assertEqual(len(calls), 1)
+        self.assertIs(first, second)
+        self.assertIn("1.3.6.1.2.1.1.5.0", first)
+
+    def test_coalesce_error(self):
+        async def get_cmd(*args):
+            await asyncio.sleep(0.01)
+            return "request timed out", 0, 0, []
+
+        async def poll():
+            return await asyncio.gather(
+                self.device.aget_many(["1.3.6.1.2.1.1.5.0"]),
+                self.device.aget_many(["1.3.6.1.2.1.1.5.0"]),
+                return_exceptions=True,
+            )
+
+        with patch("netengine.backends.snmp.base.get_cmd", side_effect=get_cmd):
+            errors = asyncio.run(poll())
+        for error in errors:
+            self.assertIsInstance(error, NetEngineError)
+
+    def test_coalesce_cancelled_caller(self):
+        calls = []
+
+        async def poll():
+            first = asyncio.ensure_future(self.device.aget_value("1.3.6.1.2.1.1.5.0"))
+            second = asyncio.ensure_future(self.device.aget_value("1.3.6.1.2.1.1.5.0"))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second, first.cancelled()
+
+        with patch(
+            "netengine.backends.snmp.base.get_cmd",
+            side_effect=self._slow_get_cmd(calls),
+        ):
+            self.assertEqual(asyncio.run(poll()), ("DeviceName", True))
+        self.assertEqual(len(calls), 1)
+        self.assertIsNone(self.device._session)
+
     def test_raised_exception(self):
         class WrongSNMPBackend(SNMP):
             pass
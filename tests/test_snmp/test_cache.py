@@ -0,0 +1,137 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from pysnmp.proto.rfc1905 import noSuchInstance
+
+from netengine.backends.snmp import OpenWRT, ResponseCache
+
+__all__ = ["TestResponseCache"]
+
+
+class Clock(object):
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.cache = ResponseCache(clock=self.clock)
+
+    def test_ttl(self):
+        cache = ResponseCache(ttls={".1.3.6.1.2.1.2.2.1.10": 60, "1.3.6.1.2.1.1.5": 0})
+        self.assertEqual(cache.ttl("1.3.6.1.2.1.2.2.1.2.3"), cache.inventory_ttl)
+        self.assertEqual(cache.ttl("1.3.6.1.2.1.2.2.1.10.3"), 60)
+        # prefixes match whole arcs
+        self.assertEqual(cache.ttl("1.3.6.1.2.1.2.2.1.100.3"), 0)
+        self.assertEqual(cache.ttl("1.3.6.1.2.1.1.5.0"), 0)
+        self.assertEqual(ResponseCache(default_ttl=5).ttl("1.3.6.1.2.1.25"), 5)
+
+    def test_get(self):
+        self.cache.put("sysName", "1.3.6.1.2.1.1.5.0", "name")
+        self.assertEqual(self.cache.get("sysName", "1.3.6.1.2.1.1.5.0"), "name")
+        self.clock.now = self.cache.inventory_ttl
+        with self.assertRaises(KeyError):
+            self.cache.get("sysName", "1.3.6.1.2.1.1.5.0")
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(
+            self.cache.stats(), {"hits": 1, "misses": 1, "evictions": 0, "size": 0}
+        )
+
+    def test_zero_ttl(self):
+        self.cache.put("ifInOctets", "1.3.6.1.2.1.2.2.1.10.1", 1)
+        self.assertEqual(len(self.cache), 0)
+        with self.assertRaises(KeyError):
+            self.cache.get("ifInOctets", "1.3.6.1.2.1.2.2.1.10.1")
+        self.assertEqual(self.cache.misses, 0)
+
+    def test_lru(self):
+        cache = ResponseCache(maxsize=2)
+        cache.put(1, "1.3.6.1.2.1.1.5.0", 1)
+        cache.put(2, "1.3.6.1.2.1.1.5.0", 2)
+        cache.get(1, "1.3.6.1.2.1.1.5.0")
+        cache.put(3, "1.3.6.1.2.1.1.5.0", 3)
+        with self.assertRaises(KeyError):
+            cache.get(2, "1.3.6.1.2.1.1.5.0")
+        self.assertEqual(cache.get(1, "1.3.6.1.2.1.1.5.0"), 1)
+        self.assertEqual(cache.evictions, 1)
+        with self.assertRaises(ValueError):
+            ResponseCache(maxsize=0)
+
+    def test_clear(self):
+        self.cache.put("sysName", "1.3.6.1.2.1.1.5.0", "name")
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+
+    def _get_cmd(self, requests):
+        def get_cmd(engine, auth, transport, context, *var_binds):
+            oids = [
+                str(var_bind._ObjectType__args[0]._ObjectIdentity__args[0])
+                for var_bind in var_binds
+            ]
+            requests.append(oids)
+            return (
+                None,
+                0,
+                0,
+                [(oid, "1" if oid[-1] == "0" else noSuchInstance) for oid in oids],
+            )
+
+        return get_cmd
+
+    def test_get_many(self):
+        device = OpenWRT("192.0.2.1", cache=self.cache)
+        requests = []
+        oids = ["1.3.6.1.2.1.1.5.0", "1.3.6.1.2.1.1.3.0", "1.3.6.1.2.1.1.1.0"]
+        with patch(
+            "netengine.backends.snmp.base.get_cmd", side_effect=self._get_cmd(requests)
+        ):
+            self.assertEqual(device.get_values(oids), dict.fromkeys(oids, "1"))
+            self.assertEqual(device.get_values(oids), dict.fromkeys(oids, "1"))
+            self.assertEqual(device.get_value("1.3.6.1.2.1.1.5.0"), "1")
+            # another device does not share the cached responses
+            OpenWRT("192.0.2.2", cache=self.cache).get_value("1.3.6.1.2.1.1.5.0")
+        self.assertEqual(
+            requests,
+            [oids, ["1.3.6.1.2.1.1.3.0"], ["1.3.6.1.2.1.1.5.0"]],
+        )
+        self.assertEqual(self.cache.hits, 3)
+
+    def test_missing_values_not_cached(self):
+        device = OpenWRT("192.0.2.1", cache=self.cache)
+        requests = []
+        with patch(
+            "netengine.backends.snmp.base.get_cmd", side_effect=self._get_cmd(requests)
+        ):
+            device.get_many(["1.3.6.1.2.1.1.5.1"])
+            device.get_many(["1.3.6.1.2.1.1.5.1"])
+        self.assertEqual(len(requests), 2)
+
+    def test_walk_not_cached(self):
+        device = OpenWRT("192.0.2.1", cache=self.cache)
+        walks = []
+
+        async def walk_response(*args, **kwargs):
+            walks.append(str(args[4]._ObjectType__args[0]._ObjectIdentity__args[0]))
+            # an interface appears after the first walk
+            for index in range(1, len(walks) + 1):
+                yield None, 0, 0, [(f"{walks[-1]}.{index}", f"eth{index}")]
+
+        async def poll():
+            async with device:
+                return [
+                    await device.awalk("1.3.6.1.2.1.2.2.1.2"),
+                    await device.awalk("1.3.6.1.2.1.2.2.1.2"),
+                    await device.anext_walk("1.3.6.1.2.1.2.2.1.2"),
+                ]
+
+        with patch("netengine.backends.snmp.base.walk_cmd", side_effect=walk_response):
+            first, second, _ = asyncio.run(poll())
+        self.assertEqual(len(walks), 3)
+        self.assertEqual(len(first), 1)
+        self.assertEqual(len(second), 2)
+        self.assertEqual(self.cache.stats()["size"], 0)
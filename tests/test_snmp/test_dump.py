@@ -0,0 +1,191 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import patch
+
+from pysnmp.proto.rfc1902 import Counter32, IpAddress, ObjectIdentifier, OctetString
+from pysnmp.proto.rfc1905 import noSuchInstance
+
+from netengine.backends.snmp import AirOS, SnmpDump
+
+__all__ = ["TestSnmpDump"]
+
+
+def _result(oid, value):
+    return [None, None, None, [[oid, value]]]
+
+
+class TestSnmpDump(unittest.TestCase):
+    def setUp(self):
+        self.dump = SnmpDump(
+            {
+                oid: _result(oid, oid)
+                for oid in (
+                    "1.3.6.1.2.1.2.2.1.10.1",
+                    "1.3.6.1.2.1.2.2.1.1.2",
+                    "1.3.6.1.2.1.2.2.1.1.10",
+                    "1.3.6.1.2.1.2.2.1.1.1",
+                    "1.3.6.1.2.1.1.5.0",
+                )
+            }
+        )
+
+    def test_numeric_order(self):
+        self.assertEqual(
+            list(self.dump),
+            [
+                "1.3.6.1.2.1.1.5.0",
+                "1.3.6.1.2.1.2.2.1.1.1",
+                "1.3.6.1.2.1.2.2.1.1.2",
+                "1.3.6.1.2.1.2.2.1.1.10",
+                "1.3.6.1.2.1.2.2.1.10.1",
+            ],
+        )
+
+    def test_prefix(self):
+        expected = [
+            "1.3.6.1.2.1.2.2.1.1.1",
+            "1.3.6.1.2.1.2.2.1.1.2",
+            "1.3.6.1.2.1.2.2.1.1.10",
+        ]
+        self.assertEqual(self.dump.oids("1.3.6.1.2.1.2.2.1.1."), expected)
+        self.assertEqual(self.dump.oids("1.3.6.1.2.1.2.2.1.1"), expected)
+        self.assertEqual(
+            [oid for oid, _ in self.dump.items(prefix="1.3.6.1.2.1.2.2.1.1")],
+            expected,
+        )
+        self.assertEqual(self.dump.oids("1.3.6.1.2.1.3"), [])
+        self.assertEqual(len(self.dump.oids("1.3.6")), 5)
+        self.assertEqual(len(self.dump.items()), 5)
+
+    def test_mapping(self):
+        self.assertIn("1.3.6.1.2.1.1.5.0", self.dump)
+        self.assertEqual(len(self.dump), 5)
+        oid, value = self.dump.get("1.3.6.1.2.1.1.5.0")[3][0]
+        self.assertEqual(str(oid), "1.3.6.1.2.1.1.5.0")
+        self.assertEqual(oid.getOid(), (1, 3, 6, 1, 2, 1, 1, 5, 0))
+        self.assertEqual(value, "1.3.6.1.2.1.1.5.0")
+        self.assertIsNone(self.dump.get("1.3.6.1.2.1.1.6.0"))
+        del self.dump["1.3.6.1.2.1.1.5.0"]
+        self.assertEqual(self.dump.oids("1.3.6.1.2.1.1"), [])
+        self.assertEqual(self.dump, {oid: self.dump[oid] for oid in self.dump})
+
+    def test_update(self):
+        self.dump["1.3.6.1.2.1.2.2.1.1.3"] = _result(None, 3)
+        self.dump.update(SnmpDump({"1.3.6.1.2.1.2.2.1.1.0": _result(None, 0)}))
+        self.assertEqual(
+            [result[3][0][1] for _, result in self.dump.items("1.3.6.1.2.1.2.2.1.1")],
+            [
+                0,
+                "1.3.6.1.2.1.2.2.1.1.1",
+                "1.3.6.1.2.1.2.2.1.1.2",
+                3,
+                "1.3.6.1.2.1.2.2.1.1.10",
+            ],
+        )
+
+    def test_compact_values(self):
+        dump = SnmpDump()
+        dump.add("1.3.6.1.2.1.4.20.1.1.10.0.0.1", IpAddress("10.0.0.1"))
+        dump.add("1.3.6.1.2.1.2.2.1.6.2", OctetString(b"\x04\x0e<\xcaU_"))
+        dump.add("1.3.6.1.2.1.2.2.1.10.2", Counter32(3214378817))
+        dump.add("1.3.6.1.2.1.1.2.0", ObjectIdentifier("1.3.6.1.4.1.8072"))
+        dump.add("1.3.6.1.2.1.1.6.0", noSuchInstance)
+        self.assertEqual(
+            set(dump._data.values()),
+            {
+                b"\n\x00\x00\x01",
+                b"\x04\x0e<\xcaU_",
+                3214378817,
+                "1.3.6.1.4.1.8072",
+                None,
+            },
+        )
+        address = dump["1.3.6.1.2.1.4.20.1.1.10.0.0.1"][3][0][1]
+        self.assertEqual(address.prettyPrint(), "10.0.0.1")
+        self.assertEqual(address.asNumbers(), (10, 0, 0, 1))
+        mac = dump["1.3.6.1.2.1.2.2.1.6.2"][3][0][1]
+        self.assertEqual(mac.prettyPrint(), "0x040e3cca555f")
+        self.assertEqual(dump["1.3.6.1.2.1.2.2.1.10.2"][3][0][1], 3214378817)
+        self.assertEqual(str(dump["1.3.6.1.2.1.1.6.0"][3][0][1]), "")
+        other = SnmpDump()
+        other.update(dump)
+        self.assertEqual(
+            other["1.3.6.1.2.1.4.20.1.1.10.0.0.1"][3][0][1].prettyPrint(), "10.0.0.1"
+        )
+        self.assertEqual(list(other), list(dump))
+
+    def test_large_arcs(self):
+        dump = SnmpDump()
+        for index in (16384, 2, 128, 16383, 4294967295, 255, 256):
+            dump.add(f"1.3.6.1.2.1.2.2.1.1.{index}", index)
+        dump.add("1.3.6.1.2.1.2.2.1.2.1", "eth0")
+        self.assertEqual(
+            [result[3][0][1] for _, result in dump.items("1.3.6.1.2.1.2.2.1.1")],
+            [2, 128, 255, 256, 16383, 16384, 4294967295],
+        )
+
+    def test_column(self):
+        self.assertEqual(
+            self.dump.column("1.3.6.1.2.1.2.2.1.1"),
+            {
+                (1,): "1.3.6.1.2.1.2.2.1.1.1",
+                (2,): "1.3.6.1.2.1.2.2.1.1.2",
+                (10,): "1.3.6.1.2.1.2.2.1.1.10",
+            },
+        )
+        self.assertEqual(self.dump.column("1.3.6.1.2.1.4.35.1.4"), {})
+
+    def test_failure(self):
+        dump = SnmpDump()
+        dump.failed["1.3.6.1.2.1.2.2.1.2"] = "timeout"
+        other = SnmpDump()
+        other.update(dump)
+        self.assertEqual(other.failure("1.3.6.1.2.1.2.2.1.2."), "timeout")
+        self.assertEqual(other.failure("1.3.6.1.2.1.2.2.1.2.5"), "timeout")
+        self.assertEqual(other.failure("1.3.6.1.2.1.2"), "timeout")
+        self.assertIsNone(other.failure("1.3.6.1.2.1.2.2.1.20"))
+
+    def test_next_oid(self):
+        self.assertEqual(
+            self.dump.next_oid("1.3.6.1.2.1.2.2.1.1.2"), "1.3.6.1.2.1.2.2.1.1.10"
+        )
+        self.assertEqual(self.dump.next_oid("1.3.6.1.2.1.2"), "1.3.6.1.2.1.2.2.1.1.1")
+        self.assertIsNone(self.dump.next_oid("1.3.6.1.2.1.2.2.1.10.1"))
+
+    def test_backend_reads(self):
+        device = AirOS("192.0.2.1")
+        self.assertEqual(
+            device.get_value("1.3.6.1.2.1.1.5.0", snmpdump=self.dump),
+            "1.3.6.1.2.1.1.5.0",
+        )
+        self.assertEqual(
+            len(device.next("1.3.6.1.2.1.2.2.1.1.", snmpdump=self.dump)[3]), 3
+        )
+
+    def test_walk_returns_dump(self):
+        device = AirOS("192.0.2.1")
+        rows = [[["1.3.6.1.2.1.1.5.0", "name"]], [["1.3.6.1.2.1.1.1.0", "descr"]]]
+
+        async def walk(*args, **kwargs):
+            for row in rows:
+                yield None, 0, 0, row
+
+        with patch("netengine.backends.snmp.base.walk_cmd", side_effect=walk):
+            dump = asyncio.run(device.awalk("1.3.6.1.2.1.1"))
+        self.assertIsInstance(dump, SnmpDump)
+        self.assertEqual(list(dump), ["1.3.6.1.2.1.1.1.0", "1.3.6.1.2.1.1.5.0"])
+
+    def test_large_dump(self):
+        oids = [
+            f"1.3.6.1.2.1.2.2.1.{column}.{index}"
+            for column in range(1, 23)
+            for index in range(1, 5001)
+        ]
+        start = time.perf_counter()
+        dump = SnmpDump((oid, _result(None, 0)) for oid in oids)
+        for column in range(1, 23):
+            self.assertEqual(
+                len(dump.items(prefix=f"1.3.6.1.2.1.2.2.1.{column}")), 5000
+            )
+        self.assertLess(time.perf_counter() - start, 5)
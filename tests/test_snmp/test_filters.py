@@ -0,0 +1,105 @@
+import codecs
+import re
+import unittest
+from unittest.mock import patch
+
+from netengine.backends.snmp import InterfaceFilter, OpenWRT, SnmpDump
+
+from ..utils import MockOutputMixin
+
+__all__ = ["TestInterfaceFilter"]
+
+
+class TestInterfaceFilter(unittest.TestCase, MockOutputMixin):
+    def setUp(self):
+        self.oid_mock_data = self._load_mock_json("/static/test-openwrt-snmp-oid.json")
+
+    def test_match(self):
+        interface_filter = InterfaceFilter(
+            include=["eth*", re.compile(r"^wlan\d$")], exclude=["eth0.*"]
+        )
+        self.assertTrue(interface_filter.match("eth0"))
+        self.assertTrue(interface_filter.match("Device 8086:100e", "eth1"))
+        self.assertTrue(interface_filter.match("wlan0"))
+        self.assertFalse(interface_filter.match("wlan0-1"))
+        self.assertFalse(interface_filter.match("eth0.100"))
+        self.assertFalse(interface_filter.match("br-lan"))
+
+    def test_match_type_and_admin_status(self):
+        interface_filter = InterfaceFilter(types=[6], admin_up=True)
+        self.assertEqual(
+            interface_filter.columns, ["descr", "name", "type", "admin_status"]
+        )
+        self.assertTrue(interface_filter.match("eth0", type="6", admin_status="1"))
+        self.assertFalse(interface_filter.match("eth0", type="6", admin_status="2"))
+        self.assertFalse(interface_filter.match("lo", type="24", admin_status="1"))
+
+    def test_invalid_patterns(self):
+        with self.assertRaises(ValueError):
+            InterfaceFilter(include="eth*")
+
+    def _dump(self, prefix=""):
+        """the mocked OIDs of the subtree in an SnmpDump, with the ifIndexes"""
+        dump = SnmpDump()
+        for oid in self.oid_mock_data:
+            value = self.oid_mock_data[oid]
+            if isinstance(value, dict):
+                value = codecs.escape_decode(value["value"])[0]
+            if oid.startswith(prefix) and not isinstance(value, list):
+                dump.add(oid, value)
+            if oid.startswith("1.3.6.1.2.1.2.2.1.2.") and prefix in (
+                "",
+                "1.3.6.1.2.1.2.2.1.1.",
+            ):
+                index = oid.rpartition(".")[2]
+                dump.add(f"1.3.6.1.2.1.2.2.1.1.{index}", int(index))
+        return dump
+
+    def _get_cmd(self, requests):
+        def get_cmd(engine, auth, transport, context, *var_binds):
+            oids = [self._get_var_bind_oid(var_bind) for var_bind in var_binds]
+            requests.append(oids)
+            return None, 0, 0, [(oid, self.oid_mock_data[oid]) for oid in oids]
+
+        return patch("netengine.backends.snmp.base.get_cmd", side_effect=get_cmd)
+
+    def _walk(self, walks):
+        async def awalk(oid):
+            walks.append(oid)
+            return self._dump(f"{oid}.")
+
+        return awalk
+
+    def test_interfaces_to_dict(self):
+        device = OpenWRT("192.0.2.1", interface_filter=InterfaceFilter(types=[24]))
+        snmpdump = self._dump()
+        interfaces = device.interfaces_to_dict(snmpdump=snmpdump)
+        self.assertEqual([interface["name"] for interface in interfaces], ["lo"])
+        device.interface_filter = InterfaceFilter(include=["br-*"])
+        device.memo.invalidate()
+        interfaces = device.interfaces_to_dict(snmpdump=snmpdump)
+        self.assertEqual([interface["name"] for interface in interfaces], ["br-lan"])
+
+    def test_autowalk(self):
+        """the interface columns are requested only for the selected interfaces"""
+        device = OpenWRT(
+            "192.0.2.1", interface_filter=InterfaceFilter(include=["br-*"])
+        )
+        walks = []
+        requests = []
+        with self._get_cmd(requests), patch.object(
+            device, "awalk", side_effect=self._walk(walks)
+        ):
+            result = device.to_dict(fields=["interfaces.mtu", "interfaces.up"])
+        self.assertEqual(
+            set(walks),
+            {
+                "1.3.6.1.2.1.2.2.1.1",
+                "1.3.6.1.2.1.2.2.1.2",
+                "1.3.6.1.2.1.31.1.1.1.1",
+            },
+        )
+        self.assertEqual(requests, [["1.3.6.1.2.1.2.2.1.4.5", "1.3.6.1.2.1.2.2.1.8.5"]])
+        self.assertEqual(
+            result["interfaces"], [{"name": "br-lan", "up": True, "mtu": 1500}]
+        )
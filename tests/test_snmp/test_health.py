@@ -0,0 +1,111 @@
+import unittest
+from unittest.mock import patch
+
+from pysnmp.proto.errind import requestTimedOut
+
+from netengine.backends.snmp import HealthTracker, OpenWRT, SnmpDump
+from netengine.exceptions import NetEngineError
+
+__all__ = ["TestHealthTracker"]
+
+
+class Clock(object):
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestHealthTracker(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.health = HealthTracker(
+            threshold=2, backoff=10, max_backoff=30, clock=self.clock
+        )
+
+    def test_circuit(self):
+        self.assertEqual(self.health.state("host"), HealthTracker.CLOSED)
+        self.health.record_failure("host")
+        self.assertEqual(self.health.state("host"), HealthTracker.CLOSED)
+        self.health.record_failure("host")
+        self.assertEqual(self.health.state("host"), HealthTracker.OPEN)
+        self.assertEqual(
+            self.health.status("host"),
+            {"state": HealthTracker.OPEN, "failures": 2, "retry_in": 10},
+        )
+        self.assertEqual(self.health.open_hosts(), ["host"])
+        self.clock.now = 10
+        self.assertEqual(self.health.status("host")["state"], HealthTracker.HALF_OPEN)
+        self.assertEqual(self.health.state("host"), HealthTracker.HALF_OPEN)
+        # a single probe is allowed
+        self.assertEqual(self.health.state("host"), HealthTracker.OPEN)
+        self.health.record_success("host")
+        self.assertEqual(self.health.state("host"), HealthTracker.CLOSED)
+        self.assertEqual(self.health.open_hosts(), [])
+
+    def test_backoff(self):
+        for _ in range(2):
+            self.health.record_failure("host")
+        retry_in = []
+        for _ in range(3):
+            self.health.record_failure("host")
+            retry_in.append(self.health.status("host")["retry_in"])
+        self.assertEqual(retry_in, [20, 30, 30])
+
+    def test_invalid_threshold(self):
+        with self.assertRaises(ValueError):
+            HealthTracker(threshold=0)
+
+    def _get_cmd(self, requests, answer):
+        def get_cmd(engine, auth, transport, context, *var_binds):
+            oids = [
+                str(var_bind._ObjectType__args[0]._ObjectIdentity__args[0])
+                for var_bind in var_binds
+            ]
+            requests.append(oids)
+            if not answer:
+                return requestTimedOut, 0, 0, []
+            return None, 0, 0, [(oid, "1") for oid in oids]
+
+        return patch("netengine.backends.snmp.base.get_cmd", side_effect=get_cmd)
+
+    def test_device(self):
+        device = OpenWRT("192.0.2.1", health=self.health)
+        requests = []
+        with self._get_cmd(requests, answer=False):
+            for _ in range(2):
+                with self.assertRaisesRegex(NetEngineError, "timeout"):
+                    device.validate()
+            self.assertEqual(len(requests), 2)
+            with self.assertRaisesRegex(NetEngineError, "failed 2 times in a row"):
+                device.validate()
+            with self.assertRaisesRegex(NetEngineError, "failed 2 times in a row"):
+                device.to_dict()
+            self.assertEqual(len(requests), 2)
+            # the probe fails: the request is not sent
+            self.clock.now = 10
+            with self.assertRaisesRegex(NetEngineError, "unreachable"):
+                device.validate()
+            self.assertEqual(requests[2:], [["1.3.6.1.2.1.1.3.0"]])
+            self.assertEqual(self.health.status(("192.0.2.1", 161))["retry_in"], 20)
+        self.clock.now = 30
+        requests = []
+        with self._get_cmd(requests, answer=True):
+            self.assertEqual(device.validate(), "1")
+        self.assertEqual(requests, [["1.3.6.1.2.1.1.3.0"], ["1.3.6.1.2.1.1.5.0"]])
+        self.assertEqual(self.health.open_hosts(), [])
+
+    def test_dump_does_not_take_the_probe(self):
+        device = OpenWRT("192.0.2.1", health=self.health)
+        for _ in range(2):
+            self.health.record_failure(("192.0.2.1", 161))
+        self.clock.now = 10
+        snmpdump = SnmpDump()
+        snmpdump.add("1.3.6.1.2.1.1.5.0", "router")
+        device.to_dict(snmpdump=snmpdump, partial=True)
+        requests = []
+        with self._get_cmd(requests, answer=True):
+            self.assertEqual(device.validate(), "1")
+        self.assertEqual(requests, [["1.3.6.1.2.1.1.3.0"], ["1.3.6.1.2.1.1.5.0"]])
+        self.assertEqual(self.health.open_hosts(), [])
@@ -0,0 +1,67 @@
+import asyncio
+import os
+import unittest
+
+from netengine.backends.snmp import OpenWRT
+from netengine.backends.snmp.simulator import load_fixture, start_agents
+from netengine.metrics import MetricsRegistry
+
+__all__ = ["TestSNMPMetrics"]
+
+FIXTURE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "static",
+    "test-openwrt-snmp-oid.json",
+)
+
+
+class TestSNMPMetrics(unittest.TestCase):
+    def setUp(self):
+        self.metrics = MetricsRegistry()
+
+    def _poll(self, **kwargs):
+        """polls a local agent, returns the requests which it received"""
+
+        async def poll():
+            (agent,) = await start_agents(load_fixture(FIXTURE), 1, **kwargs)
+            try:
+                device = OpenWRT(
+                    "127.0.0.1",
+                    port=agent.port,
+                    version=2,
+                    timeout=0.2,
+                    retries=1,
+                    metrics=self.metrics,
+                )
+                await device.ato_dict(partial=True)
+                return agent.requests
+            finally:
+                agent.close()
+
+        return asyncio.run(poll())
+
+    def test_requests(self):
+        requests = self._poll()
+        counter = self.metrics.counter("netengine_snmp_requests_total", "")
+        self.assertEqual(
+            counter.value(("127.0.0.1", "get"))
+            + counter.value(("127.0.0.1", "getbulk")),
+            requests,
+        )
+        latency = self.metrics.histogram("netengine_snmp_request_seconds", "")
+        self.assertEqual(latency.count(("127.0.0.1",)), requests)
+        self.assertGreater(
+            self.metrics.histogram("netengine_snmp_walk_varbinds", "").count(), 0
+        )
+        sections = self.metrics.histogram("netengine_section_seconds", "")
+        self.assertEqual(sections.count(("OpenWRT", "interfaces")), 1)
+        self.assertNotIn("netengine_snmp_timeouts_total", self.metrics.render())
+
+    def test_timeouts(self):
+        requests = self._poll(loss=1)
+        timeouts = self.metrics.counter("netengine_snmp_timeouts_total", "")
+        retries = self.metrics.counter("netengine_snmp_retries_total", "")
+        self.assertGreater(timeouts.value(("127.0.0.1",)), 0)
+        self.assertEqual(
+            timeouts.value(("127.0.0.1",)) + retries.value(("127.0.0.1",)), requests
+        )
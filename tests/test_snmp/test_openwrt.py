@@ -1,3 +1,4 @@
+import asyncio
 import json
 import unittest
 from contextlib import ExitStack
@@ -7,7 +8,7 @@ from jsonschema import validate
 from pysnmp.proto.rfc1902 import OctetString
 
 from netengine.backends.schema import schema
-from netengine.backends.snmp import OpenWRT
+from netengine.backends.snmp import OpenWRT, SnmpDump
 from netengine.exceptions import NetEngineError
 
 from ..settings import settings
@@ -84,10 +85,10 @@ class TestSNMPOpenWRT(unittest.TestCase, MockOutputMixin):
         with patch.object(self.device, "_value_to_retrieve", return_value=[1]):
             with patch.object(
                 self.device,
-                "get_value",
-                side_effect=lambda oid, snmpdump: (
-                    "first" if snmpdump is first_dump else "second"
-                ),
+                "get_values",
+                side_effect=lambda oids, snmpdump: {
+                    oid: "first" if snmpdump is first_dump else "second" for oid in oids
+                },
             ):
                 self.assertEqual(self.device.get_interfaces(first_dump), ["first"])
                 self.assertEqual(self.device.get_interfaces(second_dump), ["second"])
@@ -118,9 +119,11 @@ class TestSNMPOpenWRT(unittest.TestCase, MockOutputMixin):
                 ):
                     with patch.object(
                         self.device,
-                        "get_value",
-                        side_effect=lambda oid, **kwargs: values[oid],
-                    ) as get_value:
+                        "get_values",
+                        side_effect=lambda oids, **kwargs: {
+                            oid: values[oid] for oid in oids
+                        },
+                    ) as get_values:
                         self.assertEqual(
                             self.device.interfaces_MAC(),
                             [
@@ -130,7 +133,7 @@ class TestSNMPOpenWRT(unittest.TestCase, MockOutputMixin):
                         )
         self.assertNotIn(
             "1.3.6.1.2.1.2.2.1.6.2",
-            [call.args[0] for call in get_value.call_args_list],
+            [oid for call in get_values.call_args_list for oid in call.args[0]],
             "MAC collection must not query indexes absent from the SNMP table",
         )
 
@@ -151,13 +154,13 @@ class TestSNMPOpenWRT(unittest.TestCase, MockOutputMixin):
 
     def test_empty_interface(self):
         """Fallback interface records retain the boolean state consumed by serialization."""
+        self.oid_mock_data["1.3.6.1.2.1.2.2.1.2.1"] = ""
         with patch.object(self.device, "_value_to_retrieve", return_value=[1]):
-            with patch.object(self.device, "get_value", return_value=""):
-                self.assertEqual(
-                    self.device.interfaces_up(),
-                    [{"name": "", "up": False}],
-                    "Empty interface records must preserve the boolean up field",
-                )
+            self.assertEqual(
+                self.device.interfaces_up(),
+                [{"name": "", "up": False}],
+                "Empty interface records must preserve the boolean up field",
+            )
 
     def test_interfaces_to_dict(self):
         self.assertIsInstance(self.device.interfaces_to_dict(), list)
@@ -185,6 +188,19 @@ class TestSNMPOpenWRT(unittest.TestCase, MockOutputMixin):
                 self.device.interfaces_to_dict(snmpdump=snmpdump)
         method.assert_called_once_with(snmpdump=snmpdump)
 
+    def test_interface_columns_read_once(self):
+        with patch.object(
+            self.device, "get_values", wraps=self.device.get_values
+        ) as get_values, self.device:
+            self.device.interfaces_to_dict()
+            self.device.interfaces_MAC()
+            self.device.interfaces_speed()
+        oids = [oid for call in get_values.call_args_list for oid in call.args[0]]
+        self.assertEqual(oids.count("1.3.6.1.2.1.2.2.1.2.1"), 1)
+        self.assertEqual(oids.count("1.3.6.1.2.1.2.2.1.6.1"), 1)
+        self.assertEqual(oids.count("1.3.6.1.2.1.2.2.1.5.1"), 1)
+        self.assertEqual(get_values.call_count, 3)
+
     def test_interface_addr_and_mask(self):
         self.assertIsInstance(self.device.interface_addr_and_mask(), dict)
 
@@ -243,58 +259,26 @@ class TestSNMPOpenWRT(unittest.TestCase, MockOutputMixin):
             ],
             7: [{"family": "ipv4", "address": "198.51.100.1", "mask": "255.255.255.0"}],
         }
+        columns = {
+            "descr": {3: "duplicate", 7: "duplicate"},
+            "type": {3: "6", 7: "6"},
+            "mac": {3: "\x00\x00\x00\x00\x00\x03", 7: "\x00\x00\x00\x00\x00\x07"},
+            "oper_status": {3: "1", 7: "1"},
+            "mtu": {3: "1500", 7: "1500"},
+            "in_octets": {3: "0", 7: "0"},
+            "in_ucast_pkts": {3: "0", 7: "0"},
+            "in_nucast_pkts": {3: "0", 7: "0"},
+            "out_octets": {3: "0", 7: "0"},
+            "out_ucast_pkts": {3: "0", 7: "0"},
+            "out_nucast_pkts": {3: "0", 7: "0"},
+        }
         with ExitStack() as stack:
             stack.enter_context(
-                patch.object(self.device, "_value_to_retrieve", return_value=[3, 7])
-            )
-            stack.enter_context(
-                patch.object(
-                    self.device,
-                    "get_interfaces",
-                    return_value=["duplicate", "duplicate"],
-                )
+                patch.object(self.device, "_interface_columns", return_value=columns)
             )
             stack.enter_context(
                 patch.object(self.device, "get_wireless_interfaces", return_value=[])
             )
-            stack.enter_context(
-                patch.object(
-                    self.device,
-                    "interfaces_type",
-                    return_value=[{"type": "ethernet"}] * 2,
-                )
-            )
-            stack.enter_context(
-                patch.object(
-                    self.device,
-                    "interfaces_MAC",
-                    return_value=[
-                        {"mac_address": "00:00:00:00:00:03"},
-                        {"mac_address": "00:00:00:00:00:07"},
-                    ],
-                )
-            )
-            stack.enter_context(
-                patch.object(
-                    self.device,
-                    "interfaces_bytes",
-                    return_value=[{"rx": 0, "tx": 0}] * 2,
-                )
-            )
-            stack.enter_context(
-                patch.object(
-                    self.device,
-                    "interfaces_up",
-                    return_value=[{"up": True}] * 2,
-                )
-            )
-            stack.enter_context(
-                patch.object(
-                    self.device,
-                    "interfaces_mtu",
-                    return_value=[{"mtu": 1500}] * 2,
-                )
-            )
             stack.enter_context(
                 patch.object(
                     self.device,
@@ -305,6 +289,7 @@ class TestSNMPOpenWRT(unittest.TestCase, MockOutputMixin):
             interfaces = self.device.interfaces_to_dict()
         self.assertEqual(interfaces[0]["addresses"], addresses[3])
         self.assertEqual(interfaces[1]["addresses"], addresses[7])
+        self.assertEqual(interfaces[1]["mac"], "00:00:00:00:00:07")
 
     def test_RAM_total(self):
         self.assertEqual(self.device.RAM_total(), 61452288)
@@ -440,11 +425,80 @@ class TestSNMPOpenWRT(unittest.TestCase, MockOutputMixin):
             len(self.device.get_interfaces()),
         )
 
+    def test_ato_dict(self):
+        self.assertEqual(
+            asyncio.run(self.device.ato_dict(autowalk=False)),
+            self.device.to_dict(autowalk=False),
+        )
+
+    def test_ato_dict_in_session(self):
+        async def poll():
+            async with self.device:
+                session = self.device._session
+                result = await self.device.ato_dict(autowalk=False)
+                # the worker thread does not use the session of the event loop
+                self.assertIs(self.device._session, session)
+                self.assertFalse(session.responded)
+            return result
+
+        self.assertEqual(asyncio.run(poll()), self.device.to_dict(autowalk=False))
+
     def test_memory_cache(self):
         """NetJSON names cached memory ``cache``."""
         memory = self.device.to_dict(autowalk=False)["resources"]["memory"]
         self.assertIn("cache", memory, "Memory output must use the NetJSON cache key")
 
+    def test_high_capacity_counters(self):
+        """64-bit counters are preferred, 32-bit ones are the fallback."""
+        snmpdump = SnmpDump()
+        for index, name in ((1, "eth0"), (2, "eth1")):
+            snmpdump.add(f"1.3.6.1.2.1.2.2.1.1.{index}", index)
+            snmpdump.add(f"1.3.6.1.2.1.2.2.1.2.{index}", name)
+            snmpdump.add(f"1.3.6.1.2.1.2.2.1.5.{index}", 2**32 - 1)
+            snmpdump.add(f"1.3.6.1.2.1.2.2.1.10.{index}", 10)
+            snmpdump.add(f"1.3.6.1.2.1.2.2.1.16.{index}", 20)
+        # only eth0 has the ifXTable counters
+        snmpdump.add("1.3.6.1.2.1.31.1.1.1.6.1", 2**40)
+        snmpdump.add("1.3.6.1.2.1.31.1.1.1.10.1", 2**41)
+        for column in (7, 8, 9, 11, 12, 13):
+            snmpdump.add(f"1.3.6.1.2.1.31.1.1.1.{column}.1", column)
+        snmpdump.add("1.3.6.1.2.1.31.1.1.1.15.1", 10000)
+        # eth2 has no counters at all
+        snmpdump.add("1.3.6.1.2.1.2.2.1.1.3", 3)
+        snmpdump.add("1.3.6.1.2.1.2.2.1.2.3", "eth2")
+        snmpdump.add("1.3.6.1.2.1.2.2.1.5.3", 0)
+        self.assertEqual(
+            self.device.interfaces_bytes(snmpdump=snmpdump),
+            [
+                {"name": "eth0", "tx": 2**41, "rx": 2**40},
+                {"name": "eth1", "tx": 20, "rx": 10},
+                {"name": "eth2", "tx": 0, "rx": 0},
+            ],
+        )
+        self.assertEqual(
+            self.device._interface_counters(
+                self.device._statistics_counters, snmpdump=snmpdump
+            )[1],
+            {"rx_bytes": 2**40, "tx_bytes": 2**41, "rx_packets": 24, "tx_packets": 36},
+        )
+        self.assertEqual(
+            [
+                interface["counter_bits"]
+                for interface in self.device.interfaces_to_dict(
+                    snmpdump=snmpdump, fields=["statistics"]
+                )
+            ],
+            [64, 32, None],
+        )
+        self.assertEqual(
+            self.device.interfaces_speed(snmpdump=snmpdump),
+            [
+                {"name": "eth0", "speed": 10**10},
+                {"name": "eth1", "speed": 2**32 - 1},
+                {"name": "eth2", "speed": 0},
+            ],
+        )
+
     def test_fresh_snapshot(self):
         """Consecutive serializations must not reuse interface counters."""
         first = self.device.to_dict(autowalk=False)
@@ -463,51 +517,105 @@ class TestSNMPOpenWRT(unittest.TestCase, MockOutputMixin):
             "Unnamed interfaces must not shift subsequent interface metrics",
         )
 
-    def test_autowalk_root(self):
-        """OpenWRT metrics require standard and vendor OID roots."""
-        with patch.object(self.device, "walk", return_value={}) as walk:
-            with patch.object(self.device, "name", return_value="device"):
-                with patch.object(self.device, "uptime", return_value=0):
-                    with patch.object(self.device, "local_time", return_value=0):
-                        with patch.object(
-                            self.device, "resources_to_dict", return_value={}
-                        ):
-                            with patch.object(
-                                self.device, "interfaces_to_dict", return_value=[]
-                            ):
-                                with patch.object(
-                                    self.device, "neighbors", return_value=[]
-                                ):
-                                    self.device.to_dict()
-                                    self.device.to_dict(snmpdump={})
+    def _patch_sections(self, stack):
+        for method, value in (
+            ("name", "device"),
+            ("uptime", 0),
+            ("local_time", 0),
+            ("resources_to_dict", {}),
+            ("interfaces_to_dict", []),
+            ("neighbors", []),
+        ):
+            stack.enter_context(patch.object(self.device, method, return_value=value))
+
+    def test_autowalk_plan(self):
+        """OpenWRT walks only the subtrees and scalars read by to_dict()."""
+        with ExitStack() as stack:
+            walk = stack.enter_context(
+                patch.object(self.device, "awalk", return_value={})
+            )
+            get_many = stack.enter_context(
+                patch.object(self.device, "aget_many", return_value={})
+            )
+            self._patch_sections(stack)
+            self.device.to_dict()
+            self.device.to_dict(snmpdump={})
         self.assertEqual(
-            walk.call_args_list,
-            [call("1.3.6.1"), call("1.2.840.10036")],
-            "OpenWRT must preserve supplied dumps and autowalk both OID roots",
+            {walk_call.args[0] for walk_call in walk.call_args_list},
+            {"1.3.6.1.2.1.4.35.1.4", "1.2.840.10036.1.1.1.1"}
+            | set(self.device._autowalk_subtrees)
+            | set(self.device._optional_autowalk_subtrees),
         )
+        self.assertNotIn(call("1.3.6.1"), walk.call_args_list)
+        get_many.assert_called_once_with(self.device._autowalk_scalars)
+
+    def test_autowalk_covers_to_dict(self):
+        self._assert_autowalk_covers(self.device)
+
+    def test_autowalk_covers_fields(self):
+        self._assert_autowalk_covers(
+            self.device, fields=["interfaces.statistics", "resources.load"]
+        )
+        self._assert_autowalk_covers(self.device, fields=["general", "neighbors"])
+
+    def test_to_dict_fields(self):
+        fields = ["interfaces.statistics", "resources.load"]
+        result = self.device.to_dict(autowalk=False, fields=fields)
+        self.assertEqual(list(result), ["type", "resources", "interfaces"])
+        self.assertEqual(list(result["resources"]), ["load"])
+        for interface in result["interfaces"]:
+            self.assertEqual(list(interface), ["name", "statistics", "counter_bits"])
+        full = self.device.to_dict(autowalk=False)
+        self.assertEqual(result["resources"]["load"], full["resources"]["load"])
+        self.assertEqual(
+            [interface["statistics"] for interface in result["interfaces"]],
+            [interface["statistics"] for interface in full["interfaces"]],
+        )
+
+    def test_fields_plan(self):
+        plan = [set(part) for part in self.device._autowalk_plan()]
+        selected = self.device._autowalk_plan(["resources.load"])
+        self.assertEqual(selected, ((self.device._autowalk_subtrees[-1],), (), ()))
+        oids = set()
+        for field_oids in self.device._field_oids.values():
+            oids.update(field_oids)
+        # every OID collected by autowalk is read by some field
+        self.assertEqual(set().union(*plan), oids)
+
+    def test_unknown_field(self):
+        with self.assertRaisesRegex(ValueError, "unknown field"):
+            self.device.to_dict(fields=["interfaces.speed"])
+        with self.assertRaises(ValueError):
+            self.device.to_dict(fields="interfaces")
+
+    def test_autowalk_scalars(self):
+        with patch.object(self.device, "awalk", return_value={}):
+            snmpdump = self.device._autowalk()
+        self.assertEqual(snmpdump["1.3.6.1.2.1.1.5.0"][3][0][1], self.device.name())
+        self.assertNotIn("1.3.6.1.2.1.1.2.0", snmpdump)
 
     def test_autowalk_continues_without_vendor_data(self):
-        with patch.object(
-            self.device, "walk", side_effect=[{}, NetEngineError("unsupported")]
-        ) as walk:
-            with patch.object(self.device, "name", return_value="device"):
-                with patch.object(self.device, "uptime", return_value=0):
-                    with patch.object(self.device, "local_time", return_value=0):
-                        with patch.object(
-                            self.device, "resources_to_dict", return_value={}
-                        ):
-                            with patch.object(
-                                self.device, "interfaces_to_dict", return_value=[]
-                            ):
-                                with patch.object(
-                                    self.device, "neighbors", return_value=[]
-                                ):
-                                    with self.assertLogs(
-                                        "netengine.backends.snmp.openwrt", "WARNING"
-                                    ):
-                                        result = self.device.to_dict()
+        def awalk(oid):
+            if oid in self.device._optional_autowalk_subtrees:
+                raise NetEngineError("unsupported")
+            return {}
+
+        with ExitStack() as stack:
+            walk = stack.enter_context(
+                patch.object(self.device, "awalk", side_effect=awalk)
+            )
+            self._patch_sections(stack)
+            with self.assertLogs("netengine.backends.snmp.base", "WARNING"):
+                result = self.device.to_dict()
         self.assertEqual(result["general"]["hostname"], "device")
-        self.assertEqual(walk.call_args_list, [call("1.3.6.1"), call("1.2.840.10036")])
+        self.assertIn(call("1.2.840.10036.1.1.1.1"), walk.call_args_list)
+
+    def test_autowalk_required_data_error(self):
+        with patch.object(
+            self.device, "awalk", side_effect=NetEngineError("request timed out")
+        ):
+            with self.assertRaisesRegex(NetEngineError, "request timed out"):
+                self.device.to_dict()
 
     def test_netjson_compliance(self):
         device_dict = self.device.to_dict(autowalk=False)
@@ -0,0 +1,129 @@
+import asyncio
+import os
+import time
+import unittest
+
+from netengine.backends.snmp import OpenWRT
+from netengine.backends.snmp.simulator import SNMPAgent, load_fixture, start_agents
+from netengine.exceptions import NetEngineError
+
+__all__ = ["TestSimulator"]
+
+FIXTURE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "static",
+    "test-openwrt-snmp-oid.json",
+)
+
+
+class TestSimulator(unittest.TestCase):
+    def setUp(self):
+        self.snmpdump = load_fixture(FIXTURE)
+
+    def _run(self, test, **kwargs):
+        """runs ``test(device, agent)`` against a local agent"""
+        version = kwargs.pop("version", 1)
+
+        async def run():
+            agent = await SNMPAgent(self.snmpdump, **kwargs).start()
+            device = OpenWRT(
+                "127.0.0.1", port=agent.port, version=version, timeout=1, retries=0
+            )
+            try:
+                return await test(device, agent)
+            finally:
+                agent.close()
+
+        return asyncio.run(run())
+
+    def test_load_fixture(self):
+        self.assertEqual(
+            self.snmpdump["1.3.6.1.2.1.1.5.0"][3][0][1].asOctets(), b"HeartOfGold"
+        )
+        self.assertEqual(self.snmpdump["1.3.6.1.2.1.2.2.1.16.1"][3][0][1], 719914)
+        # the ifIndex column is derived from ifDescr
+        self.assertEqual(len(self.snmpdump.oids("1.3.6.1.2.1.2.2.1.1")), 8)
+
+    def test_to_dict(self):
+        async def test(device, agent):
+            return await device.ato_dict()
+
+        for version in (1, 2):
+            result = self._run(test, version=version)
+            self.assertEqual(result["general"]["hostname"], "HeartOfGold")
+            self.assertEqual(
+                [interface["name"] for interface in result["interfaces"]][:2],
+                ["lo", "Device 8086:100e"],
+            )
+
+    def test_missing_oids(self):
+        async def test(device, agent):
+            values = await device.aget_values(
+                ["1.3.6.1.2.1.1.5.0", "1.3.6.1.2.1.1.99.0"]
+            )
+            return list(values.values())
+
+        for version in (1, 2):
+            self.assertEqual(self._run(test, version=version), ["HeartOfGold", ""])
+
+    def test_walk(self):
+        async def test(device, agent):
+            return (await device.awalk("1.3.6.1.2.1.2.2.1.2")).oids(), agent.requests
+
+        oids, v1_requests = self._run(test)
+        self.assertEqual(len(oids), 8)
+        # GETBULK returns the whole column in a single response
+        oids, v2_requests = self._run(test, version=2)
+        self.assertEqual(len(oids), 8)
+        self.assertLess(v2_requests, v1_requests)
+
+    def test_too_big(self):
+        oids = [f"1.3.6.1.2.1.2.2.1.10.{index}" for index in range(1, 6)]
+
+        async def test(device, agent):
+            return await device.aget_values(oids), agent.requests
+
+        values, requests = self._run(test, max_varbinds=2)
+        self.assertEqual(list(values.values())[:2], ["719914", "758983"])
+        # the backend split the request until it fitted
+        self.assertGreater(requests, 3)
+
+    def test_loss(self):
+        async def test(device, agent):
+            with self.assertRaises(NetEngineError):
+                await device.aget_value("1.3.6.1.2.1.1.5.0")
+            return agent.dropped
+
+        self.assertEqual(self._run(test, loss=1), 1)
+
+    def test_latency(self):
+        async def test(device, agent):
+            start = time.monotonic()
+            await device.aget_value("1.3.6.1.2.1.1.5.0")
+            return time.monotonic() - start
+
+        self.assertGreaterEqual(self._run(test, latency=0.2, jitter=0.05), 0.15)
+
+    def test_start_agents(self):
+        async def test():
+            agents = await start_agents(self.snmpdump, 50)
+            try:
+                devices = [
+                    OpenWRT("127.0.0.1", port=agent.port, timeout=1, retries=0)
+                    for agent in agents
+                ]
+                names = await asyncio.gather(
+                    *(device.aget_value("1.3.6.1.2.1.1.5.0") for device in devices)
+                )
+                return agents, names
+            finally:
+                for agent in agents:
+                    agent.close()
+
+        agents, names = asyncio.run(test())
+        self.assertEqual(len({agent.port for agent in agents}), 50)
+        self.assertEqual({str(name) for name in names}, {"HeartOfGold"})
+
+    def test_invalid_loss(self):
+        with self.assertRaises(ValueError):
+            SNMPAgent(self.snmpdump, loss=2)
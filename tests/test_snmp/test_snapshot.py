@@ -0,0 +1,104 @@
+import unittest
+from unittest.mock import patch
+
+from pysnmp.proto.rfc1905 import noSuchInstance
+
+from netengine.backends.snmp import OpenWRT
+from netengine.rates import RateEngine
+
+from ..utils import MockOutputMixin
+
+__all__ = ["TestCountersSnapshot"]
+
+
+class TestCountersSnapshot(unittest.TestCase, MockOutputMixin):
+    def setUp(self):
+        self.device = OpenWRT("192.0.2.1")
+        self.uptime = 100000
+        self.requests = []
+        self.values = {}
+        for index in (1, 2, 3):
+            self.values[f"1.3.6.1.2.1.2.2.1.1.{index}"] = str(index)
+            self.values[f"1.3.6.1.2.1.2.2.1.2.{index}"] = f"eth{index}"
+            for column in (10, 11, 12, 16, 17, 18):
+                self.values[f"1.3.6.1.2.1.2.2.1.{column}.{index}"] = str(column)
+        # only eth1 and eth2 have the 64-bit counters
+        for index in (1, 2):
+            for column in range(6, 14):
+                self.values[f"1.3.6.1.2.1.31.1.1.1.{column}.{index}"] = str(
+                    2**32 + column
+                )
+
+    def _get_cmd(self, engine, auth, transport, context, *var_binds):
+        oids = [self._get_var_bind_oid(var_bind) for var_bind in var_binds]
+        self.requests.append(oids)
+        # every request is answered 1 second later
+        self.uptime += 100
+        return (
+            None,
+            0,
+            0,
+            [
+                (oid, self.uptime if oid == "1.3.6.1.2.1.1.3.0" else value)
+                for oid, value in (
+                    (oid, self.values.get(oid, noSuchInstance)) for oid in oids
+                )
+            ],
+        )
+
+    async def _walk(self, *args, **kwargs):
+        oid = self._get_var_bind_oid(args[-1])
+        for key, value in self.values.items():
+            if key.startswith(f"{oid}."):
+                yield None, 0, 0, [(key, value)]
+
+    def _snapshot(self):
+        with patch(
+            "netengine.backends.snmp.base.get_cmd", side_effect=self._get_cmd
+        ), patch(
+            "netengine.backends.snmp.base.walk_cmd", side_effect=self._walk
+        ), patch(
+            "netengine.backends.snmp.base.bulk_walk_cmd", side_effect=self._walk
+        ):
+            return self.device.counters_snapshot()
+
+    def test_snapshot(self):
+        # the counters of an interface are never split across requests
+        self.device.max_get_varbinds = 12
+        snapshot = self._snapshot()
+        self.assertEqual(
+            [sample["name"] for sample in snapshot], ["eth1", "eth2", "eth3"]
+        )
+        self.assertEqual(len(self.requests), 3)
+        for oids in self.requests:
+            self.assertEqual(oids[0], "1.3.6.1.2.1.1.3.0")
+            self.assertEqual(len(oids), 7)
+        self.assertEqual(
+            [sample["uptime"] for sample in snapshot], [1001.0, 1002.0, 1003.0]
+        )
+        self.assertEqual(
+            snapshot[0]["counters"],
+            {"rx_bytes": 10, "tx_bytes": 16, "rx_packets": 23, "tx_packets": 35},
+        )
+        self.assertEqual({sample["bits"] for sample in snapshot}, {32})
+        self.assertIsInstance(snapshot[0]["received"], float)
+
+    def test_high_capacity_snapshot(self):
+        self.device._set_version(2)
+        snapshot = self._snapshot()
+        # the 64-bit counters of all the interfaces fit in a single request,
+        # eth3 is sampled again with the 32-bit ones
+        self.assertEqual(len(self.requests), 2)
+        self.assertEqual([sample["bits"] for sample in snapshot], [64, 64, 32])
+        self.assertEqual(snapshot[0]["counters"]["rx_bytes"], 2**32 + 6)
+        self.assertEqual(snapshot[2]["counters"]["rx_bytes"], 10)
+
+    def test_rates(self):
+        rates = RateEngine()
+        self.assertEqual(rates.update_snapshot("host", self._snapshot()), {})
+        self.values["1.3.6.1.2.1.2.2.1.10.1"] = "1010"
+        self.uptime += 900
+        # the rates are computed over the uptime of the agent
+        self.assertEqual(
+            rates.update_snapshot("host", self._snapshot())["eth1"]["rx_bps"], 800
+        )
@@ -4,6 +4,7 @@ import os
 from unittest import mock
 
 from pysnmp.proto.rfc1902 import OctetString
+from pysnmp.proto.rfc1905 import noSuchInstance
 
 from .settings import settings
 
@@ -37,11 +38,44 @@ class SpyMock:
 class MockOutputMixin(object):
     @staticmethod
     def _get_oid(input):
-        var_bind = input[-1]
+        return MockOutputMixin._get_var_bind_oid(input[-1])
+
+    @staticmethod
+    def _get_var_bind_oid(var_bind):
         return var_bind.__dict__["_ObjectType__args"][0].__dict__[
             "_ObjectIdentity__args"
         ][0]
 
+    def _assert_autowalk_covers(self, device, fields=None):
+        """
+        checks that the autowalk plan of ``fields`` collects every OID read
+        by to_dict(fields=fields)
+        """
+        from netengine.backends.snmp import base
+
+        base.get_cmd.reset_mock()
+        base.walk_cmd.reset_mock()
+        device.to_dict(autowalk=False, fields=fields)
+        required, optional, scalars = device._autowalk_plan(fields)
+        subtrees = required + optional
+        for command_call in base.get_cmd.call_args_list:
+            for var_bind in command_call.args[4:]:
+                oid = self._get_var_bind_oid(var_bind)
+                self.assertTrue(
+                    oid in scalars
+                    or any(oid.startswith(f"{subtree}.") for subtree in subtrees),
+                    f"{oid} is not collected by autowalk",
+                )
+        for command_call in base.walk_cmd.call_args_list:
+            oid = self._get_oid(command_call.args).rstrip(".")
+            self.assertTrue(
+                any(
+                    f"{oid}.".startswith(f"{subtree}.") or subtree.startswith(f"{oid}.")
+                    for subtree in subtrees
+                ),
+                f"{oid} is not collected by autowalk",
+            )
+
     @staticmethod
     def _load_mock_json(file):
         base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -51,16 +85,20 @@ class MockOutputMixin(object):
 
     @staticmethod
     def _get_mocked_getcmd(data, input):
-        oid = MockOutputMixin._get_oid(input)
-        result = data[oid]
-        if isinstance(result, dict):
-            _type = result["type"]
-            _value = result["value"]
-            if _type == "bytes":
-                result = codecs.escape_decode(_value)[0]
-        elif isinstance(result, list):
-            result = "\n".join(result[0:])
-        return [0, 0, 0, [[0, result]]]
+        var_binds = []
+        # the first four arguments are engine, auth, transport and context
+        for var_bind in input[4:]:
+            oid = MockOutputMixin._get_var_bind_oid(var_bind)
+            result = data.get(oid, noSuchInstance)
+            if isinstance(result, dict):
+                _type = result["type"]
+                _value = result["value"]
+                if _type == "bytes":
+                    result = codecs.escape_decode(_value)[0]
+            elif isinstance(result, list):
+                result = "\n".join(result[0:])
+            var_binds.append([0, result])
+        return [0, 0, 0, var_binds]
 
     @staticmethod
     def _get_mocked_nextcmd(*args, **kwargs):